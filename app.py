@@ -1,330 +1,893 @@
 # app.py
 
-from flask import Flask, render_template, request, jsonify
+import os
+
+# 고동시성 모드: 접속마다 OS 스레드를 쓰는 대신 greenlet 으로 처리 (AUCTION_ASYNC_MODE=gevent / eventlet)
+# monkey patch 는 다른 모듈을 import 하기 전에 해야 한다.
+ASYNC_MODE = os.environ.get('AUCTION_ASYNC_MODE', 'threading')
+if ASYNC_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+elif ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+
+from flask import Flask, Response, render_template, request, jsonify
 from flask_socketio import SocketIO, emit, join_room, leave_room
+from socketio.packet import Packet
 import time
 import json
 import random
-import os
+import re
+import secrets
+import sys
+import collections
+import io
+import heapq
+import itertools
+import math
+import queue
+import subprocess
+import tempfile
+import threading
+
+import bus
+import metrics
+import tracing
+import wire
+from assignment import ASSIGNMENT_POLICIES
+from config import ADMIN_OTP, MANAGERS, PLAYERS_DATA
+from delta import apply_json_patch, make_json_patch
+from engine import AuctionEngine
+from roster import Roster, RosterImportError, ROSTER_FORMATS, STATUSES, export_lines, parse_roster
 
 # --- 1. 앱 초기 설정 및 데이터 구조 ---
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'auction_system_secret_key_2025'
-# 웹소켓을 위한 gevent, gevent-websocket 설치 권장 (호스팅 시 중요)
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
-
-# 초기 팀장 데이터
-MANAGERS = {
-    'Me2MgO2MgOyepQ==': {'id': 'T01', 'name': '건우', 'coin': 1000, 'team': {}, 'is_online': False},
-    'Mu2MgO2MgOyepQ==': {'id': 'T02', 'name': '성무', 'coin': 1000, 'team': {}, 'is_online': False},
-    'M+2MgO2MgOyepQ==': {'id': 'T03', 'name': '원교', 'coin': 1000, 'team': {}, 'is_online': False},
-}
-ADMIN_OTP = 'YWRtaW4='
-
-# 경매 대상 선수 데이터
-PLAYERS_DATA = {
-    'A': ['경민', '대균', '호준'],
-    'B': ['민재', '현준', '범수'],
-    'C': ['성민', '태연', '선우'],
-    'D': ['진호', '준석', '백건'],
-}
+# 멀티 프로세스 배포: AUCTION_WORKERS 개의 워커가 경매방을 room id 로 나눠 소유하고,
+# AUCTION_MESSAGE_QUEUE 버스(bus.py)로 emit 과 경매방 명령을 주고받는다.
+WORKERS = int(os.environ.get('AUCTION_WORKERS', 1))
+WORKER_INDEX = int(os.environ.get('AUCTION_WORKER_INDEX', 0))
+MESSAGE_QUEUE = os.environ.get('AUCTION_MESSAGE_QUEUE', '')
+# 워커가 여러 개인데 워커 번호가 없으면 워커들을 띄우는 런처 프로세스
+IS_LAUNCHER = WORKERS > 1 and 'AUCTION_WORKER_INDEX' not in os.environ
 
-# 경매 상태
-AUCTION_STATE = {
-    'status': 'READY',      # READY, BIDDING, PAUSED, ENDED
-    'current_tier': '',
-    'player_index': 0,
-    'current_player': '',
-    'current_price': 0,
-    'leading_manager_id': None,
-    'timer_end': 0,
-    'player_list': [],
-    'is_started': False,
-    'round': 1,             # 1차 / 2차
-}
 
-def initialize_players():
+
+class EncodedPayload(dict):
     """
-    티어 구분 없이 모든 선수를 가져와 완전히 무작위로 섞어 경매 순서를 설정.
-    각 선수는 상태/status 를 포함한다.
-    status: pending / sold / unsold / forced / unsold_final
+    JSON 으로 한 번 인코딩해 둔 페이로드. 보통 dict 처럼 다룰 수 있고,
+    Socket.IO 패킷을 만들 때는 PayloadJSON 이 저장된 문자열을 그대로 끼워 넣는다.
     """
-    all_players = []
-    for tier, names in PLAYERS_DATA.items():
-        for name in names:
-            all_players.append({
-                'tier': tier,
-                'name': name,
-                'status': 'pending',
-                'price': 0,
-                'owner_id': None,
-            })
+    __slots__ = ('encoded', 'frames')
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.encoded = json.dumps(data, separators=(',', ':'))
+        self.frames = {}        # 압축 여부 -> MessagePack 프레임 (처음 필요할 때 인코딩)
+
+    def binary(self, compress: bool = False) -> bytes:
+        frame = self.frames.get(compress)
+        if frame is None:
+            frame = self.frames[compress] = wire.encode(self, WIRE_COMPRESS_MIN if compress else None)
+        return frame
+
+
+class PayloadJSON:
+    """Socket.IO 패킷 인코더: [이벤트, 페이로드...] 안의 EncodedPayload 는 다시 직렬화하지 않는다."""
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        if isinstance(obj, list) and any(isinstance(item, EncodedPayload) for item in obj):
+            return '[' + ','.join(
+                item.encoded if isinstance(item, EncodedPayload) else json.dumps(item, **kwargs)
+                for item in obj
+            ) + ']'
+        return json.dumps(obj, **kwargs)
 
-    random.shuffle(all_players)
+    loads = staticmethod(json.loads)
 
-    AUCTION_STATE['player_list'] = all_players
-    AUCTION_STATE['round'] = 1
 
-    if all_players:
-        AUCTION_STATE['player_index'] = 0
-        AUCTION_STATE['current_player'] = all_players[0]['name']
-        AUCTION_STATE['current_tier'] = all_players[0]['tier']
+class PayloadPacket(Packet):
+    @classmethod
+    def data_is_binary(cls, data):
+        # 미리 인코딩한 페이로드에는 바이너리가 없으므로 내부를 다시 훑지 않는다
+        if isinstance(data, EncodedPayload):
+            return False
+        return super().data_is_binary(data)
 
-# 서버 시작 시 1차 플레이어 리스트 준비
-initialize_players()
 
+# 웹소켓을 위한 gevent, gevent-websocket 설치 권장 (호스팅 시 중요) → AUCTION_ASYNC_MODE=gevent
+if MESSAGE_QUEUE and not IS_LAUNCHER:
+    socketio = SocketIO(app, cors_allowed_origins="*", async_mode=ASYNC_MODE, json=PayloadJSON,
+                        client_manager=bus.make_client_manager(MESSAGE_QUEUE, WORKER_INDEX))
+else:
+    socketio = SocketIO(app, cors_allowed_origins="*", async_mode=ASYNC_MODE, json=PayloadJSON)
+socketio.server.packet_class = PayloadPacket
 
-# --- 2. 자동 귀속 (티어 1명 vs 팀장 1명) ---
 
-def check_and_apply_autoclaim(tier: str) -> bool:
+def run_blocking(func, *args):
     """
-    [자동 귀속 규칙]
-    - 해당 티어의 선수가 '1명만' 남았고
-    - 아직 그 티어 선수를 가져가지 못한 팀장도 '1명만' 남았을 때
-      → 그 팀장에게 남은 1명을 자동 낙찰.
+    fsync 처럼 이벤트 루프를 멈추는 블로킹 호출을 실행.
+    gevent/eventlet 모드에서는 스레드풀에서 돌려 다른 접속 처리를 막지 않는다.
     """
-    if AUCTION_STATE['player_index'] >= len(AUCTION_STATE['player_list']):
+    if ASYNC_MODE == 'gevent':
+        import gevent
+        return gevent.get_hub().threadpool.apply(func, args)
+    if ASYNC_MODE == 'eventlet':
+        from eventlet import tpool
+        return tpool.execute(func, *args)
+    return func(*args)
+
+
+# 상태 메시지에는 경매 순서 중 현재 선수부터 이만큼만 싣는다 (전체 명단은 REST API /api/rooms/<room>/players)
+PLAYER_WINDOW = 10
+
+# 선수 명단 REST API: 가져오기 최대 선수 수, 조회 한 페이지 기본/최대 크기
+ROSTER_IMPORT_MAX = 50000
+ROSTER_PAGE_SIZE = 100
+ROSTER_PAGE_MAX = 1000
+
+# 경매방별 상태 브로드캐스트 최대 횟수 (초당). 입찰이 몰려도 이 빈도 이상으로는 보내지 않는다
+BROADCAST_MAX_FPS = float(os.environ.get('AUCTION_BROADCAST_FPS', 10))
+
+# 채팅: 새 접속자에게 보내는 최근 메시지 수, 묶음 전송 간격, 접속(sid)별 전송 제한 (token bucket)
+CHAT_HISTORY = 200
+CHAT_FLUSH_INTERVAL = 0.2
+CHAT_RATE = 1.0                 # 초당 평균 메시지 수
+CHAT_BURST = 5                  # 쉬지 않고 연속으로 보낼 수 있는 메시지 수
+CHAT_MAX_LENGTH = 300
+
+# 경매 기록(이벤트 로그 + 스냅샷) 저장 위치. 빈 문자열이면 기록하지 않음
+DATA_DIR = os.environ.get('AUCTION_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+LOG_FSYNC_INTERVAL = 0.05       # 이 간격으로 모아서 fsync (입찰마다 fsync 하지 않음)
+SNAPSHOT_EVERY = 500            # 로그 기록이 이만큼 쌓이면 스냅샷을 새로 쓰고 로그를 비움
+RECOVERY_GRACE_SEC = 5          # 복구 직후 진행 중이던 타이머에 최소한 보장하는 시간
+
+# 재접속: 연결이 끊긴 뒤 이 시간 안에 같은 세션 토큰으로 돌아오면 놓친 delta 만 받는다.
+# 토큰은 발급 후 SESSION_TTL_SEC 가 지나면 재접속에 쓸 수 없다 (그때는 OTP 로 새로 인증)
+SESSION_RESUME_SEC = 30
+SESSION_TTL_SEC = 12 * 3600
+DELTA_HISTORY = 256             # 경매방별로 보관하는 최근 delta 수
+
+# 접속 현황: 팀장 접속/종료는 이 시간 동안 모아서 바뀐 팀장만 한 번에 반영 (잠깐 끊겼다 붙으면 변화 없음)
+PRESENCE_DEBOUNCE_SEC = 2.0
+
+# 타이머: 마감된 콜백을 처리하는 고정 작업 수 (마감마다 스레드 / greenlet 을 새로 만들지 않는다)
+TIMER_WORKERS = 4
+
+# 지표 (/metrics, metrics.py). 경매방별 접속 수 / 캐시 적중은 긁어 갈 때 ROOMS 에서 읽는다
+BID_SECONDS = metrics.Histogram('auction_bid_seconds', 'place_bid command processing time', metrics.LATENCY_BUCKETS)
+BIDS = metrics.Counter('auction_bids_total', 'Bids by outcome and rejection reason', ('outcome', 'reason'))
+EMIT_SECONDS = metrics.Histogram('auction_emit_seconds', 'emit_auction_state diff + serialization time',
+                                 metrics.LATENCY_BUCKETS)
+EMIT_BYTES = metrics.Histogram('auction_emit_bytes', 'Encoded auction_delta size', metrics.SIZE_BUCKETS)
+TIMER_DRIFT = metrics.Histogram('auction_timer_drift_seconds', 'Timer handling delay versus timer_end',
+                                metrics.DRIFT_BUCKETS, ('status',))
+EVENTS = metrics.Counter('auction_events_total', 'Auction events (use rate() for events per second)', ('type',))
+
+# 샘플링 추적 (tracing.py): 관리자가 admin_trace 이벤트로 켜고 끈다. 끌 때 TRACE_DIR 에 trace-*.json 저장
+TRACE_DIR = os.environ.get('AUCTION_TRACE_DIR') or DATA_DIR or tempfile.gettempdir()
+TRACE_MAX_EVENTS = 200000       # 메모리에 두는 최대 span 수 (넘으면 오래된 것부터 버림)
+TRACER = tracing.Tracer(TRACE_MAX_EVENTS)
+
+# 상태 메시지 전송 형식 (wire.py): 클라이언트가 고르는 json / msgpack / msgpack+zlib
+WIRE_COMPRESS = os.environ.get('AUCTION_WIRE_COMPRESS', '1') != '0'
+WIRE_COMPRESS_MIN = 4096        # 개별 전송 메시지가 이 크기(바이트) 이상이면 압축
+
+# 2차 경매 후 남은 선수 배정 정책 (assignment.py 참고): richest / balanced / min_cost
+FINALIZE_POLICY = os.environ.get('AUCTION_FINALIZE_POLICY', 'richest')
+if FINALIZE_POLICY not in ASSIGNMENT_POLICIES:
+    raise ValueError(f"지원하지 않는 배정 정책입니다: {FINALIZE_POLICY} (가능: {', '.join(ASSIGNMENT_POLICIES)})")
+
+# 경매방 id 를 지정하지 않은 접속은 이 방으로
+DEFAULT_ROOM = 'main'
+ROOM_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+# 누구나 들어갈 수 있는 경매방 (쉼표 구분). 그 밖의 방은 관리자가 인증하거나 명단을 가져올 때만 새로 만든다
+ROOM_ALLOWLIST = frozenset(room_id for room_id in (r.strip() for r in os.environ.get('AUCTION_ROOMS', DEFAULT_ROOM).split(','))
+                           if ROOM_ID_PATTERN.match(room_id))
+# 접속자 없이 이 시간 동안 바뀐 것이 없는 경매방은 메모리에서 내린다 (기록은 스냅샷으로 남고 다시 부르면 복구)
+ROOM_IDLE_SEC = float(os.environ.get('AUCTION_ROOM_IDLE_SEC', 600))
+
+
+# --- 2. 경매방 엔진 ---
+
+class AuctionRoom(AuctionEngine):
+    """
+    경매 하나를 소유하는 객체. 경매 규칙(입찰, 자동귀속, 2차 경매, 최종 배정)은 AuctionEngine(engine.py)이고,
+    이 클래스는 그 엔진의 sink 가 되어 명령 큐, 이벤트 로그, 타이머, 브로드캐스트를 붙인다.
+    모든 브로드캐스트는 이 방의 Socket.IO room 으로만 나간다.
+      - {room_id}            : 방 전체 (참관인 포함)
+      - {room_id}:managers   : 팀장
+      - {room_id}:admin      : 관리자
+      - {room_id}:{팀장 id}  : 팀장 개인
+    """
+
+    # 상태를 읽어서 보내기만 하는 명령 (mutation / dirty 를 올리지 않음).
+    # 다른 명령도 False 를 돌려주면(거절된 입찰, 입찰 중이 아닐 때의 end_bid 등) 아무것도 바꾸지 않은 것으로 본다
+    READ_ONLY_COMMANDS = frozenset({'flush', 'read', 'emit_auction_state', 'emit_auction_snapshot',
+                                    'emit_auction_resume'})
+
+    def __init__(self, room_id: str):
+        self.room_id = room_id
+        # 팀장 / 상태 / 선수 명단 / 티어 인덱스는 엔진이 만든다 (경매방 자신이 sink)
+        super().__init__(MANAGERS, [(tier, name) for tier, names in PLAYERS_DATA.items() for name in names],
+                         sink=self, clock=time.time, rng=random, finalize_policy=FINALIZE_POLICY)
+
+        # 상태 버전 관리: 마지막으로 발행한 스냅샷과 비교해 바뀐 부분만 delta 로 전송
+        self.state_sync = {
+            'version': 0,       # 발행된 상태가 바뀔 때마다 1씩 증가
+            'snapshot': None,   # version 시점의 get_auction_data() 사본
+            'payload': None,    # 마지막으로 비교한 auction 페이로드 (같은 객체면 비교 생략)
+            'epoch': secrets.token_hex(4),      # 경매방 객체마다 다름 (재시작하면 version 이 다시 시작하므로)
+            'history': collections.deque(maxlen=DELTA_HISTORY),     # 재접속 클라이언트용 최근 delta
+        }
+
+        # 직렬화 캐시: 상태를 바꾸는 명령이 처리될 때만 mutation 이 증가하고,
+        # 같은 mutation 동안 만든 페이로드는 다시 만들거나 인코딩하지 않고 모든 수신자에게 재사용한다.
+        self.mutation = 0
+        self.payload_cache = {}         # kind -> ((mutation, key), EncodedPayload)
+        self.cache_stats = {'hits': 0, 'misses': 0}
+
+        # 상태를 바꾸는 모든 작업(입찰, 관리자 액션, 타이머 만료)은 이 큐를 거쳐
+        # 한 번에 한 writer 가 도착 순서대로 처리한다 (submit / drain 참고).
+        self.commands = collections.deque()
+        self.commands_lock = threading.Lock()
+        self.draining = False
+        # 유휴 경매방 내리기: 마지막으로 상태가 바뀌거나 접속이 바뀐 시각, 내린 뒤에는 closed (evict_if_idle 참고)
+        self.last_active = time.time()
+        self.closed = False
+
+        # 브로드캐스트 묶음 전송: 변경이 생기면 dirty 로 표시만 하고
+        # 최대 BROADCAST_MAX_FPS 빈도로 flush (마지막 변경 뒤에도 반드시 한 번 flush)
+        self.dirty = False
+        self.last_flush = 0.0
+        self.flush_scheduled = False
+
+        # 경매 기록: 명령 묶음마다 바뀐 부분(JSON Patch)과 이벤트를 로그에 추가하고
+        # 주기적으로 스냅샷을 남긴다. 재시작 시 스냅샷 + 로그로 그대로 복구.
+        self.event_log = EventLog(room_id) if DATA_DIR else None
+        self.log_seq = 0
+        self.pending_events = []        # 이번 명령 묶음에서 생긴 이벤트 (낙찰, 유찰, 입찰 ...)
+        # 마지막 기록 시점: 상태/팀장 사본(persisted_state), 가져온 명단(player_pool) 객체, 선수 명단 객체.
+        # 상태/팀장은 작아서 비교하고, 큰 명단은 다시 만들지 않고 Roster.journal 에 쌓인 변경만 남긴다.
+        self.persisted = None
+        self.persisted_pool = None
+        self.persisted_roster = None
+        # 로그에 남긴 마지막 mutation. 기록 여부는 이것만 보고 정한다 (dirty 는 flush 가 지우므로 기준이 될 수 없음)
+        self.persisted_mutation = 0
+
+        # 채팅(시스템 안내, 입찰 알림 포함)은 명령 큐와 따로 움직인다 (ChatChannel 참고)
+        self.chat = ChatChannel(self)
+
+        # 접속 현황: sid 별 접속은 PresenceService 가 세고, 상태에는 반영된 결과(online)만 쓴다
+        self.presence = PresenceService(self)
+        self.online = frozenset()       # 접속 중인 팀장 otp (apply_presence 로만 바뀜)
+
+        if not self.recover():
+            # 방 생성 시 1차 플레이어 리스트 준비
+            self.initialize_players()
+            self.take_snapshot()
+        self.schedule_idle_check()
+
+    def channel(self, name: str = None) -> str:
+        """이 방에 속한 Socket.IO room 이름"""
+        return room_channel(self.room_id, name)
+
+    def emit(self, event: str, data, to: str = None):
+        """방 범위 emit. to 를 주지 않으면 방 전체로 브로드캐스트"""
+        with TRACER.span('emit', 'emit', event=event, broadcast=to is None):
+            socketio.emit(event, data, to=to or self.channel())
+
+    def submit(self, command, *args):
+        """
+        command(*args) 를 이 방의 명령 큐에 넣는다.
+        처리 중인 writer 가 없으면 호출한 쪽이 writer 가 되어 큐를 비울 때까지 처리하고,
+        이미 처리 중이면 넣기만 하고 바로 돌아간다 (그 writer 가 이어서 처리).
+        메모리에서 내린 경매방이면 넣지 않고 False (run_room_command 가 다시 불러온 경매방으로 보낸다).
+        """
+        with self.commands_lock:
+            if self.closed:
+                return False
+            self.commands.append((command, args))
+            if self.draining:
+                return True
+            self.draining = True
+        self.drain()
+        return True
+
+    def read(self, build):
+        """
+        build() 를 명령 큐 차례에 실행하고(다른 명령과 겹치지 않게) 그 결과를 돌려준다.
+        큐 밖에서 상태를 읽는 REST 조회가 명령 처리 중간의 상태를 보지 않도록 쓴다.
+        """
+        done = threading.Event()
+        result = {}
+
+        def read():
+            try:
+                result['value'] = build()
+            except Exception as e:
+                result['error'] = e
+            finally:
+                done.set()
+
+        if not self.submit(read):
+            # 메모리에서 내린 경매방은 더 바뀌지 않으므로 바로 읽는다
+            read()
+        done.wait()
+        if 'error' in result:
+            raise result['error']
+        return result['value']
+
+    def drain(self):
+        """큐에 쌓인 명령을 한 묶음씩 순서대로 처리하고, 묶음이 끝나면 브로드캐스트 요청"""
+        try:
+            while True:
+                with self.commands_lock:
+                    if not self.commands:
+                        self.draining = False
+                        return
+                    batch = list(self.commands)
+                    self.commands.clear()
+
+                for command, args in batch:
+                    name = getattr(command, '__name__', None)
+                    changed = None
+                    try:
+                        with TRACER.span(f'command.{name}', 'command', room=self.room_id):
+                            changed = command(*args)
+                    except Exception as e:
+                        print(f"[{self.room_id}] 명령 처리 오류 ({getattr(command, '__name__', command)}): {e!r}")
+                        changed = False
+                    if changed is not False and name not in self.READ_ONLY_COMMANDS:
+                        self.dirty = True
+                        self.mutation += 1
+                        self.last_active = time.time()
+
+                # 기록/전송이 실패해도 writer 자리를 놓지 않은 채 멈추지 않도록 (큐는 다음 바퀴에서 다시 확인)
+                try:
+                    self.persist()
+                    if self.dirty:
+                        self.request_flush()
+                except Exception as e:
+                    print(f"[{self.room_id}] 기록/전송 오류: {e!r}")
+        except BaseException:
+            # greenlet 종료 등으로 빠져나갈 때도 다음 submit 이 writer 가 될 수 있게
+            with self.commands_lock:
+                self.draining = False
+            raise
+
+    def request_flush(self):
+        """직전 flush 로부터 1/BROADCAST_MAX_FPS 초가 지났으면 바로, 아니면 그 시각에 flush"""
+        interval = 1.0 / BROADCAST_MAX_FPS if BROADCAST_MAX_FPS > 0 else 0.0
+        due = self.last_flush + interval
+        if time.time() >= due:
+            self.flush()
+        elif not self.flush_scheduled:
+            self.flush_scheduled = True
+            TIMERS.schedule((self.room_id, 'flush'), due, self.on_flush_timer)
+
+    def on_flush_timer(self):
+        self.submit(self.flush)
+
+    # --- 유휴 경매방 내리기 ---
+
+    def schedule_idle_check(self):
+        if ROOM_IDLE_SEC > 0:
+            TIMERS.schedule((self.room_id, 'idle'), time.time() + ROOM_IDLE_SEC, self.on_idle_timer)
+
+    def on_idle_timer(self):
+        self.submit(self.evict_if_idle)
+
+    def evict_if_idle(self) -> bool:
+        """
+        접속자가 없고 ROOM_IDLE_SEC 동안 바뀐 것이 없는 경매방을 ROOMS 에서 빼고 정리한다 (명령 큐에서 실행).
+        진행 중인 경매, 기록할 곳(DATA_DIR)이 없는데 시작했거나 명단을 가져온 경매방은 내리지 않는다.
+        """
+        idle = (self.state['status'] not in ('BIDDING', 'PAUSED')
+                and time.time() - self.last_active >= ROOM_IDLE_SEC
+                and (self.event_log is not None or not (self.state['is_started'] or self.state.get('player_pool'))))
+        if idle:
+            # 접속(attach)과 경쟁하지 않도록 접속 현황 lock 안에서 확인하고 닫는다
+            with ROOMS_LOCK, self.presence.lock, self.commands_lock:
+                if not self.presence.sids and not self.commands and ROOMS.get(self.room_id) is self:
+                    self.closed = True
+                    del ROOMS[self.room_id]
+        if not self.closed:
+            self.schedule_idle_check()
+            return False
+
+        for key in (self.room_id, (self.room_id, 'flush'), (self.room_id, 'chat'), (self.room_id, 'presence')):
+            TIMERS.cancel(key)
+        self.persist()
+        if self.event_log is not None:
+            self.event_log.close()
+        print(f"경매방 내림: {self.room_id} (접속 없이 {ROOM_IDLE_SEC:.0f}초)")
         return False
 
-    # 현재 인덱스부터 끝까지, 이 티어에 남은 선수 수
-    remaining_in_tier = sum(
-        1
-        for p in AUCTION_STATE['player_list'][AUCTION_STATE['player_index']:]
-        if p['tier'] == tier
-    )
+    def flush(self):
+        """쌓인 변경을 한 번에 전송: 팀장 데이터 → 상태 delta"""
+        if self.flush_scheduled:
+            self.flush_scheduled = False
+            TIMERS.cancel((self.room_id, 'flush'))
+        if not self.dirty:
+            return
+        # 같은 묶음에 flush 가 들어 있어도 기록하지 않은 변경을 먼저 로그에 남긴 뒤에 보낸다
+        self.persist()
+        self.dirty = False
+        self.last_flush = time.time()
+
+        if self.managers_dirty:
+            self.managers_dirty = False
+            self.emit_manager_data()
+        self.emit_auction_state()
+
+    # --- 경매 기록 (이벤트 로그 & 스냅샷) ---
+
+    def persisted_state(self) -> dict:
+        """로그/스냅샷에 남기는 상태와 팀장 (접속 여부 같은 일시적인 값, 큰 player_pool / 선수 명단은 제외)"""
+        state = {key: value for key, value in self.state.items() if key != 'player_pool'}
+        return json.loads(json.dumps({'state': state, 'managers': self.managers}))
+
+    @TRACER.traced()
+    def persist(self):
+        """
+        직전 기록 이후 바뀐 부분을 이벤트 로그에 추가 (fsync 는 LOG_SYNCER 가 묶어서 처리).
+        마지막 기록 이후 mutation 이 그대로면 아무것도 하지 않는다. 전체 문서는 스냅샷을 쓸 때만 만든다.
+        """
+        if self.event_log is None or self.persisted_mutation == self.mutation:
+            return
 
-    # 이 티어 선수를 아직 한 명도 못 가진 팀장 목록
-    free_managers_otp = []
-    for otp, manager in MANAGERS.items():
-        if not any(p['tier'] == tier for p in manager['team'].values()):
-            free_managers_otp.append(otp)
-
-    if remaining_in_tier == 1 and len(free_managers_otp) == 1:
-        manager_otp = free_managers_otp[0]
-        manager = MANAGERS[manager_otp]
-
-        player_info = AUCTION_STATE['player_list'][AUCTION_STATE['player_index']]
-
-        # 팀에 선수 추가 (무료 강제 배정)
-        manager['team'][player_info['name']] = {
-            'tier': player_info['tier'],
-            'name': player_info['name'],
-            'price': 0,
-            'round': AUCTION_STATE['round'],
-            'forced': True,
-        }
+        doc = self.persisted_state()
+        ops = make_json_patch(self.persisted, doc)
+        pool = self.state.get('player_pool')
+        if pool is not self.persisted_pool:
+            ops.append({'op': 'add', 'path': '/state/player_pool', 'value': pool})
+        if self.roster is self.persisted_roster:
+            ops.extend({**op, 'path': '/roster' + op['path']} for op in self.roster.take_journal())
+        else:
+            # 명단을 새로 불러왔거나 복구해서 객체가 바뀜
+            ops.append({'op': 'replace', 'path': '/roster', 'value': self.roster.to_doc()})
+            self.roster.take_journal()
+        events, self.pending_events = self.pending_events, []
+        if not ops and not events:
+            self.persisted_mutation = self.mutation
+            return
 
-        player_info['status'] = 'forced'
-        player_info['price'] = 0
-        player_info['owner_id'] = manager['id']
+        self.log_seq += 1
+        self.event_log.append({'seq': self.log_seq, 'time': time.time(), 'events': events, 'ops': ops})
+        self.persisted, self.persisted_pool, self.persisted_roster = doc, pool, self.roster
+        self.persisted_mutation = self.mutation
 
-        socketio.emit(
-            'chat_message',
-            {
-                'name': '시스템',
-                'message': f"[자동 귀속] [{manager['name']}] 팀에 {player_info['name']} ({tier} 티어) 선수가 강제 낙찰되었습니다!"
+        if self.event_log.records_since_snapshot >= SNAPSHOT_EVERY:
+            self.take_snapshot()
+
+    def take_snapshot(self):
+        """지금 상태 전체를 스냅샷으로 쓰고 로그를 비운다"""
+        if self.event_log is None:
+            return
+        self.persisted = self.persisted_state()
+        self.persisted_pool = self.state.get('player_pool')
+        self.persisted_roster = self.roster
+        self.persisted_mutation = self.mutation
+        self.roster.take_journal()
+
+        doc = dict(self.persisted)
+        doc['state'] = dict(self.persisted['state'], player_pool=self.persisted_pool)
+        doc['roster'] = self.roster.to_doc()
+        self.event_log.write_snapshot(self.log_seq, doc)
+
+    def recover(self) -> bool:
+        """저장된 스냅샷 + 로그가 있으면 그 상태로 복구하고 True"""
+        if self.event_log is None:
+            return False
+
+        snapshot, records = self.event_log.load()
+        if snapshot is None:
+            return False
+
+        doc, seq = snapshot['doc'], snapshot['seq']
+        for record in records:
+            if record['seq'] > seq:
+                doc = apply_json_patch(doc, record['ops'])
+                seq = record['seq']
+
+        self.state = doc['state']
+        self.managers = doc['managers']
+        self.roster = Roster.from_doc(doc['roster'])
+        self.log_seq = seq
+        self.rebuild_tier_index()
+
+        # 진행 중이던 타이머 재등록 (재시작에 걸린 시간만큼 손해 보지 않도록 최소 시간 보장)
+        if self.state['status'] in ('BIDDING', 'PAUSED'):
+            self.set_timer(max(self.state['timer_end'] - time.time(), RECOVERY_GRACE_SEC))
+
+        # 복구한 상태를 새 스냅샷으로 남기고 로그는 비운다
+        self.take_snapshot()
+        print(f"경매방 복구: {self.room_id} (seq {seq}, {len(records)}개 로그 재생)")
+        return True
+
+    def cached_payload(self, kind: str, build, key=None) -> EncodedPayload:
+        """kind 페이로드를 상태가 바뀌었거나 key 가 달라졌을 때만 build() 로 새로 만들어 인코딩한다."""
+        cache_key = (self.mutation, key)
+        cached = self.payload_cache.get(kind)
+        if cached is not None and cached[0] == cache_key:
+            self.cache_stats['hits'] += 1
+            return cached[1]
+
+        self.cache_stats['misses'] += 1
+        payload = EncodedPayload(build())
+        self.payload_cache[kind] = (cache_key, payload)
+        return payload
+
+    # --- 2-1. 상태 전송 ---
+
+    def timer_deadline(self):
+        """
+        진행 중인 마감 시각 (서버 시계 기준 epoch ms, 없으면 None).
+        남은 시간은 클라이언트가 clock_ping 으로 맞춘 시계로 직접 센다 → 마감이 바뀔 때만 상태가 바뀐다.
+        """
+        if self.state['status'] not in ('BIDDING', 'PAUSED') or not self.state.get('timer_end'):
+            return None
+        return int(self.state['timer_end'] * 1000)
+
+    def manager_view(self) -> dict:
+        """팀장 목록 (경매 상태와 manager_data_update 가 같이 쓴다)"""
+        return {
+            otp: {
+                'id': m['id'],
+                'name': m['name'],
+                'coin': m['coin'],
+                'team': self.roster.team_dict(m['id']),
+                'is_online': otp in self.online,
             }
+            for otp, m in self.managers.items()
+        }
+
+    def get_auction_data(self):
+        """클라이언트에 전송할 경매 상태 데이터 취합"""
+        data = {
+            'room': self.room_id,
+            'state': self.state.get('status', 'INIT'),
+            'current_player': self.state.get('current_player', ''),
+            'player_tier': self.state.get('current_tier', ''),
+            'player_index': self.state.get('player_index', -1),
+            'current_price': self.state.get('current_price', 0),
+            'leading_manager_id': self.state.get('leading_manager_id', None),
+            'timer_end': self.timer_deadline(),
+            'round': self.state.get('round', 1),
+
+            'managers': self.manager_view(),
+
+            'upcoming': self.roster.queue_window(self.state.get('player_index', 0), PLAYER_WINDOW),
+            'player_count': len(self.roster.order),
+            'roster_revision': self.roster.revision,
+        }
+
+        return data
+
+    def auction_payload(self) -> EncodedPayload:
+        """get_auction_data() 의 캐시된 인코딩"""
+        return self.cached_payload('auction', self.get_auction_data)
+
+    @TRACER.traced()
+    def publish_auction_state(self):
+        """
+        현재 상태를 새 버전으로 발행하고 (version, ops) 를 돌려준다.
+        바뀐 것이 없으면 ops 는 빈 리스트이고 버전도 그대로.
+        """
+        payload = self.auction_payload()
+        if payload is self.state_sync['payload']:
+            # 마지막 비교 이후 상태를 바꾼 명령이 없음
+            return self.state_sync['version'], []
+        self.state_sync['payload'] = payload
+
+        # 인코딩해 둔 문자열에서 다시 읽어 깊은 복사 (팀 dict 등은 이후에 제자리에서 수정되므로)
+        current = json.loads(payload.encoded)
+        previous = self.state_sync['snapshot']
+        ops = make_json_patch(previous, current) if previous is not None else None
+
+        if ops == []:
+            return self.state_sync['version'], ops
+
+        self.state_sync['version'] += 1
+        self.state_sync['snapshot'] = current
+        if ops is None:
+            self.state_sync['history'].clear()
+        else:
+            self.state_sync['history'].append({'version': self.state_sync['version'], 'ops': ops})
+        return self.state_sync['version'], ops or []
+
+    def emit_auction_state(self):
+        """
+        변경분만 auction_delta 로 브로드캐스트.
+        클라이언트는 version 이 (자기 버전 + 1) 이 아니면 request_snapshot 으로 전체 상태를 다시 받는다.
+        """
+        started = time.perf_counter()
+        version, ops = self.publish_auction_state()
+        if ops:
+            self.emit_delta(version, ops, started)
+
+    def emit_delta(self, version: int, ops: list, started: float):
+        """auction_delta 브로드캐스트. 한 번 인코딩해서 크기를 재고 모든 수신자에게 그대로 보낸다"""
+        data = EncodedPayload({'version': version, 'ops': ops})
+        EMIT_SECONDS.observe(time.perf_counter() - started)
+        EMIT_BYTES.observe(len(data.encoded))
+        self.emit_state('auction_delta', data)
+
+    def emit_state(self, event: str, data: EncodedPayload, to: str = None, wire_format: str = wire.JSON):
+        """
+        상태 메시지를 클라이언트가 협상한 형식으로 전송.
+        to 가 없으면 JSON 채널과 (MessagePack 클라이언트가 있을 때만) msgpack 채널에 각각 브로드캐스트.
+        """
+        if to is None:
+            self.emit(event, data, to=self.channel(wire.JSON))
+            if self.presence.binary_clients():
+                self.emit(event, data.binary(), to=self.channel(wire.MSGPACK))
+        elif wire.is_binary(wire_format):
+            self.emit(event, data.binary(wire_format == wire.MSGPACK_ZLIB), to=to)
+        else:
+            self.emit(event, data, to=to)
+
+    def emit_auction_snapshot(self, to, wire_format: str = wire.JSON):
+        """전체 상태 스냅샷을 특정 클라이언트에게만 전송 (같은 버전을 요청한 클라이언트끼리는 인코딩을 재사용)"""
+        started = time.perf_counter()
+        version, ops = self.publish_auction_state()
+        if ops:
+            self.emit_delta(version, ops, started)
+        data = self.cached_payload(
+            'snapshot', lambda: dict(self.state_sync['snapshot'], version=version, epoch=self.state_sync['epoch']),
+            key=version,
         )
+        self.emit_state('auction_update', data, to=to, wire_format=wire_format)
+
+    def emit_auction_resume(self, to, since=None, wire_format: str = wire.JSON):
+        """
+        재접속한 클라이언트에게 since({epoch, version}) 이후 놓친 delta 만 auction_replay 로 보낸다.
+        since 가 없거나 다른 epoch 이거나 보관 범위를 벗어났으면 전체 스냅샷.
+        """
+        started = time.perf_counter()
+        version, ops = self.publish_auction_state()
+        if ops:
+            self.emit_delta(version, ops, started)
+
+        history = self.state_sync['history']
+        since_version = since.get('version') if isinstance(since, dict) else None
+        if (isinstance(since_version, int) and since.get('epoch') == self.state_sync['epoch']
+                and since_version <= version
+                and (since_version == version or (history and history[0]['version'] <= since_version + 1))):
+            deltas = [d for d in history if d['version'] > since_version]
+            self.emit_state('auction_replay', EncodedPayload({'version': version, 'deltas': deltas}),
+                            to=to, wire_format=wire_format)
+        else:
+            self.emit_auction_snapshot(to, wire_format)
+
+    def emit_manager_data(self):
+        data = self.cached_payload('manager_data', lambda: {'managers': self.manager_view()})
+        self.emit_state('manager_data_update', data)
+
+    # --- 2-2. 입찰 & 관리자 액션 ---
+
+    def place_bid(self, manager_otp, bid_increment: int, sid) -> bool:
+        """팀장 입찰 처리. 오류는 요청한 클라이언트(sid)에게만 bid_error 로 알리고 False."""
+        started = time.perf_counter()
+        reason = self.apply_bid(manager_otp, bid_increment, sid)
+        BID_SECONDS.observe(time.perf_counter() - started)
+        BIDS.inc('rejected' if reason else 'accepted', reason or '')
+        return reason is None
+
+    def update_manager(self, target_otp, data) -> bool:
+        """관리자가 팀장의 코인, 이름 등을 수정 (없는 팀장이면 False)"""
+        if target_otp not in self.managers:
+            return False
+        if 'coin' in data:
+            self.managers[target_otp]['coin'] = int(data.get('coin'))
+        if 'name' in data:
+            self.managers[target_otp]['name'] = data.get('name')
+        self.record_event('admin_update_manager', manager_id=self.managers[target_otp]['id'],
+                          **{k: data[k] for k in ('coin', 'name') if k in data})
 
-        # 다음 선수로 이동
-        AUCTION_STATE['player_index'] += 1
+        self.managers_dirty = True
+        self.system_message(f"관리자가 [{self.managers[target_otp]['name']}] 팀장의 정보를 수정했습니다.")
+        return True
+
+    def import_roster(self, entries) -> bool:
+        """
+        관리자가 REST API 로 가져온 선수 명단 (검증된 [(tier, name), ...]).
+        시작 전(READY)이면 경매 순서를 바로 새 명단으로 바꾸고, 끝난 뒤(ENDED)면 다음 시작 때 쓴다.
+        """
+        if self.state['status'] not in ('READY', 'ENDED'):
+            self.emit('roster_error', {'message': '경매 진행 중에는 선수 명단을 바꿀 수 없습니다.'},
+                      to=self.channel('admin'))
+            return False
+
+        self.state['player_pool'] = [[tier, name] for tier, name in entries]
+        self.record_event('roster_import', players=len(entries))
+        if not self.state['is_started']:
+            self.initialize_players()
+            self.managers_dirty = True
+        self.system_message(f"관리자가 선수 명단({len(entries)}명)을 새로 불러왔습니다.")
+        return True
 
-        print(f"--- [자동 귀속] 티어 {tier}, 선수 {player_info['name']} → 팀장 {manager['name']} ---")
+    def apply_presence(self, online) -> bool:
+        """
+        PresenceService 가 모은 접속 현황 반영. 바뀐 팀장의 is_online 만 다음 auction_delta 에 실리고
+        팀장 목록 전체(manager_data_update)는 다시 보내지 않는다.
+        """
+        online = frozenset(online)
+        if online == self.online:
+            return False
+        self.online = online
         return True
 
-    return False
+    def on_timer(self):
+        """스케줄러가 timer_end 시각에 호출. 실제 처리는 명령 큐를 거친다."""
+        self.submit(self.timer_expired)
+
+    def timer_expired(self) -> bool:
+        """입찰 마감 / 준비 시간 종료 처리 (엔진) + 마감 대비 처리 지연 기록"""
+        delay, status = time.time() - self.state['timer_end'], self.state['status']
+        expired = super().timer_expired()
+        if expired:
+            TIMER_DRIFT.observe(delay, status)
+        return expired
+
+    # 엔진의 주요 규칙 구간도 추적 span 으로
+    check_and_apply_autoclaim = TRACER.traced('AuctionRoom.check_and_apply_autoclaim')(
+        AuctionEngine.check_and_apply_autoclaim)
+    reset_auction_for_next_player = TRACER.traced('AuctionRoom.reset_auction_for_next_player')(
+        AuctionEngine.reset_auction_for_next_player)
+
+    # --- 2-3. 엔진이 알리는 일 (engine.EventSink) ---
+
+    def record(self, event: dict):
+        """경매 이벤트는 이번 명령 묶음의 로그 기록에 붙인다"""
+        self.pending_events.append(event)
+        EVENTS.inc(event['type'])
+
+    def announce(self, name: str, message: str, kind: str):
+        """경매 진행 중 생기는 채팅(시스템 안내, 입찰 알림)은 채팅 채널의 다음 묶음으로 전송"""
+        self.chat.post(name, message, kind)
+
+    def schedule(self, deadline):
+        if deadline is None:
+            TIMERS.cancel(self.room_id)
+        else:
+            TIMERS.schedule(self.room_id, deadline, self.on_timer)
 
+    def reject(self, sid, reason: str, message: str):
+        self.emit('bid_error', {'message': message}, to=sid)
 
-# --- 3. 2차 경매 & 최종 자동 배정 로직 ---
+    def notify(self, manager_otp, event: str, data: dict):
+        """팀장 개인 채널로 (탭 여러 개면 모두)"""
+        self.emit(event, data, to=self.channel(self.managers[manager_otp]['id']))
 
-def team_has_tier(manager, tier: str) -> bool:
-    return any(p['tier'] == tier for p in manager['team'].values())
+    def log(self, message: str):
+        print(f"--- [{self.room_id}] {message} ---")
 
+# --- 3. 경매방 관리 ---
 
-def start_second_round():
-    """1차 경매가 끝났을 때, 유찰된 선수만 모아 2차 경매 시작."""
-    unsold = [p for p in AUCTION_STATE['player_list'] if p.get('status') == 'unsold']
+ROOMS = {}              # room_id -> AuctionRoom
+ROOMS_LOCK = threading.Lock()
+SID_ROOMS = {}          # Socket.IO sid -> room_id
+SID_USERS = {}          # Socket.IO sid -> (otp, 'manager' / 'admin' / 'viewer'), authenticate 에서 기록
+SID_CHAT_LIMITS = {}    # Socket.IO sid -> 채팅 TokenBucket
+SID_WIRE = {}           # Socket.IO sid -> authenticate 에서 협상한 상태 메시지 전송 형식 (wire.py)
+
+# 재접속 세션: token -> {'room', 'otp', 'role', 'sid', 'expires'} (sid 가 None 이면 연결이 끊겨 재접속 대기 중).
+# 연결(sid)마다, 팀장은 (경매방, otp)마다 토큰 하나만 살아 있다 (새로 인증하면 이전 토큰은 버림)
+SESSIONS = {}
+SID_SESSIONS = {}       # Socket.IO sid -> 세션 token
+OTP_SESSIONS = {}       # (room_id, 팀장 otp) -> 세션 token
+SESSIONS_LOCK = threading.Lock()
+
+
+# 경매방 상태를 바꾸는 명령 (다른 워커에서 room_command 로 넘어올 수 있는 것만)
+ROOM_COMMANDS = {
+    'place_bid', 'set_proxy_bid', 'start_auction', 'end_bid', 'update_manager', 'import_roster',
+    'emit_auction_state', 'emit_auction_snapshot', 'emit_auction_resume',
+}
+# 경매방이 없으면 새로 만드는 명령 (관리자 인증 / 관리자 명단 가져오기에서만 보낸다)
+ROOM_CREATING_COMMANDS = {'open_room', 'import_roster'}
 
-    if not unsold:
-        # 유찰 선수 없다면 바로 최종 처리
-        finalize_unsold_players()
-        return
 
-    AUCTION_STATE['round'] = 2
-    AUCTION_STATE['player_list'] = unsold
-    AUCTION_STATE['player_index'] = 0
+def normalize_room_id(room_id=None) -> str:
+    if not room_id or not ROOM_ID_PATTERN.match(room_id):
+        return DEFAULT_ROOM
+    return room_id
 
-    first = unsold[0]
-    AUCTION_STATE['current_player'] = first['name']
-    AUCTION_STATE['current_tier'] = first['tier']
-    AUCTION_STATE['current_price'] = 0
-    AUCTION_STATE['leading_manager_id'] = None
-    AUCTION_STATE['status'] = 'PAUSED'
-    AUCTION_STATE['timer_end'] = time.time() + 5
 
-    socketio.emit('chat_message', {
-        'name': '시스템',
-        'message': '[2차 경매] 1차에서 유찰된 선수들만 남은 코인으로 다시 경매합니다.'
-    })
-    emit_auction_state()
-    emit_manager_data()
+def room_channel(room_id: str, name: str = None) -> str:
+    """경매방에 속한 Socket.IO room 이름 (경매방 객체가 없는 워커에서도 같은 이름)"""
+    return room_id if name is None else f"{room_id}:{name}"
 
 
-def finalize_unsold_players():
+def owns_room(room_id: str) -> bool:
+    """이 프로세스가 경매방 상태를 소유하는지 (단일 프로세스면 항상 True)"""
+    if IS_LAUNCHER:
+        return False
+    return WORKERS <= 1 or bus.owner_of(room_id, WORKERS) == WORKER_INDEX
+
+
+def get_room(room_id=None, create: bool = False):
     """
-    2차 경매 후에도 남은 선수들을
-      - 해당 티어가 없는 팀 중 코인이 가장 많이 남은 팀에 자동 귀속
-      - 그래도 갈 곳 없으면 최종 유찰로 확정
+    room_id 에 해당하는 경매방. 메모리에 없으면 스냅샷에서 복구하고, 스냅샷도 없으면
+    허용 목록(ROOM_ALLOWLIST)에 있거나 create(관리자 요청)일 때만 새로 만든다. 그 밖에는 None. 소유 워커에서만 호출
     """
-    remaining = [p for p in AUCTION_STATE['player_list'] if p.get('status') not in ('sold', 'forced')]
+    room_id = normalize_room_id(room_id)
 
-    for player in remaining:
-        tier = player['tier']
-        name = player['name']
+    room = ROOMS.get(room_id)
+    if room is None:
+        with ROOMS_LOCK:
+            room = ROOMS.get(room_id)
+            if room is None and (create or room_id in ROOM_ALLOWLIST or EventLog.exists(room_id)):
+                room = AuctionRoom(room_id)
+                ROOMS[room_id] = room
+                print(f"경매방 생성: {room_id}")
+    return room
 
-        # 이 티어가 없는 팀들만 후보
-        candidates = [
-            (otp, m) for otp, m in MANAGERS.items()
-            if not team_has_tier(m, tier)
-        ]
 
-        if candidates:
-            otp, manager = max(candidates, key=lambda kv: kv[1]['coin'])
+def reject_room(room_id: str, sid):
+    """없는 경매방에 들어오려는 연결에 알리고 끊는다 (다른 워커의 연결이면 메시지 버스로)"""
+    socketio.emit('room_error', {'room': room_id, 'message': '없는 경매방입니다. 관리자가 먼저 열어야 합니다.'}, to=sid)
+    socketio.server.disconnect(sid)
 
-            manager['team'][name] = {
-                'tier': tier,
-                'name': name,
-                'price': 0,
-                'round': AUCTION_STATE['round'],
-                'forced': True,
-            }
-            player['status'] = 'forced'
-            player['price'] = 0
-            player['owner_id'] = manager['id']
-
-            socketio.emit('chat_message', {
-                'name': '시스템',
-                'message': f"[자동 귀속] {manager['name']} 팀이 {name} 선수({tier} 티어)를 배정받았습니다."
-            })
-        else:
-            # 진짜 아무 팀도 받을 데 없으면 최종 유찰
-            player['status'] = 'unsold_final'
-            player['price'] = 0
-            player['owner_id'] = None
-
-            socketio.emit('chat_message', {
-                'name': '시스템',
-                'message': f"유찰 : {name} 선수({tier} 티어)"
-            })
-
-    AUCTION_STATE['status'] = 'ENDED'
-    AUCTION_STATE['current_player'] = '경매 종료'
-    AUCTION_STATE['current_tier'] = ''
-    socketio.emit('chat_message', {
-        'name': '시스템',
-        'message': '모든 1·2차 경매와 자동 귀속 처리가 종료되었습니다.'
-    })
-    emit_auction_state()
-    emit_manager_data()
-
-
-# --- 4. 경매 진행 함수 ---
-
-def reset_auction_for_next_player():
-    """
-    현재 경매 종료 후 다음 선수 경매 준비.
-    player_index 는 이미 end_bid / 자동귀속에서 증가된 상태라고 가정.
-    """
-    # 아직 남은 선수가 있다면, 자동귀속 먼저 체크
-    if AUCTION_STATE['player_index'] < len(AUCTION_STATE['player_list']):
-        current_tier = AUCTION_STATE['player_list'][AUCTION_STATE['player_index']]['tier']
-        check_and_apply_autoclaim(current_tier)
-
-    # 자동귀속 후 더 이상 남은 선수가 없는 경우
-    if AUCTION_STATE['player_index'] >= len(AUCTION_STATE['player_list']):
-        if AUCTION_STATE['round'] == 1:
-            # 1차 종료 → 2차 시작 (유찰 선수만)
-            start_second_round()
-        else:
-            # 2차까지 종료 → 최종 자동 배정
-            finalize_unsold_players()
-        return
 
-    # 다음 선수 경매 준비
-    next_player = AUCTION_STATE['player_list'][AUCTION_STATE['player_index']]
-    AUCTION_STATE['current_player'] = next_player['name']
-    AUCTION_STATE['current_tier'] = next_player['tier']
-    AUCTION_STATE['status'] = 'PAUSED'
-    AUCTION_STATE['current_price'] = 0
-    AUCTION_STATE['leading_manager_id'] = None
-    AUCTION_STATE['timer_end'] = time.time() + 5  # 5초 준비 시간
-
-    round_text = '1차' if AUCTION_STATE['round'] == 1 else '2차'
-    socketio.emit('chat_message', {
-        'name': '시스템',
-        'message': f"[{round_text}] 잠시 후 다음 선수: {next_player['name']} ({next_player['tier']} 티어) 경매를 시작합니다."
-    })
-
-    emit_auction_state()
-    emit_manager_data()
-
-
-def get_auction_data():
-    """클라이언트에 전송할 경매 상태 데이터 취합"""
-    timer_end = AUCTION_STATE.get('timer_end')
-    if timer_end:
-        timer_remaining = max(0, int(timer_end - time.time()))
-    else:
-        timer_remaining = 0
-
-    data = {
-        'state': AUCTION_STATE.get('status', 'INIT'),
-        'current_player': AUCTION_STATE.get('current_player', ''),
-        'player_tier': AUCTION_STATE.get('current_tier', ''),
-        'player_index': AUCTION_STATE.get('player_index', -1),
-        'current_price': AUCTION_STATE.get('current_price', 0),
-        'leading_manager_id': AUCTION_STATE.get('leading_manager_id', None),
-        'timer_remaining': timer_remaining,
-        'round': AUCTION_STATE.get('round', 1),
-
-        'managers': {
-            otp: {
-                'id': m['id'],
-                'name': m['name'],
-                'coin': m['coin'],
-                'team': m['team'],
-                'is_online': m['is_online'],
-            }
-            for otp, m in MANAGERS.items()
-        },
+def current_room_id() -> str:
+    """현재 Socket.IO 이벤트를 보낸 클라이언트가 속한 경매방 id"""
+    return normalize_room_id(SID_ROOMS.get(request.sid))
+
+
+# 경매 명령 큐를 거치지 않고 경매방의 채팅 채널 / 접속 현황에서 바로 처리하는 명령: command -> 속성 이름
+SERVICE_COMMANDS = {
+    'post_user_message': 'chat',
+    'send_history': 'chat',
+    'attach': 'presence',
+    'detach': 'presence',
+}
 
-        'player_list': AUCTION_STATE.get('player_list', []),
-    }
 
-    return data
+def run_room_command(room_id: str, command: str, args):
+    """
+    소유 워커에서 경매방 명령을 명령 큐에 넣는다. (채팅 / 접속 현황 명령은 해당 서비스로 바로)
+    없는 경매방이면 버리고, 접속(attach)이었으면 그 연결을 끊는다.
+    """
+    if command not in SERVICE_COMMANDS and command not in ROOM_COMMANDS and command not in ROOM_CREATING_COMMANDS:
+        return
+    while True:
+        room = get_room(room_id, create=command in ROOM_CREATING_COMMANDS)
+        if room is None:
+            if command == 'attach':
+                reject_room(room_id, args[0])
+            return
+        if command in SERVICE_COMMANDS:
+            getattr(getattr(room, SERVICE_COMMANDS[command]), command)(*args)
+        elif command in ROOM_COMMANDS:
+            room.submit(getattr(room, command), *args)
+        if not room.closed:
+            return
+        # 그 사이 메모리에서 내린 경매방이었으면 다시 불러온 경매방으로 한 번 더
 
 
-def emit_auction_state():
-    socketio.emit('auction_update', get_auction_data())
+def dispatch(room_id: str, command: str, *args):
+    """경매방 명령을 소유 워커로 보낸다 (이 프로세스가 소유하면 바로 명령 큐로)."""
+    if owns_room(room_id):
+        run_room_command(room_id, command, args)
+    else:
+        socketio.server.manager.publish_command(bus.owner_of(room_id, WORKERS), room_id, command, args)
 
 
-def emit_manager_data():
-    data = {
-        'managers': {
-            otp: {
-                'id': m['id'],
-                'name': m['name'],
-                'coin': m['coin'],
-                'team': m['team'],
-                'is_online': m['is_online'],
-            }
-            for otp, m in MANAGERS.items()
-        }
-    }
-    socketio.emit('manager_data_update', data)
+if MESSAGE_QUEUE and not IS_LAUNCHER:
+    # 다른 워커가 보낸 room_command 를 이 워커의 경매방 명령 큐로
+    socketio.server.manager.command_handler = run_room_command
+    # python-socketio 는 첫 Socket.IO 접속 때에야 버스에 붙으므로, 접속이 없는 워커가 소유한 경매방의
+    # 명령이 버려지지 않도록 워커 시작 때 버스 수신을 시작한다
+    socketio.server.manager_initialized = True
+    socketio.server.manager.initialize()
 
 
-# --- 5. Flask 라우트 ---
+# --- 4. Flask 라우트 ---
 
 @app.route('/')
 def index():
@@ -335,257 +898,893 @@ def index():
 def authenticate():
     """OTP 인증 처리"""
     otp = request.form.get('otp')
-    if otp in MANAGERS:
-        session_data = {'type': 'manager', 'otp': otp, 'id': MANAGERS[otp]['id'], 'name': MANAGERS[otp]['name']}
+    room_id = normalize_room_id(request.form.get('room'))
+    room = get_room(room_id) if owns_room(room_id) else None
+    if room is None and owns_room(room_id) and otp != ADMIN_OTP:
+        return jsonify({"success": False, "message": "없는 경매방입니다. 관리자가 먼저 열어야 합니다."}), 404
+    # 다른 워커가 소유한 경매방이면 초기 팀장 데이터 기준 (OTP/id 는 방마다 같다, 있는지는 그 워커가 접속 때 확인)
+    managers = room.managers if room is not None else MANAGERS
+    if otp in managers:
+        manager = managers[otp]
+        session_data = {'type': 'manager', 'otp': otp, 'id': manager['id'], 'name': manager['name'], 'room': room_id}
         return jsonify({"success": True, "access_type": "manager", "session": session_data})
     elif otp == ADMIN_OTP:
-        session_data = {'type': 'admin', 'otp': otp, 'name': '관리자'}
+        session_data = {'type': 'admin', 'otp': otp, 'name': '관리자', 'room': room_id}
         return jsonify({"success": True, "access_type": "admin", "session": session_data})
     else:
-        session_data = {'type': 'viewer', 'otp': None, 'name': '참관인'}
+        session_data = {'type': 'viewer', 'otp': None, 'name': '참관인', 'room': room_id}
         return jsonify({"success": True, "access_type": "viewer", "session": session_data})
 
 
-# --- 6. Socket.IO 이벤트 ---
+# 선수 명단 REST API: 소유 워커에서만 조회할 수 있다 (다른 워커면 421).
+# 조회/내보내기 응답에는 ETag 를 붙이고 If-None-Match 가 같으면 본문 없이 304.
+
+def api_error(status: int, message: str, **extra):
+    return jsonify(dict(extra, success=False, message=message)), status
+
+
+def api_room(room_id: str):
+    """(경매방, None) 또는 (None, 오류 응답). 조회만 하므로 없는 경매방을 새로 만들지 않는다 (내린 경매방은 복구)"""
+    if not ROOM_ID_PATTERN.match(room_id):
+        return None, api_error(404, "잘못된 경매방 id 입니다.")
+    if not owns_room(room_id):
+        return None, api_error(421, "다른 워커가 처리하는 경매방입니다.", worker=bus.owner_of(room_id, WORKERS))
+    room = get_room(room_id)
+    if room is None:
+        return None, api_error(404, "없는 경매방입니다.")
+    return room, None
+
+
+def query_set(name: str):
+    """?name=a,b 를 집합으로 (없으면 None = 거르지 않음)"""
+    value = request.args.get(name)
+    if not value:
+        return None
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+
+def query_int(name: str, default: int, high: int):
+    """0 ~ high 로 자른 정수 (숫자가 아니면 None)"""
+    try:
+        return min(high, max(0, int(request.args.get(name, default))))
+    except ValueError:
+        return None
+
+
+def player_filters():
+    """tier / status / owner 조건 (status 에 모르는 값이 있으면 None)"""
+    statuses = query_set('status')
+    if statuses is not None and not statuses <= set(STATUSES):
+        return None
+    return query_set('tier'), statuses, query_set('owner')
+
 
-@socketio.on('connect')
-def handle_connect():
-    print(f"클라이언트 연결됨: {request.sid}")
-    emit_auction_state()
+def conditional(etag: str, build) -> Response:
+    """If-None-Match 가 etag 와 같으면 304, 아니면 build() 응답에 ETag 를 붙여서"""
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = build()
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def read_conditional(room: AuctionRoom, etag, read, respond) -> Response:
+    """
+    ETag 와 응답에 쓸 사본을 경매방 명령 큐에서 한 번에 읽고 (room.read), 응답은 큐 밖에서 respond(사본) 으로.
+    etag() 가 If-None-Match 와 같으면 사본은 만들지 않는다 (304)
+    """
+    if_none_match = request.if_none_match
+
+    def snapshot():
+        tag = etag()
+        return tag, None if tag in if_none_match else read()
+
+    tag, data = room.read(snapshot)
+    return conditional(tag, lambda: respond(data))
+
+
+@app.route('/api/rooms/<room_id>/players')
+def list_players(room_id):
+    """선수 조회 (?tier=A,B&status=sold,forced&owner=T01&offset=0&limit=100, 명단 번호 순)"""
+    room, error = api_room(room_id)
+    if error:
+        return error
+    filters = player_filters()
+    offset = query_int('offset', 0, ROSTER_IMPORT_MAX)
+    limit = query_int('limit', ROSTER_PAGE_SIZE, ROSTER_PAGE_MAX)
+    if filters is None or offset is None or limit is None:
+        return api_error(400, f"잘못된 조회 조건입니다. (status: {', '.join(STATUSES)})")
+
+    epoch = room.state_sync['epoch']
+
+    def read():
+        roster = room.roster
+        players = roster.query(*filters)
+        return {
+            'room': room_id,
+            'revision': roster.revision,
+            'total': len(players),
+            'offset': offset,
+            'limit': limit,
+            'players': [roster.player_record(p) for p in players[offset:offset + limit]],
+        }
+
+    return read_conditional(room, lambda: f"{epoch}-r{room.roster.revision}", read, jsonify)
+
+
+@app.route('/api/rooms/<room_id>/teams')
+def list_teams(room_id):
+    """팀장별 팀 구성과 남은 코인 (?owner=T01,T02)"""
+    room, error = api_room(room_id)
+    if error:
+        return error
+    owners = query_set('owner')
+    epoch = room.state_sync['epoch']
+
+    def read():
+        roster = room.roster
+        teams = [
+            {
+                'id': m['id'],
+                'name': m['name'],
+                'coin': m['coin'],
+                'players': [roster.player_record(p) for p in roster.teams.get(m['id'], ())],
+            }
+            for m in room.managers.values() if owners is None or m['id'] in owners
+        ]
+        return {'room': room_id, 'teams': teams}
+
+    return read_conditional(room, lambda: f"{epoch}-m{room.mutation}", read, jsonify)
+
+
+@app.route('/api/rooms/<room_id>/export')
+def export_players(room_id):
+    """경매 결과 내보내기 (?format=csv|jsonl, 조회와 같은 조건). 명단이 커도 나눠서 스트리밍"""
+    room, error = api_room(room_id)
+    if error:
+        return error
+    fmt = request.args.get('format', 'csv')
+    filters = player_filters()
+    if fmt not in ROSTER_FORMATS or filters is None:
+        return api_error(400, f"format 은 {' / '.join(ROSTER_FORMATS)} 중 하나여야 합니다.")
+
+    epoch = room.state_sync['epoch']
+
+    def read():
+        # 큰 명단도 열 복사라 짧다. 스트리밍은 큐 밖에서 이 사본으로
+        roster = room.roster.copy()
+        return roster, roster.query(*filters)
+
+    def respond(data):
+        roster, players = data
+        mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+        return Response(export_lines(roster, players, fmt), mimetype=mimetype, headers={
+            'Content-Disposition': f'attachment; filename="{room_id}-players.{fmt}"',
+        })
+
+    return read_conditional(room, lambda: f"{epoch}-r{room.roster.revision}-{fmt}", read, respond)
+
+
+@app.route('/api/rooms/<room_id>/roster', methods=['POST'])
+def import_players(room_id):
+    """
+    선수 명단 가져오기 (관리자, X-Auction-OTP 헤더). 본문은 CSV(tier,name 헤더) 또는 JSONL.
+    ?format= 이 없으면 Content-Type 에 json 이 들어 있을 때 JSONL 로 읽는다.
+    검증은 여기서 한 줄씩 하고, 적용은 경매방 명령 큐(import_roster)로 넘긴다.
+    """
+    if request.headers.get('X-Auction-OTP') != ADMIN_OTP:
+        return api_error(403, "관리자만 선수 명단을 가져올 수 있습니다.")
+    if not ROOM_ID_PATTERN.match(room_id):
+        return api_error(404, "잘못된 경매방 id 입니다.")
+    fmt = request.args.get('format') or ('jsonl' if 'json' in (request.mimetype or '') else 'csv')
+    if fmt not in ROSTER_FORMATS:
+        return api_error(400, f"format 은 {' / '.join(ROSTER_FORMATS)} 중 하나여야 합니다.")
+    # 경매방이 없으면 명령 큐(import_roster)에 넘길 때 새로 만든다
+    room = ROOMS.get(room_id) if owns_room(room_id) else None
+    if room is not None and room.state['status'] not in ('READY', 'ENDED'):
+        return api_error(409, "경매 진행 중에는 선수 명단을 바꿀 수 없습니다.")
+
+    lines = io.TextIOWrapper(request.stream, encoding='utf-8-sig', newline='')
+    try:
+        entries = parse_roster(lines, fmt, ROSTER_IMPORT_MAX)
+    except RosterImportError as e:
+        return api_error(400, str(e), errors=e.errors)
+    except UnicodeDecodeError:
+        return api_error(400, "UTF-8 텍스트만 읽을 수 있습니다.")
+
+    dispatch(room_id, 'import_roster', entries)
+    tiers = collections.Counter(tier for tier, _ in entries)
+    return jsonify({'success': True, 'players': len(entries), 'tiers': dict(sorted(tiers.items()))}), 202
+
+
+def room_metrics(read):
+    """이 프로세스가 소유한 경매방별 지표 [(label 값 tuple, 값)]"""
+    return [item for room_id, room in sorted(ROOMS.items()) for item in read(room_id, room)]
+
+
+def socket_counts(room_id: str, room: AuctionRoom):
+    roles = room.presence.roles
+    return [
+        ((room_id, 'public'), sum(roles.values())),
+        ((room_id, 'managers'), roles['manager']),
+        ((room_id, 'admin'), roles['admin']),
+    ]
+
+
+metrics.Gauge('auction_sockets', 'Authenticated sockets per room channel',
+              lambda: room_metrics(socket_counts), ('room', 'channel'))
+metrics.Gauge('auction_payload_cache_total', 'Encoded payload cache lookups',
+              lambda: room_metrics(lambda room_id, room: [((room_id, result), count)
+                                                          for result, count in room.cache_stats.items()]),
+              ('room', 'result'), kind='counter')
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus 지표 (이 워커 프로세스 기준)"""
+    return metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+
+# --- 5. Socket.IO 이벤트 ---
+
+def on_socket_event(event: str):
+    """socketio.on 과 같지만 핸들러 전체를 추적 span(socket.<event>)으로 감싼다"""
+    return lambda handler: socketio.on(event)(TRACER.traced(f'socket.{event}', 'socket')(handler))
+
+
+@on_socket_event('connect')
+def handle_connect(auth=None):
+    # 접속 URL 의 ?room= 값으로 경매방을 고른다
+    room_id = normalize_room_id(request.args.get('room'))
+    SID_ROOMS[request.sid] = room_id
+    join_room(room_channel(room_id))
+    join_room(room_channel(room_id, wire.JSON))      # 상태 브로드캐스트는 authenticate 에서 형식을 고르기 전까지 JSON
+    SID_CHAT_LIMITS[request.sid] = TokenBucket(CHAT_RATE, CHAT_BURST)
+    # 상태/채팅은 authenticate 응답으로 이 클라이언트에게만 보낸다 (접속 때마다 방 전체에 보내지 않음)
+    print(f"클라이언트 연결됨: {request.sid} (경매방 {room_id})")
+
+
+def _drop_session_locked(token):
+    """세션 토큰 폐기 (SESSIONS_LOCK 을 잡은 채로 호출)"""
+    session = SESSIONS.pop(token, None) if token else None
+    if session is None:
+        return
+    if SID_SESSIONS.get(session['sid']) == token:
+        del SID_SESSIONS[session['sid']]
+    if OTP_SESSIONS.get((session['room'], session['otp'])) == token:
+        del OTP_SESSIONS[(session['room'], session['otp'])]
+    TIMERS.cancel(('session', token))
+
+
+def resume_session(token, room_id: str, sid):
+    """연결이 끊겼던 세션을 sid 에 다시 붙이고 세션을 돌려준다 (없거나 다른 방이거나 수명이 지났으면 None)"""
+    with SESSIONS_LOCK:
+        session = SESSIONS.get(token) if token else None
+        if session is None or session['room'] != room_id:
+            return None
+        if session['expires'] <= time.time():
+            _drop_session_locked(token)
+            return None
+        if SID_SESSIONS.get(sid) != token:
+            _drop_session_locked(SID_SESSIONS.get(sid))
+        SID_SESSIONS.pop(session['sid'], None)
+        session['sid'] = sid
+        SID_SESSIONS[sid] = token
+    TIMERS.cancel(('session', token))
+    return session
+
+
+def open_session(room_id: str, otp, role: str, sid) -> str:
+    """새 세션 토큰 발급. 같은 연결이나 같은 팀장이 이전에 받은 토큰은 버린다"""
+    token = secrets.token_urlsafe(16)
+    with SESSIONS_LOCK:
+        _drop_session_locked(SID_SESSIONS.get(sid))
+        if otp is not None:
+            _drop_session_locked(OTP_SESSIONS.get((room_id, otp)))
+            OTP_SESSIONS[(room_id, otp)] = token
+        SESSIONS[token] = {'room': room_id, 'otp': otp, 'role': role, 'sid': sid,
+                           'expires': time.time() + SESSION_TTL_SEC}
+        SID_SESSIONS[sid] = token
+    return token
+
+
+def detach_session(sid):
+    """연결이 끊긴 세션은 SESSION_RESUME_SEC 동안 재접속을 기다린 뒤 닫는다"""
+    with SESSIONS_LOCK:
+        token = SID_SESSIONS.pop(sid, None)
+        session = SESSIONS.get(token)
+        if session is None or session['sid'] != sid:
+            return
+        session['sid'] = None
+    TIMERS.schedule(('session', token), time.time() + SESSION_RESUME_SEC, lambda: expire_session(token))
+
+
+def expire_session(token):
+    with SESSIONS_LOCK:
+        session = SESSIONS.get(token)
+        if session is not None and session['sid'] is None:
+            _drop_session_locked(token)
 
 
-@socketio.on('authenticate')
+@on_socket_event('authenticate')
 def handle_authentication(data):
-    otp = data.get('otp')
-    if otp in MANAGERS:
-        manager = MANAGERS[otp]
-        manager['is_online'] = True
-        join_room(manager['id'])
-        join_room('managers')
-        print(f"팀장 접속: {manager['name']}")
-        emit_manager_data()
-    elif otp == ADMIN_OTP:
-        join_room('admin')
-        print("관리자 접속")
+    """
+    OTP 로 역할을 정하고 해당 채널에 참여. 응답으로 세션 토큰, 상태, 최근 채팅을 이 클라이언트에게만 보낸다.
+    resume 토큰이 살아 있으면 같은 세션으로 복귀해 since 이후 놓친 delta / 채팅만 받는다.
+    encodings(선호 순서의 전송 형식 목록)를 보내면 상태 메시지 형식을 협상한다 (없으면 JSON).
+    """
+    room_id = current_room_id()
+    session = resume_session(data.get('resume'), room_id, request.sid)
+    if session is not None:
+        otp, role = session['otp'], session['role']
+        token = data['resume']
+    else:
+        otp = data.get('otp')
+        role = 'manager' if otp in MANAGERS else 'admin' if otp == ADMIN_OTP else 'viewer'
+        if role == 'admin':
+            # 없는 경매방은 관리자만 연다
+            dispatch(room_id, 'open_room')
+        elif owns_room(room_id) and get_room(room_id) is None:
+            # 다른 워커가 소유한 방이면 그 워커가 attach 때 확인한다
+            reject_room(room_id, request.sid)
+            return
+        token = open_session(room_id, otp if role == 'manager' else None, role, request.sid)
 
-    join_room('public')
+    if role == 'manager':
+        manager = MANAGERS[otp]
+        SID_USERS[request.sid] = (otp, 'manager')
+        join_room(room_channel(room_id, manager['id']))
+        join_room(room_channel(room_id, 'managers'))
+        print(f"팀장 {'재접속' if session else '접속'}: {manager['id']} (경매방 {room_id})")
+    elif role == 'admin':
+        SID_USERS[request.sid] = (None, 'admin')
+        join_room(room_channel(room_id, 'admin'))
+        print(f"관리자 접속 (경매방 {room_id})")
+    else:
+        SID_USERS[request.sid] = (None, 'viewer')
+
+    wire_format = wire.negotiate(data.get('encodings'), WIRE_COMPRESS)
+    SID_WIRE[request.sid] = wire_format
+    if wire.is_binary(wire_format):
+        leave_room(room_channel(room_id, wire.JSON))
+        join_room(room_channel(room_id, wire.MSGPACK))
+
+    join_room(room_channel(room_id, 'public'))
+    dispatch(room_id, 'attach', request.sid, otp if role == 'manager' else None, role, wire_format)
+    emit('session', {'token': token, 'encoding': wire_format})
+    if session is not None:
+        dispatch(room_id, 'emit_auction_resume', request.sid, data.get('since'), wire_format)
+        dispatch(room_id, 'send_history', request.sid, data.get('chat_since'))
+    else:
+        dispatch(room_id, 'emit_auction_snapshot', request.sid, wire_format)
+        dispatch(room_id, 'send_history', request.sid)
 
 
-@socketio.on('disconnect')
+@on_socket_event('disconnect')
 def handle_disconnect():
-    # 간단 버전: 연결 끊길 때는 모두 오프라인으로 갱신 (세션 매핑이 없어서 완벽하진 않지만 현재 구조에서는 충분)
-    for otp, manager in MANAGERS.items():
-        if manager['is_online']:
-            manager['is_online'] = False
-    emit_manager_data()
+    room_id = normalize_room_id(SID_ROOMS.pop(request.sid, None))
+    SID_CHAT_LIMITS.pop(request.sid, None)
+    SID_WIRE.pop(request.sid, None)
+    if SID_USERS.pop(request.sid, None) is not None:
+        # 이 연결 하나만 뺀다. 같은 팀장의 다른 탭이 남아 있으면 온라인 유지 (PresenceService)
+        dispatch(room_id, 'detach', request.sid)
+    detach_session(request.sid)
     print("클라이언트 연결 해제")
 
 
-@socketio.on('place_bid')
+@on_socket_event('request_snapshot')
+def handle_request_snapshot(data=None):
+    """delta 버전이 어긋난(또는 처음 접속한) 클라이언트의 전체 상태 요청"""
+    dispatch(current_room_id(), 'emit_auction_snapshot', request.sid, SID_WIRE.get(request.sid, wire.JSON))
+
+
+@on_socket_event('clock_ping')
+def handle_clock_ping(data=None):
+    """
+    시계 맞추기 (NTP 방식). 클라이언트가 보낸 client 값을 그대로 돌려주며 서버 시각(epoch ms)을 붙인다.
+    클라이언트는 왕복 시간이 가장 짧은 응답으로 offset = server - (보낸 시각 + 받은 시각) / 2 을 잡는다.
+    경매방을 거치지 않는다.
+    """
+    client = data.get('client') if isinstance(data, dict) else None
+    emit('clock_pong', {'client': client, 'server': round(time.time() * 1000, 1)})
+
+
+@on_socket_event('place_bid')
 def handle_bid(data):
     """팀장이 입찰을 시도할 때 호출"""
+    dispatch(current_room_id(), 'place_bid', data.get('otp'), int(data.get('amount', 0)), request.sid)
 
-    manager_otp = data.get('otp')
-    bid_increment = int(data.get('amount', 0))
 
-    if AUCTION_STATE['status'] != 'BIDDING':
-        emit('bid_error', {'message': '현재 입찰 시간이 아닙니다.'})
+@on_socket_event('set_proxy_bid')
+def handle_proxy_bid(data):
+    """팀장 자동 입찰 최대 금액 등록 (max 0 이면 취소)"""
+    dispatch(current_room_id(), 'set_proxy_bid', data.get('otp'), int(data.get('max', 0)), request.sid)
+
+
+@on_socket_event('chat_message')
+def handle_chat_message(data):
+    """보낸 사람 이름은 클라이언트 값이 아니라 authenticate 때 확인한 신원으로 정한다"""
+    message = str((data or {}).get('message', '')).strip()[:CHAT_MAX_LENGTH]
+    if not message:
         return
 
-    manager = MANAGERS.get(manager_otp)
-    if manager is None:
-        emit('bid_error', {'message': '유효하지 않은 팀장입니다.'})
+    limit = SID_CHAT_LIMITS.get(request.sid)
+    if limit is not None and not limit.take():
+        emit('chat_error', {'message': '채팅을 너무 빠르게 보내고 있습니다. 잠시 후 다시 시도해 주세요.'})
         return
 
-    current_tier = AUCTION_STATE.get('current_tier')
-    if current_tier:
-        for _, player in manager['team'].items():
-            if player['tier'] == current_tier:
-                emit('bid_error', {
-                    'message': f'이미 {current_tier} 티어 선수를 보유하고 있어 입찰할 수 없습니다.'
-                }, room=manager_otp)
-                return
+    otp, role = SID_USERS.get(request.sid, (None, 'viewer'))
+    dispatch(current_room_id(), 'post_user_message', otp, role, message)
 
-    new_price = AUCTION_STATE['current_price'] + bid_increment
 
-    if manager['coin'] < new_price:
-        emit('bid_error', {
-            'message': f'보유 코인({manager["coin"]})보다 큰 금액으로 입찰할 수 없습니다.'
-        }, room=manager_otp)
-        return
+# --- 6. 관리자 액션 ---
+
+@on_socket_event('admin_start_auction')
+def start_auction(data=None):
+    dispatch(current_room_id(), 'start_auction')
 
-    # 최고 입찰 정보 갱신
-    AUCTION_STATE['current_price'] = new_price
-    AUCTION_STATE['leading_manager_id'] = manager['id']
 
-    # 누가 입찰하면 항상 15초로 연장
-    AUCTION_STATE['timer_end'] = time.time() + 15
+@on_socket_event('admin_end_bid')
+def end_bid(data=None):
+    dispatch(current_room_id(), 'end_bid')
 
-    socketio.emit('chat_message', {
-        'name': manager['name'],
-        'message': f"{new_price} 코인!"
-    })
 
-    emit_auction_state()
+@on_socket_event('admin_update_manager')
+def admin_update_manager(data):
+    dispatch(current_room_id(), 'update_manager', data.get('otp'), data)
 
 
-@socketio.on('chat_message')
-def handle_chat_message(data):
-    if 'name' in data and 'message' in data:
-        socketio.emit('chat_message', {'name': data['name'], 'message': data['message']})
+@on_socket_event('admin_trace')
+def admin_trace(data=None):
+    """
+    샘플링 추적 켜기/끄기 (재시작 없이). {'enabled': true, 'sample_rate': 0.1}
+    끄면 모은 span 을 TRACE_DIR 에 저장하고 경로를 trace_status 로 알려준다. 이 워커 프로세스에만 적용된다.
+    """
+    if SID_USERS.get(request.sid, (None, None))[1] != 'admin':
+        return
+    data = data if isinstance(data, dict) else {}
+    status = {'enabled': bool(data.get('enabled'))}
+    if status['enabled']:
+        try:
+            sample_rate = float(data.get('sample_rate', 1.0))
+        except (TypeError, ValueError):
+            sample_rate = math.nan
+        if not math.isfinite(sample_rate):
+            emit('trace_error', {'message': 'sample_rate 는 0 ~ 1 사이의 숫자여야 합니다.'})
+            return
+        TRACER.start(min(1.0, max(0.0, sample_rate)))
+        status['sample_rate'] = TRACER.sample_rate
+    elif TRACER.enabled:
+        path = os.path.join(TRACE_DIR, f"trace-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.json")
+        status['events'] = run_blocking(TRACER.stop, path)
+        status['path'] = path
+    emit('trace_status', status)
 
 
-# --- 7. 관리자 액션 ---
+# --- 7. 타이머 스케줄러 ---
 
-@socketio.on('admin_start_auction')
-def start_auction(data=None):
+class TimerScheduler:
+    """
+    마감 시각 min-heap 기반 타이머.
+    가장 가까운 마감 시각까지만 잠들었다가 깨어나므로, 대기 중인 타이머가 없으면 깨어나지 않고
+    마감은 timer_end 시각에 맞춰 바로 처리된다. 모든 경매방의 마감은 백그라운드 작업 하나(run)가 지켜보고,
+    콜백은 마감 큐에 넣어 고정된 TIMER_WORKERS 개의 작업(work)이 나눠 처리한다.
+    느린 콜백(emit 등)이 다른 마감을 늦추지 않으면서도 마감 수만큼 스레드가 생기지 않는다.
     """
-    READY / ENDED 상태에서 전체 리셋,
-    또는 PAUSED 상태에서 강제 BIDDING 전환
-    """
-    if AUCTION_STATE['status'] in ('READY', 'PAUSED', 'ENDED'):
-
-        if not AUCTION_STATE['is_started'] or AUCTION_STATE['status'] == 'ENDED':
-            # 완전 새로 시작
-            initialize_players()
-            AUCTION_STATE['is_started'] = True
-            AUCTION_STATE['status'] = 'PAUSED'
-            AUCTION_STATE['current_price'] = 0
-            AUCTION_STATE['leading_manager_id'] = None
-            AUCTION_STATE['timer_end'] = time.time() + 5
-
-            first = AUCTION_STATE['player_list'][0]
-            socketio.emit('chat_message', {
-                'name': '시스템',
-                'message': f"[1차 경매] 잠시 후 첫 선수: {first['name']} ({first['tier']} 티어) 경매를 시작합니다."
-            })
-            emit_auction_state()
-            return
 
-        if AUCTION_STATE['status'] == 'PAUSED':
-            AUCTION_STATE['status'] = 'BIDDING'
-            AUCTION_STATE['timer_end'] = time.time() + 15
-            socketio.emit('chat_message', {
-                'name': '시스템',
-                'message': f"관리자가 [{AUCTION_STATE['current_player']}] 선수 경매를 강제 재개했습니다!"
-            })
-            emit_auction_state()
+    def __init__(self):
+        self._heap = []                 # [deadline, seq, key, callback] (callback None = 취소됨)
+        self._entries = {}              # key -> 현재 유효한 heap 항목
+        self._seq = itertools.count()   # 같은 마감 시각일 때 등록 순서 보장
+        self._cond = threading.Condition()
+        self._due = queue.Queue()       # 마감된 (key, callback), work 가 꺼내 처리
+
+    def schedule(self, key, deadline: float, callback):
+        """key 의 마감을 deadline(time.time() 기준)으로 등록. 기존 마감이 있으면 교체"""
+        with self._cond:
+            self._cancel_locked(key)
+            entry = [deadline, next(self._seq), key, callback]
+            self._entries[key] = entry
+            heapq.heappush(self._heap, entry)
+            if self._heap[0] is entry:
+                # 가장 가까운 마감이 바뀌었으면 대기 중인 run() 을 깨운다
+                self._cond.notify()
+
+    def cancel(self, key):
+        with self._cond:
+            self._cancel_locked(key)
+
+    def _cancel_locked(self, key):
+        # heap 에서 바로 빼지 않고 무효 표시만 (꺼낼 때 버림)
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry[3] = None
+
+    def _next_due(self):
+        """다음 마감 항목이 될 때까지 대기 후 꺼내서 돌려준다."""
+        with self._cond:
+            while True:
+                while self._heap and self._heap[0][3] is None:
+                    heapq.heappop(self._heap)
+
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                delay = self._heap[0][0] - time.time()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+
+                entry = heapq.heappop(self._heap)
+                if self._entries.get(entry[2]) is entry:
+                    del self._entries[entry[2]]
+                return entry
+
+    def run(self):
+        """마감된 항목을 꺼내 마감 큐에 넣기만 한다 (콜백은 work 가 처리)"""
+        while True:
+            _, _, key, callback = self._next_due()
+            self._due.put((key, callback))
+
+    def work(self):
+        """마감 큐의 콜백을 하나씩 처리 (TIMER_WORKERS 개가 함께 돈다)"""
+        while True:
+            self._dispatch(*self._due.get())
+
+    @staticmethod
+    def _dispatch(key, callback):
+        try:
+            with app.app_context(), TRACER.span(f"timer.{getattr(callback, '__qualname__', 'callback')}", 'timer'):
+                callback()
+        except Exception as e:
+            print(f"타이머 처리 오류 ({key}): {e!r}")
+
+
+TIMERS = TimerScheduler()
+socketio.start_background_task(TIMERS.run)
+for _ in range(TIMER_WORKERS):
+    socketio.start_background_task(TIMERS.work)
+
+
+# --- 8. 채팅 ---
+
+class TokenBucket:
+    """초당 rate 개씩 채워지고 최대 burst 개까지 쌓이는 전송 허용량"""
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
 
 
-@socketio.on('admin_end_bid')
-def end_bid(data=None):
-    """관리자가 현재 입찰을 강제 종료하거나, 타이머가 0이 되었을 때 호출"""
-    if AUCTION_STATE['status'] != 'BIDDING':
-        return
+class ChatChannel:
+    """
+    경매방 채팅.
+      - 최근 CHAT_HISTORY 개를 ring buffer 로 보관해 새로 접속한 클라이언트에게 chat_history 로 보낸다.
+      - 메시지는 바로 보내지 않고 CHAT_FLUSH_INTERVAL 동안 모아 chat_batch 로 한 번에 보낸다.
+      - 경매 명령 큐 / 상태 flush 와는 별도의 lock 과 타이머를 써서
+        채팅이 몰려도 입찰 처리나 상태 브로드캐스트가 늦어지지 않는다.
+    kind: system(시스템 안내) / bid(입찰 알림) / user(사용자 채팅)
+    """
 
-    leading_id = AUCTION_STATE['leading_manager_id']
-    final_price = AUCTION_STATE['current_price']
+    def __init__(self, room: 'AuctionRoom'):
+        self.room = room
+        self.history = collections.deque(maxlen=CHAT_HISTORY)
+        self.pending = []
+        self.seq = 0                # 메시지 번호 (재접속 클라이언트가 어디까지 받았는지)
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()  # flush 가 겹쳐도 묶음이 순서대로 나가도록 (post 는 막지 않음)
+        self.flush_scheduled = False
+
+    def post(self, name: str, message: str, kind: str):
+        with self.lock:
+            self.seq += 1
+            entry = {'seq': self.seq, 'name': name, 'message': message, 'kind': kind, 'time': time.time()}
+            self.history.append(entry)
+            self.pending.append(entry)
+            if self.flush_scheduled:
+                return
+            self.flush_scheduled = True
+        TIMERS.schedule((self.room.room_id, 'chat'), time.time() + CHAT_FLUSH_INTERVAL, self.flush)
 
-    if AUCTION_STATE['player_index'] >= len(AUCTION_STATE['player_list']):
-        return
+    def post_user_message(self, otp, role: str, message: str):
+        """사용자 채팅. 이름은 경매방의 현재 팀장 이름(관리자가 바꿨을 수 있음)으로 정한다."""
+        if role == 'manager' and otp in self.room.managers:
+            name = self.room.managers[otp]['name']
+        else:
+            name = '관리자' if role == 'admin' else '참관인'
+        self.post(name, message, 'user')
+
+    def flush(self):
+        with self.flush_lock:
+            with self.lock:
+                messages, self.pending = self.pending, []
+                self.flush_scheduled = False
+            if messages:
+                self.room.emit('chat_batch', {'messages': messages})
+
+    def send_history(self, sid, since=None):
+        """최근 채팅 기록. since(마지막으로 받은 seq) 이후가 모두 남아 있으면 그 뒤만 보낸다"""
+        with self.lock:
+            if isinstance(since, int) and since <= self.seq and (not self.history or self.history[0]['seq'] <= since + 1):
+                messages = [m for m in self.history if m['seq'] > since]
+            else:
+                since = None
+                messages = list(self.history)
+        self.room.emit('chat_history', {'since': since, 'messages': messages}, to=sid)
 
-    current_player_info = AUCTION_STATE['player_list'][AUCTION_STATE['player_index']]
 
-    if leading_id:
-        # 낙찰 처리
-        winning_manager_otp = next(otp for otp, m in MANAGERS.items() if m['id'] == leading_id)
-        winning_manager = MANAGERS[winning_manager_otp]
+# --- 9. 접속 현황 ---
 
-        winning_manager['coin'] -= final_price
-        winning_manager['team'][current_player_info['name']] = {
-            'tier': current_player_info['tier'],
-            'name': current_player_info['name'],
-            'price': final_price,
-            'round': AUCTION_STATE['round'],
-        }
+class PresenceService:
+    """
+    경매방 접속 현황. 소유 워커에서 authenticate / disconnect 때 attach / detach 로 갱신한다.
+      - sids    : sid -> (팀장 otp 또는 None, 'manager' / 'admin' / 'viewer', 전송 형식)
+      - counts  : 팀장 otp -> 열려 있는 연결 수 (같은 팀장이 탭을 여러 개 열 수 있다)
+      - roles   : 역할별 연결 수
+      - formats : 전송 형식별 연결 수 (MessagePack 클라이언트가 없으면 바이너리로 인코딩하지 않는다)
+    팀장의 접속 여부(연결 수 > 0)가 바뀌어도 바로 보내지 않고 PRESENCE_DEBOUNCE_SEC 동안 모았다가
+    apply_presence 명령 하나로 반영한다. 그동안 끊겼다 다시 붙은 팀장은 아무것도 바뀌지 않는다.
+    """
 
-        current_player_info['status'] = 'sold'
-        current_player_info['price'] = final_price
-        current_player_info['owner_id'] = winning_manager['id']
+    def __init__(self, room: 'AuctionRoom'):
+        self.room = room
+        self.sids = {}
+        self.counts = collections.Counter()
+        self.roles = collections.Counter()
+        self.formats = collections.Counter()
+        self.lock = threading.Lock()
+        self.flush_scheduled = False
+
+    def attach(self, sid, otp, role: str, wire_format: str = wire.JSON):
+        with self.lock:
+            self.room.last_active = time.time()
+            changed = self._remove(sid)
+            self.sids[sid] = (otp, role, wire_format)
+            self.roles[role] += 1
+            self.formats[wire_format] += 1
+            if role == 'manager':
+                self.counts[otp] += 1
+                changed = changed or self.counts[otp] == 1
+            if changed:
+                self._schedule()
+
+    def detach(self, sid):
+        with self.lock:
+            self.room.last_active = time.time()
+            if self._remove(sid):
+                self._schedule()
+
+    def _remove(self, sid) -> bool:
+        """sid 의 연결을 빼고, 그 때문에 팀장 하나가 마지막 연결을 잃었으면 True (lock 안에서 호출)"""
+        entry = self.sids.pop(sid, None)
+        if entry is None:
+            return False
+        otp, role, wire_format = entry
+        self.roles[role] -= 1
+        self.formats[wire_format] -= 1
+        if role != 'manager':
+            return False
+        self.counts[otp] -= 1
+        if self.counts[otp] > 0:
+            return False
+        del self.counts[otp]
+        return True
 
-        socketio.emit('chat_message', {
-            'name': '시스템',
-            'message': f"🎉 {winning_manager['name']} 팀이 {current_player_info['name']} 선수를 {final_price} 코인에 낙찰했습니다!"
-        })
+    def binary_clients(self) -> int:
+        return self.formats[wire.MSGPACK] + self.formats[wire.MSGPACK_ZLIB]
 
-    else:
-        # 유찰 처리
-        current_player_info['status'] = 'unsold'
-        current_player_info['price'] = 0
-        current_player_info['owner_id'] = None
-
-        socketio.emit('chat_message', {
-            'name': '시스템',
-            'message': f"❌ {current_player_info['name']} 선수가 유찰되었습니다."
-        })
+    def _schedule(self):
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            TIMERS.schedule((self.room.room_id, 'presence'), time.time() + PRESENCE_DEBOUNCE_SEC, self.flush)
 
-    # 다음 선수로 이동 후 준비
-    AUCTION_STATE['player_index'] += 1
-    AUCTION_STATE['current_price'] = 0
-    AUCTION_STATE['leading_manager_id'] = None
-    AUCTION_STATE['status'] = 'PAUSED'
-    reset_auction_for_next_player()
+    def flush(self):
+        with self.lock:
+            self.flush_scheduled = False
+            online = frozenset(self.counts)
+        if online != self.room.online:
+            self.room.submit(self.room.apply_presence, online)
 
 
-@socketio.on('admin_update_manager')
-def admin_update_manager(data):
-    """관리자가 팀장의 코인, 이름 등을 수정"""
-    target_otp = data.get('otp')
-    if target_otp in MANAGERS:
-        if 'coin' in data:
-            MANAGERS[target_otp]['coin'] = int(data.get('coin'))
-        if 'name' in data:
-            MANAGERS[target_otp]['name'] = data.get('name')
+# --- 10. 경매 기록 (이벤트 로그 & 스냅샷) ---
 
-        emit_manager_data()
-        emit_auction_state()
-        socketio.emit('chat_message', {
-            'name': '시스템',
-            'message': f"관리자가 [{MANAGERS[target_otp]['name']}] 팀장의 정보를 수정했습니다."
-        })
+class EventLog:
+    """
+    경매방 하나의 append-only 이벤트 로그({room}.log, JSON Lines)와 스냅샷({room}.snapshot.json).
+    로그 한 줄 = 명령 묶음 하나: {'seq', 'time', 'events': [...], 'ops': [JSON Patch]}
+    스냅샷을 쓰면 그 seq 까지의 로그는 필요 없으므로 로그 파일을 비운다.
+    """
 
+    def __init__(self, room_id: str):
+        self.log_path = os.path.join(DATA_DIR, f"{room_id}.log")
+        self.snapshot_path = os.path.join(DATA_DIR, f"{room_id}.snapshot.json")
+        self.file = None
+        self.lock = threading.Lock()        # 파일 쓰기
+        self.sync_lock = threading.Lock()   # fsync / 로그 비우기 (쓰기를 막지 않도록 분리)
+        self.unsynced = False
+        self.records_since_snapshot = 0
+
+    def _open(self):
+        if self.file is None:
+            os.makedirs(DATA_DIR, exist_ok=True)
+            self.file = open(self.log_path, 'a', encoding='utf-8')
+
+    def append(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+        with self.lock:
+            self._open()
+            self.file.write(line + '\n')
+            self.unsynced = True
+        self.records_since_snapshot += 1
+        LOG_SYNCER.request(self)
+
+    def sync(self):
+        with self.sync_lock:
+            with self.lock:
+                if not self.unsynced:
+                    return
+                self.file.flush()
+                self.unsynced = False
+                fd = self.file.fileno()
+            run_blocking(os.fsync, fd)
+
+    def write_snapshot(self, seq: int, doc: dict):
+        """스냅샷을 임시 파일에 쓰고 rename 으로 교체한 뒤 로그를 비운다."""
+        os.makedirs(DATA_DIR, exist_ok=True)
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'seq': seq, 'time': time.time(), 'doc': doc}, f, ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            run_blocking(os.fsync, f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        with self.sync_lock:
+            with self.lock:
+                if self.file is not None:
+                    self.file.close()
+                self.file = open(self.log_path, 'w', encoding='utf-8')
+                self.unsynced = False
+        self.records_since_snapshot = 0
+
+    def close(self):
+        """남은 기록을 fsync 하고 파일을 닫는다 (메모리에서 내린 경매방)"""
+        self.sync()
+        with self.sync_lock:
+            with self.lock:
+                if self.file is not None:
+                    self.file.close()
+                    self.file = None
+
+    @staticmethod
+    def exists(room_id: str) -> bool:
+        """room_id 경매방의 스냅샷이 남아 있는지"""
+        return bool(DATA_DIR) and os.path.exists(os.path.join(DATA_DIR, f"{room_id}.snapshot.json"))
+
+    def load(self):
+        """(스냅샷 또는 None, 로그 기록 목록). 중간에 끊긴 마지막 줄은 버린다."""
+        try:
+            with open(self.snapshot_path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None, []
+
+        records = []
+        try:
+            with open(self.log_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        break
+        except OSError:
+            pass
+        return snapshot, records
+
+
+class LogSyncer:
+    """
+    이벤트 로그 fsync 를 LOG_FSYNC_INTERVAL 동안 모아서 한 번에 처리하는 백그라운드 작업.
+    기록이 없으면 깨어나지 않는다.
+    """
 
-# --- 8. 타이머 스레드 ---
+    def __init__(self):
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+
+    def request(self, log: EventLog):
+        with self.lock:
+            self.pending.add(log)
+            self.wakeup.set()
+
+    def run(self):
+        while True:
+            self.wakeup.wait()
+            socketio.sleep(LOG_FSYNC_INTERVAL)
+            with self.lock:
+                logs, self.pending = self.pending, set()
+                self.wakeup.clear()
+            for log in logs:
+                try:
+                    log.sync()
+                except OSError as e:
+                    print(f"이벤트 로그 fsync 오류 ({log.log_path}): {e!r}")
+
+
+LOG_SYNCER = LogSyncer()
+socketio.start_background_task(LOG_SYNCER.run)
+
+
+def recover_rooms():
+    """DATA_DIR 에 스냅샷이 남아 있는 경매방 중 이 프로세스가 소유한 것을 모두 복구"""
+    if not DATA_DIR or not os.path.isdir(DATA_DIR):
+        return
+    for filename in sorted(os.listdir(DATA_DIR)):
+        if filename.endswith('.snapshot.json'):
+            room_id = filename[:-len('.snapshot.json')]
+            if owns_room(room_id):
+                get_room(room_id)
 
-def timer_thread():
-    """백그라운드에서 타이머 및 경매 상태 관리"""
-    while True:
-        socketio.sleep(1)
-        current_time = time.time()
 
-        if AUCTION_STATE['status'] == 'BIDDING':
-            if current_time >= AUCTION_STATE['timer_end']:
-                with app.app_context():
-                    end_bid()
-            else:
-                emit_auction_state()
-
-        elif AUCTION_STATE['status'] == 'PAUSED':
-            if current_time >= AUCTION_STATE['timer_end']:
-                with app.app_context():
-                    AUCTION_STATE['status'] = 'BIDDING'
-                    AUCTION_STATE['timer_end'] = time.time() + 15
-                    socketio.emit('chat_message', {
-                        'name': '시스템',
-                        'message': f"[{AUCTION_STATE['current_player']}] 선수 경매가 시작되었습니다! 입찰해 주세요."
-                    })
-                    emit_auction_state()
-            else:
-                emit_auction_state()
+# 서버 시작 시 저장된 경매방 복구 & 허용 목록의 경매방 준비
+recover_rooms()
+for allowed_room in sorted(ROOM_ALLOWLIST):
+    if owns_room(allowed_room):
+        get_room(allowed_room)
 
 
-socketio.start_background_task(timer_thread)
+# --- 11. 실행 ---
 
+def run_workers(port: int):
+    """
+    AUCTION_WORKERS 개의 워커 프로세스를 PORT, PORT+1, ... 에 띄우고 메시지 버스로 연결.
+    AUCTION_MESSAGE_QUEUE 가 없으면 이 프로세스가 unix 소켓 버스(BusHub)를 직접 연다.
+    워커 앞단에는 sticky session(예: nginx ip_hash) 로드밸런서를 둔다.
+    """
+    queue = MESSAGE_QUEUE or f"unix://{os.path.join(tempfile.gettempdir(), 'auction-bus.sock')}"
+    if queue.startswith('unix://'):
+        bus.BusHub(queue[len('unix://'):]).start()
+
+    workers = []
+    for i in range(WORKERS):
+        env = dict(os.environ, AUCTION_WORKER_INDEX=str(i), AUCTION_MESSAGE_QUEUE=queue, PORT=str(port + i))
+        workers.append(subprocess.Popen([sys.executable, os.path.abspath(__file__)], env=env))
+        print(f"워커 {i} 시작: 포트 {port + i}")
+
+    try:
+        for worker in workers:
+            worker.wait()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
 
-# --- 9. 실행 ---
 
-if __name__ == "__main__":
+if __name__ == "__main__" and IS_LAUNCHER:
+    run_workers(int(os.environ.get("PORT", 5000)))
+
+elif __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
-    print("경매 서버 시작 중…")
+    print(f"경매 서버 시작 중… ({ASYNC_MODE})")
     socketio.run(
         app,
         host="0.0.0.0",
         port=port,
         allow_unsafe_werkzeug=True,
+        # 접속이 많은 gevent/eventlet 모드에서는 요청마다 남는 access log 를 끈다
+        log_output=ASYNC_MODE == 'threading',
     )
-
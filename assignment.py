@@ -0,0 +1,68 @@
+# assignment.py
+"""
+2차 경매 후 남은 선수 일괄 배정.
+
+남은 선수는 0 코인에 강제 배정되므로 배정해도 팀장 코인은 바뀌지 않고,
+한 팀장은 티어마다 한 명만 받을 수 있다. 그래서 티어별로 '그 티어가 없는 팀장' 후보를
+우선순위 heap 에 넣어 두고 선수 순서대로 꺼내 쓰면 된다.
+(O(팀장 수 × 티어 수 + 선수 수 × log 팀장 수), 같은 입력이면 항상 같은 결과)
+
+정책 (ASSIGNMENT_POLICIES)
+  richest  : 코인이 가장 많이 남은 팀장부터 (기존 규칙)
+  balanced : 팀 인원이 가장 적은 팀장부터, 같으면 코인 많은 순. 배정될 때마다 인원이 늘어난다
+  min_cost : 받는 팀장들의 남은 코인 합이 최소가 되도록 = 코인이 가장 적은 팀장부터.
+             티어끼리 서로 영향이 없어 티어별 탐욕 선택이 곧 최소 비용 매칭이다
+같은 우선순위면 managers 에 넘긴 순서가 앞선 팀장이 받는다.
+"""
+import heapq
+
+
+# 정책 -> (팀 인원이 적은 순을 먼저 볼지, 코인 정렬 방향 -1: 많은 순 / 1: 적은 순)
+ASSIGNMENT_POLICIES = {
+    'richest': (False, -1),
+    'balanced': (True, -1),
+    'min_cost': (False, 1),
+}
+
+
+def assign_leftovers(players, managers, missing, policy: str = 'richest') -> list:
+    """
+    players  : [(선수 key, tier)] 배정할 순서대로
+    managers : [(팀장 key, 남은 코인, 현재 팀 인원)]
+    missing  : tier -> 그 티어 선수가 없는 팀장 key 집합
+    반환     : [(선수 key, 팀장 key 또는 None(받을 팀 없음))] players 순서대로
+    """
+    by_size, direction = ASSIGNMENT_POLICIES[policy]
+    keys = [key for key, _, _ in managers]
+    sizes = [size for _, _, size in managers]
+
+    # heap 항목: (팀 인원 또는 0, 코인 순위, 팀장 순서)
+    heaps = {}
+    for tier in {tier for _, tier in players}:
+        lacking = missing.get(tier, ())
+        heap = [
+            (size if by_size else 0, direction * coin, order)
+            for order, (key, coin, size) in enumerate(managers) if key in lacking
+        ]
+        heapq.heapify(heap)
+        heaps[tier] = heap
+
+    result = []
+    for player, tier in players:
+        heap = heaps[tier]
+        chosen = None
+        while heap:
+            size, coin_rank, order = heapq.heappop(heap)
+            if by_size and sizes[order] != size:
+                # 다른 티어에서 배정받아 인원이 늘어난 후보 → 새 순위로 다시 넣는다
+                heapq.heappush(heap, (sizes[order], coin_rank, order))
+                continue
+            chosen = order
+            break
+
+        if chosen is None:
+            result.append((player, None))
+        else:
+            sizes[chosen] += 1
+            result.append((player, keys[chosen]))
+    return result
@@ -0,0 +1,61 @@
+# benchmarks/assignment.py
+"""
+2차 경매 후 남은 선수 일괄 배정(assignment.py) 벤치마크.
+
+무작위 리그(선수/팀장/티어 수 지정)를 만들어 정책별로
+  - 배정에 걸린 시간
+  - 배정된 선수 수 / 최종 유찰 수
+  - 같은 입력으로 두 번 돌렸을 때 결과가 같은지
+를 JSON 한 줄씩 출력한다.
+
+    python benchmarks/assignment.py --players 100000 --managers 1000 --tiers 50
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assignment import ASSIGNMENT_POLICIES, assign_leftovers  # noqa: E402
+
+
+def make_league(players: int, managers: int, tiers: int, seed: int):
+    rng = random.Random(seed)
+    tier_names = [f"T{i}" for i in range(tiers)]
+    manager_rows = [(f"M{i}", rng.randint(0, 1000), rng.randint(0, tiers)) for i in range(managers)]
+    missing = {tier: {key for key, _, _ in manager_rows if rng.random() < 0.5} for tier in tier_names}
+    player_rows = [(i, rng.choice(tier_names)) for i in range(players)]
+    return player_rows, manager_rows, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=10000, help='남은 선수 수')
+    parser.add_argument('--managers', type=int, default=100)
+    parser.add_argument('--tiers', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    players, managers, missing = make_league(args.players, args.managers, args.tiers, args.seed)
+    for policy in ASSIGNMENT_POLICIES:
+        started = time.perf_counter()
+        result = assign_leftovers(players, managers, missing, policy)
+        elapsed = time.perf_counter() - started
+        assigned = sum(1 for _, manager in result if manager is not None)
+        print(json.dumps({
+            'policy': policy,
+            'players': args.players,
+            'managers': args.managers,
+            'tiers': args.tiers,
+            'elapsed_ms': round(elapsed * 1000, 2),
+            'assigned': assigned,
+            'unsold_final': len(result) - assigned,
+            'deterministic': result == assign_leftovers(players, managers, missing, policy),
+        }))
+
+
+if __name__ == '__main__':
+    main()
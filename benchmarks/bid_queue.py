@@ -0,0 +1,100 @@
+# benchmarks/bid_queue.py
+"""
+경매방 명령 큐 입찰 처리량 벤치마크.
+
+여러 스레드가 동시에 place_bid 를 보냈을 때
+  - 초당 처리한 입찰 수
+  - 입찰이 유실/역전 없이 +5 씩 순서대로 반영됐는지
+  - 묶음 전송(flush)으로 줄어든 상태 브로드캐스트 횟수
+를 JSON 한 줄로 출력한다.
+
+    python benchmarks/bid_queue.py --threads 8 --bids 2000
+    python benchmarks/bid_queue.py --direct     # 큐 없이 직접 호출 (비교용)
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 벤치마크 경매방 기록이 실제 data/ 에 남지 않도록 임시 디렉터리 사용
+os.environ.setdefault('AUCTION_DATA_DIR', tempfile.mkdtemp(prefix='auction-bench-'))
+
+import app  # noqa: E402
+
+
+def run(threads: int, bids: int, direct: bool) -> dict:
+    room = app.get_room('bench')
+    for manager in room.managers.values():
+        manager['coin'] = 10 ** 9
+    room.state['status'] = 'BIDDING'
+    room.set_timer(3600)
+
+    otps = list(room.managers)
+    prices = []
+    broadcasts = [0]
+
+    emit_auction_state = room.emit_auction_state
+
+    def counted_emit_auction_state():
+        broadcasts[0] += 1
+        emit_auction_state()
+
+    room.emit_auction_state = counted_emit_auction_state
+
+    def bid(otp):
+        room.place_bid(otp, 5, None)
+        prices.append(room.state['current_price'])
+
+    def worker(n):
+        otp = otps[n % len(otps)]
+        for _ in range(bids):
+            if direct:
+                # 이전 방식: 잠금 없이 처리하고 입찰마다 전체 브로드캐스트
+                bid(otp)
+                room.mutation += 1      # 큐를 거치지 않으므로 직렬화 캐시도 직접 무효화
+                room.emit_auction_state()
+            else:
+                room.submit(bid, otp)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    started = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    app.TIMERS.cancel(room.room_id)
+
+    total = threads * bids
+    in_order = all(b - a == 5 for a, b in zip(prices, prices[1:]))
+    return {
+        'mode': 'direct' if direct else 'queue',
+        'threads': threads,
+        'bids': total,
+        'elapsed_sec': round(elapsed, 4),
+        'bids_per_sec': round(total / elapsed, 1),
+        'final_price': room.state['current_price'],
+        'expected_price': total * 5,
+        'lost_bids': total - room.state['current_price'] // 5,
+        'in_order': in_order,
+        'broadcasts': broadcasts[0],
+        'payload_cache': dict(room.cache_stats),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--bids', type=int, default=2000, help='스레드당 입찰 수')
+    parser.add_argument('--direct', action='store_true', help='명령 큐를 거치지 않고 place_bid 직접 호출')
+    args = parser.parse_args()
+    print(json.dumps(run(args.threads, args.bids, args.direct)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,507 @@
+# benchmarks/load.py
+"""
+Socket.IO 프로토콜 부하/지연 벤치마크.
+
+서버(app.py)를 로컬에서 띄우고(--url 을 주면 이미 떠 있는 서버 사용)
+경매방마다 팀장 3명이 입찰을 반복하고 참관인 M 명이 구경하는 상황을 만든 뒤
+다음 값을 JSON 으로 출력한다.
+
+  - bid_latency_ms      : place_bid 전송 → 그 입찰이 반영된 auction_delta 수신 (p50/p99)
+  - fanout_ms           : 같은 버전의 delta 를 첫 참관인과 마지막 참관인이 받은 시각 차이 (p50/p99)
+  - payload_bytes       : 참관인 하나가 받은 상태 메시지 크기 (평균/최대/초당)
+  - timer_close_drift_ms: 상태의 마감 시각(timer_end) 대비 낙찰 알림 수신 지연
+                          (서버와 같은 호스트의 시계 기준, 브로드캐스트 묶음 지연 포함)
+  - server              : 서버 프로세스 CPU 시간/사용률, 시작·종료 시 RSS (워커 프로세스 합)
+
+--workers N 이면 임시 서버를 AUCTION_WORKERS=N 으로 띄우고 클라이언트를 PORT..PORT+N-1 에 나눠 붙여
+다른 워커가 소유한 경매방으로 가는 입찰(메시지 버스 경유)까지 포함한 처리량(bids_per_sec)을 잰다.
+
+--idle N 을 주면 입찰 없이 참관인 N 명을 연결만 해 두고(인증 후 ping 에만 응답)
+연결 전후 서버 RSS / 스레드 수와 연결 하나당 RSS 증가량을 출력한다.
+
+    pip install "python-socketio[client]"
+    python benchmarks/load.py --rooms 2 --viewers 50 --duration 10 --output bench.json
+    python benchmarks/load.py --rooms 8 --viewers 20 --workers 4
+    python benchmarks/load.py --idle 10000 --hold 30
+"""
+import argparse
+import itertools
+import json
+import os
+import queue
+import selectors
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import socketio
+import websocket
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# app 은 import 만 해도 경매방 / 타이머 / 기록을 시작하므로 서버 밖에서 쓰는 값은 작은 모듈에서만 읽는다
+from config import ADMIN_OTP, MANAGERS  # noqa: E402
+from delta import apply_json_patch  # noqa: E402
+from engine import BID_EXTEND_SEC  # noqa: E402
+CLK_TCK = os.sysconf('SC_CLK_TCK')
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, int(round(p / 100.0 * (len(values) - 1)))))
+    return values[k]
+
+
+def summarize_ms(values):
+    return {
+        'count': len(values),
+        'p50': round(percentile(values, 50) * 1000, 3) if values else None,
+        'p99': round(percentile(values, 99) * 1000, 3) if values else None,
+        'max': round(max(values) * 1000, 3) if values else None,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def process_tree(pid: int):
+    """pid 와 그 자식 프로세스들 (워커 여러 개면 런처 + 워커)"""
+    pids = [pid]
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except OSError:
+            continue
+        if ppid == pid:
+            pids.append(int(entry))
+    return pids
+
+
+def proc_status(pid: int, field: str) -> int:
+    with open(f'/proc/{pid}/status') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith(field + ':'))
+
+
+def free_port_range(count: int) -> int:
+    """연속으로 비어 있는 포트 count 개의 첫 번호 (워커 i 가 PORT+i 를 쓴다)"""
+    while True:
+        port = free_port()
+        try:
+            for i in range(1, count):
+                with socket.socket() as s:
+                    s.bind(('127.0.0.1', port + i))
+            return port
+        except OSError:
+            continue
+
+
+def proc_usage(pid: int):
+    """(누적 CPU 초, RSS KB) — Linux /proc 기준, 자식 프로세스 포함"""
+    cpu = rss = 0
+    for p in process_tree(pid):
+        with open(f'/proc/{p}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        cpu += (int(fields[11]) + int(fields[12])) / CLK_TCK
+        rss += proc_status(p, 'VmRSS')
+    return cpu, rss
+
+
+def proc_threads(pid: int) -> int:
+    return sum(proc_status(p, 'Threads') for p in process_tree(pid))
+
+
+class StateClient:
+    """auction_update/auction_delta 로 경매 상태를 따라가는 Socket.IO 클라이언트"""
+
+    def __init__(self, url: str, room: str, otp=None):
+        self.url = url
+        self.room = room
+        self.otp = otp
+        self.state = None
+        self.version = None
+        self.changed = threading.Condition()
+        self.received = []          # (수신 시각, version, payload bytes)
+        self.on_state = None        # callable(client, now) — 상태가 바뀔 때마다
+        self.sio = socketio.Client(reconnection=False)
+        self.sio.on('auction_update', self._on_update)
+        self.sio.on('auction_delta', self._on_delta)
+        self.sio.on('bid_error', self._on_bid_error)
+        self.last_error = None
+
+    def connect(self):
+        self.sio.connect(f"{self.url}?room={self.room}", transports=['websocket'])
+        self.sio.emit('authenticate', {'otp': self.otp})
+
+    def _record(self, data, version):
+        now = time.perf_counter()
+        self.received.append((now, version, len(json.dumps(data, ensure_ascii=False).encode('utf-8'))))
+        if self.on_state:
+            self.on_state(self, now)
+        with self.changed:
+            self.changed.notify_all()
+
+    def _on_update(self, data):
+        self.state = data
+        self.version = data['version']
+        self._record(data, self.version)
+
+    def _on_delta(self, data):
+        if self.version is None or data['version'] != self.version + 1:
+            if self.sio.connected:
+                self.sio.emit('request_snapshot')
+            return
+        self.state = apply_json_patch(self.state, data['ops'])
+        self.version = data['version']
+        self._record(data, self.version)
+
+    def _on_bid_error(self, data):
+        self.last_error = data.get('message')
+        with self.changed:
+            self.changed.notify_all()
+
+    def wait_for(self, predicate, timeout: float) -> bool:
+        deadline = time.perf_counter() + timeout
+        with self.changed:
+            while not (self.state is not None and predicate(self.state)):
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return False
+                self.changed.wait(remaining)
+        return True
+
+
+def run_room(urls, room, viewers, duration, bid_interval, results, lock):
+    # 워커가 여러 개면 클라이언트를 돌아가며 다른 워커에 붙인다 (소유 워커가 아닌 쪽은 버스로 전달)
+    next_url = itertools.cycle(urls).__next__
+    admin = StateClient(next_url(), room, ADMIN_OTP)
+    admin.connect()
+    # 허용 목록에 없는 경매방은 관리자가 먼저 열어야 팀장 / 참관인이 들어갈 수 있다
+    if not admin.wait_for(lambda s: True, 5):
+        raise RuntimeError(f"경매방 {room} 을 열지 못했습니다")
+    managers = [StateClient(next_url(), room, otp) for otp in MANAGERS]
+    for m in managers:
+        m.connect()
+    watchers = [StateClient(next_url(), room) for _ in range(viewers)]
+    for w in watchers:
+        w.connect()
+
+    # 첫 선수 경매를 바로 시작 (READY → PAUSED → BIDDING)
+    admin.sio.emit('admin_start_auction')
+    admin.wait_for(lambda s: s['state'] == 'PAUSED', 5)
+    admin.sio.emit('admin_start_auction')
+    if not admin.wait_for(lambda s: s['state'] == 'BIDDING', 5):
+        raise RuntimeError(f"경매방 {room} 이 BIDDING 상태가 되지 않았습니다")
+    player_index = admin.state['player_index']
+
+    # 코인 제한에 걸리지 않도록 넉넉히 (시작 시 초기화되므로 시작 후에)
+    for otp in MANAGERS:
+        admin.sio.emit('admin_update_manager', {'otp': otp, 'coin': 10 ** 9})
+    admin.wait_for(lambda s: all(m['coin'] == 10 ** 9 for m in s['managers'].values()), 5)
+
+    latencies = []
+
+    def bidder(client):
+        me = client.state['managers'][client.otp]['id']
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            expected = client.state['current_price'] + 5
+            client.last_error = None
+            sent = time.perf_counter()
+            client.sio.emit('place_bid', {'otp': client.otp, 'amount': 5})
+
+            # 내 입찰이 선두로 보이거나 bid_error 가 올 때까지. 다른 팀장 입찰이 먼저 처리되면 가격이 더 높을 수 있고,
+            # 내 입찰 뒤에 다른 입찰이 같은 브로드캐스트로 묶여 넘어가면 확인할 수 없으니 지연에서 뺀다
+            def settled(s):
+                if client.last_error is not None:
+                    return True
+                if s['leading_manager_id'] == me:
+                    return s['current_price'] >= expected
+                return s['current_price'] >= expected + 5
+
+            ok = client.wait_for(settled, 5)
+            if ok and client.last_error is None and client.state['leading_manager_id'] == me:
+                latencies.append(time.perf_counter() - sent)
+            time.sleep(bid_interval)
+
+    threads = [threading.Thread(target=bidder, args=(m,)) for m in managers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # 입찰을 멈추고 타이머 만료로 낙찰되기까지 기다림 (마지막으로 받은 마감 시각과 비교)
+    closed_at = [None]
+    deadline = [None]
+
+    def on_state(client, now):
+        if client.state['player_index'] == player_index:
+            deadline[0] = client.state['timer_end']
+        elif closed_at[0] is None:
+            closed_at[0] = time.time()
+
+    on_state(admin, None)
+    admin.on_state = on_state
+    admin.wait_for(lambda s: s['player_index'] != player_index, BID_EXTEND_SEC + 5)
+    drift = closed_at[0] - deadline[0] / 1000 if closed_at[0] and deadline[0] else None
+
+    # 참관인별 같은 버전 수신 시각 → fan-out 시간
+    by_version = {}
+    for w in watchers:
+        for received_at, version, _ in w.received:
+            by_version.setdefault(version, []).append(received_at)
+    fanout = [max(ts) - min(ts) for ts in by_version.values() if len(ts) == len(watchers) and len(ts) > 1]
+
+    sizes = [size for _, _, size in watchers[0].received] if watchers else []
+
+    with lock:
+        results['bid_latency'].extend(latencies)
+        results['fanout'].extend(fanout)
+        results['payload_sizes'].extend(sizes)
+        if drift is not None:
+            results['drift'].append(drift)
+
+    # 연결 종료는 클라이언트마다 서버 응답을 기다리므로 한꺼번에
+    closers = [threading.Thread(target=c.sio.disconnect) for c in [admin, *managers, *watchers]]
+    for t in closers:
+        t.start()
+    for t in closers:
+        t.join()
+
+
+class IdleViewers:
+    """
+    아무것도 하지 않는 참관인 N 명. socketio.Client 는 연결마다 스레드를 여러 개 띄우므로
+    Engine.IO 웹소켓을 직접 열고, 인증까지만 하고 나면 스레드 하나가 selector 로 모든 연결의 ping 에만 답한다.
+    """
+
+    def __init__(self, url: str, room: str):
+        self.ws_url = url.replace('http', 'ws', 1) + f'/socket.io/?EIO=4&transport=websocket&room={room}'
+        self.selector = selectors.DefaultSelector()
+        self.pending = queue.Queue()    # 인증을 보낸 연결 → pump 스레드가 selector 에 등록
+        self.connections = []
+        self.failed = 0
+        self.lock = threading.Lock()
+        self.running = True
+        self.pump = threading.Thread(target=self._pump, daemon=True)
+        self.pump.start()
+
+    def _open(self):
+        ws = websocket.create_connection(self.ws_url, timeout=10)
+        if not ws.recv().startswith('0'):           # Engine.IO open
+            raise RuntimeError('engine.io handshake')
+        ws.send('40')                               # Socket.IO 기본 namespace 접속
+        while not (packet := ws.recv()).startswith('40'):
+            if packet == '2':
+                ws.send('3')
+        ws.send('42' + json.dumps(['authenticate', {'otp': None}]))
+        ws.settimeout(None)
+        return ws
+
+    def connect(self, count: int):
+        for _ in range(count):
+            try:
+                ws = self._open()
+            except (OSError, websocket.WebSocketException, RuntimeError):
+                with self.lock:
+                    self.failed += 1
+                continue
+            with self.lock:
+                self.connections.append(ws)
+            self.pending.put(ws)
+
+    def _pump(self):
+        while self.running:
+            while not self.pending.empty():
+                ws = self.pending.get()
+                self.selector.register(ws.sock, selectors.EVENT_READ, ws)
+            for key, _ in self.selector.select(timeout=0.2):
+                ws = key.data
+                try:
+                    packet = ws.recv()
+                except (OSError, websocket.WebSocketException):
+                    self.selector.unregister(key.fileobj)
+                    continue
+                if packet == '2':                   # Engine.IO ping → pong
+                    ws.send('3')
+
+    def close(self):
+        self.running = False
+        self.pump.join()
+        for ws in self.connections:
+            try:
+                ws.close(timeout=0)
+            except (OSError, websocket.WebSocketException):
+                pass
+
+
+def run_idle(url, server, count, hold, connectors):
+    """참관인 count 명을 붙여 hold 초 유지한 뒤 서버 RSS 증가량을 연결 수로 나눈다"""
+    admin = StateClient(url, 'idle', ADMIN_OTP)
+    admin.connect()
+    if not admin.wait_for(lambda s: True, 5):
+        raise RuntimeError("경매방 idle 을 열지 못했습니다")
+    time.sleep(1)
+    before = proc_usage(server.pid) if server else None
+    threads_before = proc_threads(server.pid) if server else None
+
+    viewers = IdleViewers(url, 'idle')
+    started = time.perf_counter()
+    per_thread = [count // connectors + (i < count % connectors) for i in range(connectors)]
+    workers = [threading.Thread(target=viewers.connect, args=(n,)) for n in per_thread if n]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    connect_sec = time.perf_counter() - started
+    time.sleep(hold)                                # 인증 응답 처리와 ping 주기가 지나 RSS 가 안정되도록
+
+    connected = len(viewers.connections)
+    report = {
+        'connections': count,
+        'connected': connected,
+        'failed': viewers.failed,
+        'connect_sec': round(connect_sec, 3),
+        'connects_per_sec': round(connected / connect_sec, 1) if connect_sec else None,
+        'hold_sec': hold,
+    }
+    if server:
+        after = proc_usage(server.pid)
+        threads_after = proc_threads(server.pid)
+        report['server'] = {
+            'rss_kb_before': before[1],
+            'rss_kb_after': after[1],
+            'rss_kb_per_connection': round((after[1] - before[1]) / connected, 2) if connected else None,
+            'threads_before': threads_before,
+            'threads_after': threads_after,
+            'cpu_sec_while_idle': round(after[0] - before[0], 3),
+        }
+    viewers.close()
+    admin.sio.disconnect()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='이미 실행 중인 서버 주소, 워커별로 여러 개면 쉼표로 (없으면 임시 서버를 띄움)')
+    parser.add_argument('--workers', type=int, default=1, help='임시 서버의 AUCTION_WORKERS')
+    parser.add_argument('--rooms', type=int, default=1, help='동시에 진행할 경매방 수 (방마다 팀장 3명)')
+    parser.add_argument('--viewers', type=int, default=20, help='경매방당 참관인 수')
+    parser.add_argument('--duration', type=float, default=10.0, help='입찰을 계속하는 시간(초)')
+    parser.add_argument('--bid-interval', type=float, default=0.05, help='팀장별 입찰 간격(초)')
+    parser.add_argument('--async-mode', default='threading', help='임시 서버의 AUCTION_ASYNC_MODE')
+    parser.add_argument('--idle', type=int, default=0, help='입찰 대신 연결만 유지할 참관인 수 (연결당 메모리 측정)')
+    parser.add_argument('--hold', type=float, default=10.0, help='--idle 연결을 유지한 뒤 RSS 를 재기까지의 시간(초)')
+    parser.add_argument('--connectors', type=int, default=8, help='--idle 연결을 여는 스레드 수')
+    parser.add_argument('--output', help='결과 JSON 파일 (없으면 stdout)')
+    args = parser.parse_args()
+
+    server = None
+    data_dir = None
+    urls = args.url.split(',') if args.url else None
+    try:
+        if urls is None:
+            # 임시 서버의 경매 기록과 메시지 버스 소켓은 임시 디렉터리에 두고 끝나면 지운다
+            port = free_port() if args.workers <= 1 else free_port_range(args.workers)
+            data_dir = tempfile.mkdtemp(prefix='auction-load-')
+            env = dict(os.environ, PORT=str(port), AUCTION_ASYNC_MODE=args.async_mode, AUCTION_DATA_DIR=data_dir,
+                       AUCTION_WORKERS=str(args.workers),
+                       AUCTION_MESSAGE_QUEUE=f"unix://{os.path.join(data_dir, 'bus.sock')}" if args.workers > 1 else '')
+            # 런처와 워커를 한 프로세스 그룹으로 띄워 끝날 때 함께 종료
+            server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'app.py')], env=env, start_new_session=True,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            urls = [f'http://127.0.0.1:{port + i}' for i in range(args.workers)]
+            for i in range(args.workers):
+                for _ in range(100):
+                    try:
+                        socket.create_connection(('127.0.0.1', port + i), timeout=0.1).close()
+                        break
+                    except OSError:
+                        time.sleep(0.1)
+
+        if args.idle:
+            idle = run_idle(urls[0], server, args.idle, args.hold, args.connectors)
+        else:
+            usage_start = proc_usage(server.pid) if server else None
+            started = time.perf_counter()
+
+            results = {'bid_latency': [], 'fanout': [], 'payload_sizes': [], 'drift': []}
+            lock = threading.Lock()
+            # 경매방마다 첫 클라이언트가 붙는 워커를 바꾼다
+            rooms = [threading.Thread(target=run_room,
+                                      args=(urls[i % len(urls):] + urls[:i % len(urls)], f'load{i}', args.viewers,
+                                            args.duration, args.bid_interval, results, lock))
+                     for i in range(args.rooms)]
+            for t in rooms:
+                t.start()
+            for t in rooms:
+                t.join()
+
+            elapsed = time.perf_counter() - started
+            usage_end = proc_usage(server.pid) if server else None
+    finally:
+        if server:
+            os.killpg(server.pid, signal.SIGTERM)
+            server.wait()
+        if data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    if args.idle:
+        write_report({'config': {'idle_viewers': args.idle, 'workers': len(urls), 'async_mode': args.async_mode},
+                      'idle': idle}, args.output)
+        return
+
+    sizes = results['payload_sizes']
+    report = {
+        'config': {
+            'rooms': args.rooms, 'viewers_per_room': args.viewers, 'managers_per_room': len(MANAGERS),
+            'duration_sec': args.duration, 'bid_interval_sec': args.bid_interval, 'async_mode': args.async_mode,
+            'workers': len(urls),
+        },
+        'elapsed_sec': round(elapsed, 3),
+        'bids_applied': len(results['bid_latency']),
+        'bids_per_sec': round(len(results['bid_latency']) / args.duration, 1),
+        'bid_latency_ms': summarize_ms(results['bid_latency']),
+        'fanout_ms': summarize_ms(results['fanout']),
+        'payload_bytes': {
+            'messages': len(sizes),
+            'mean': round(sum(sizes) / len(sizes), 1) if sizes else None,
+            'max': max(sizes) if sizes else None,
+            'per_sec': round(sum(sizes) / elapsed, 1) if sizes else None,
+        },
+        'timer_close_drift_ms': summarize_ms(results['drift']),
+    }
+    if usage_start and usage_end:
+        cpu = usage_end[0] - usage_start[0]
+        report['server'] = {
+            'cpu_sec': round(cpu, 3),
+            'cpu_percent': round(100 * cpu / elapsed, 1),
+            'rss_kb_start': usage_start[1],
+            'rss_kb_end': usage_end[1],
+        }
+    write_report(report, args.output)
+
+
+def write_report(report, output):
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
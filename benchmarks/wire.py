@@ -0,0 +1,97 @@
+# benchmarks/wire.py
+"""
+상태 메시지 전송 형식(wire.py) 벤치마크.
+
+선수 N 명 명단으로 경매방 상태를 만든 뒤 전체 스냅샷(auction_update)과 입찰 delta(auction_delta)를
+  - json          : 지금 JSON 경로 (EncodedPayload 와 같은 json.dumps)
+  - msgpack
+  - msgpack+zlib  : 크기와 상관없이 압축 (서버에서는 app.py 의 WIRE_COMPRESS_MIN 이상만 압축)
+로 인코딩해서 메시지 크기와 인코딩/디코딩 CPU 시간(회당 평균)을 JSON 한 줄씩 출력한다.
+
+    pip install msgpack
+    python benchmarks/wire.py --players 2000 --repeat 200
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['AUCTION_DATA_DIR'] = ''     # 기록하지 않음
+
+with contextlib.redirect_stdout(sys.stderr):   # 결과 JSON 만 stdout 에 남도록
+    import app  # noqa: E402
+import wire  # noqa: E402
+from roster import Roster  # noqa: E402
+
+
+def make_payloads(players: int, seed: int):
+    rng = random.Random(seed)
+    room = app.get_room('wirebench', create=True)
+    tiers = ['A', 'B', 'C', 'D', 'E']
+    manager_ids = [m['id'] for m in room.managers.values()]
+    room.roster = Roster(manager_ids)
+    room.roster.add_round([(rng.choice(tiers), f"선수{i:05d}") for i in range(players)])
+    for player in range(players // 2):
+        room.roster.assign(player, rng.choice(manager_ids), rng.randint(0, 300), 1)
+    room.state['player_index'] = players // 2
+    snapshot = dict(room.get_auction_data(), version=1, epoch='bench')
+    delta = {'version': 2, 'ops': [
+        {'op': 'replace', 'path': '/current_price', 'value': 155},
+        {'op': 'replace', 'path': '/leading_manager_id', 'value': 'T02'},
+        {'op': 'replace', 'path': '/timer_end', 'value': int(time.time() * 1000) + 15000},
+    ]}
+    return {'auction_update': snapshot, 'auction_delta': delta}
+
+
+def measure(encode, decode, data, repeat: int):
+    started = time.process_time()
+    for _ in range(repeat):
+        encoded = encode(data)
+    encode_sec = (time.process_time() - started) / repeat
+    started = time.process_time()
+    for _ in range(repeat):
+        decode(encoded)
+    decode_sec = (time.process_time() - started) / repeat
+    return len(encoded), encode_sec, decode_sec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    formats = {
+        wire.JSON: (lambda d: json.dumps(d, separators=(',', ':')), json.loads),
+    }
+    if wire.msgpack is not None:
+        formats[wire.MSGPACK] = (wire.encode, wire.decode)
+        formats[wire.MSGPACK_ZLIB] = (lambda d: wire.encode(d, 0), wire.decode)
+    else:
+        print("msgpack 패키지가 없어 json 만 측정합니다 (pip install msgpack)", file=sys.stderr)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        payloads = make_payloads(args.players, args.seed)
+    for event, data in payloads.items():
+        baseline = None
+        for fmt, (encode, decode) in formats.items():
+            size, encode_sec, decode_sec = measure(encode, decode, data, args.repeat)
+            baseline = baseline or size
+            print(json.dumps({
+                'event': event,
+                'format': fmt,
+                'players': args.players,
+                'bytes': size,
+                'bytes_vs_json': round(size / baseline, 3),
+                'encode_us': round(encode_sec * 1e6, 1),
+                'decode_us': round(decode_sec * 1e6, 1),
+            }))
+
+
+if __name__ == '__main__':
+    main()
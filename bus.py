@@ -0,0 +1,285 @@
+# bus.py
+"""
+여러 워커 프로세스가 하나의 경매 서비스처럼 동작하도록 잇는 메시지 버스.
+
+  - Socket.IO emit 은 python-socketio 의 pub/sub client manager 를 통해 모든 워커로 퍼지므로
+    어느 워커에 붙은 참관인이든 모든 경매방의 브로드캐스트를 받는다.
+  - 경매방은 room id 로 샤딩되어 한 워커만 상태를 소유한다(owner_of).
+    다른 워커가 받은 이벤트는 같은 버스에 room_command 메시지로 실어 소유 워커에게 넘긴다.
+
+버스 구현은 URL scheme 으로 고른다 (BUS_BACKENDS).
+  unix:///tmp/auction-bus.sock  : 외부 서비스 없이 BusHub 프로세스/스레드가 중계
+  redis://host:6379/0           : Redis pub/sub (redis 패키지 필요)
+
+unix 버스에서 워커 → 허브 프레임은 본문 앞에 받는 워커 번호(ROUTE_HEADER, 전체면 BROADCAST)를 붙이고,
+접속 직후 첫 프레임으로 자기 워커 번호를 알린다. 허브는 아직 접속하지 않은 워커에게 가는 경매방 명령을 모아 두었다가
+그 워커가 접속하면 순서대로 넘긴다.
+"""
+import collections
+import json
+import os
+import socket
+import struct
+import threading
+import time
+import zlib
+
+import socketio
+
+FRAME_HEADER = struct.Struct('!I')     # 프레임 = 4바이트 길이 + JSON 본문
+ROUTE_HEADER = struct.Struct('!i')     # 워커 → 허브 프레임 본문 앞의 받는 워커 번호
+BROADCAST = -1
+RECONNECT_DELAY = 0.5
+BACKLOG_MAX = 10000                    # 접속하지 않은 워커 하나에 모아 둘 최대 명령 수 (넘치면 버림)
+
+
+def owner_of(room_id: str, workers: int) -> int:
+    """room id 를 소유 워커 번호로 (모든 프로세스에서 같은 값이 나오도록 crc32 사용)"""
+    return zlib.crc32(room_id.encode('utf-8')) % max(1, workers)
+
+
+def send_frame(sock, payload: bytes):
+    sock.sendall(FRAME_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock, size: int):
+    buf = b''
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            return None
+        buf += chunk
+    return buf
+
+
+def recv_frame(sock):
+    """프레임 하나를 읽어 본문을 돌려준다. 연결이 끊겼으면 None"""
+    header = _recv_exact(sock, FRAME_HEADER.size)
+    if header is None:
+        return None
+    return _recv_exact(sock, FRAME_HEADER.unpack(header)[0])
+
+
+class BusHub:
+    """
+    unix 소켓으로 접속한 워커들 사이의 중계. 전체 프레임은 보낸 워커를 제외한 모두에게,
+    워커 번호가 붙은 프레임은 그 워커에게만 (접속 전이면 BACKLOG_MAX 개까지 모아 두었다가) 넘긴다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.clients = {}           # 연결 -> 쓰기 lock (여러 중계 스레드가 프레임을 섞어 쓰지 않도록)
+        self.workers = {}           # 워커 번호 -> 연결
+        self.backlog = collections.defaultdict(collections.deque)   # 워커 번호 -> 접속 전에 온 프레임
+        self.dropped = collections.Counter()                        # 워커 번호 -> 가득 차서 버린 프레임 수
+        self.lock = threading.Lock()
+
+    def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.path)
+        server.listen()
+        threading.Thread(target=self._accept_loop, args=(server,), daemon=True).start()
+        print(f"메시지 버스 시작: {self.path}")
+
+    def _accept_loop(self, server):
+        while True:
+            conn, _ = server.accept()
+            with self.lock:
+                self.clients[conn] = threading.Lock()
+            threading.Thread(target=self._serve_client, args=(conn,), daemon=True).start()
+
+    def _register(self, conn, worker):
+        """워커 연결을 등록하고 모아 둔 프레임을 먼저 보낸다 (그동안 같은 워커로 가는 새 프레임은 쓰기 lock 에서 대기)"""
+        with self.clients[conn]:
+            with self.lock:
+                self.workers[worker] = conn
+                backlog = self.backlog.pop(worker, ())
+            for payload in backlog:
+                send_frame(conn, payload)
+
+    def _route(self, worker, payload):
+        with self.lock:
+            target = self.workers.get(worker)
+            if target is None:
+                backlog = self.backlog[worker]
+                if len(backlog) < BACKLOG_MAX:
+                    backlog.append(payload)
+                    return
+                self.dropped[worker] += 1
+                dropped = self.dropped[worker]
+            else:
+                target_lock = self.clients[target]
+        if target is None:
+            if dropped == 1 or dropped % 1000 == 0:
+                print(f"메시지 버스: 워커 {worker} 가 접속하지 않아 명령을 버렸습니다 (누적 {dropped})")
+            return
+        try:
+            with target_lock:
+                send_frame(target, payload)
+        except OSError:
+            pass
+
+    def _broadcast(self, conn, payload):
+        with self.lock:
+            targets = [(c, lock) for c, lock in self.clients.items() if c is not conn]
+        for target, target_lock in targets:
+            try:
+                with target_lock:
+                    send_frame(target, payload)
+            except OSError:
+                pass
+
+    def _serve_client(self, conn):
+        worker = None
+        try:
+            hello = recv_frame(conn)
+            if hello is None:
+                return
+            worker = json.loads(hello).get('worker')
+            if worker is not None:
+                self._register(conn, worker)
+            while True:
+                payload = recv_frame(conn)
+                if payload is None:
+                    break
+                route = ROUTE_HEADER.unpack_from(payload)[0]
+                body = payload[ROUTE_HEADER.size:]
+                if route == BROADCAST:
+                    self._broadcast(conn, body)
+                else:
+                    self._route(route, body)
+        except (OSError, ValueError, struct.error):
+            pass
+        finally:
+            with self.lock:
+                self.clients.pop(conn, None)
+                if worker is not None and self.workers.get(worker) is conn:
+                    del self.workers[worker]
+            conn.close()
+
+
+class UnixSocketPubSub(socketio.PubSubManager):
+    """BusHub 에 접속하는 Socket.IO pub/sub client manager"""
+    name = 'unixbus'
+    worker_index = None         # 허브에 알리는 워커 번호 (None 이면 전체 프레임만 받음)
+
+    def __init__(self, url='unix:///tmp/auction-bus.sock', channel='socketio',
+                 write_only=False, logger=None, json=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger, json=json)
+        self.path = url[len('unix://'):]
+        self.sock = None
+        self.send_lock = threading.Lock()
+
+    def _connect(self):
+        while True:
+            try:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.connect(self.path)
+                send_frame(sock, json.dumps({'worker': self.worker_index}).encode('utf-8'))
+                return sock
+            except OSError:
+                self._get_logger().error('Cannot connect to message bus %s... retrying', self.path)
+                time.sleep(RECONNECT_DELAY)
+
+    def _ensure_connected(self):
+        with self.send_lock:
+            if self.sock is None:
+                self.sock = self._connect()
+            return self.sock
+
+    def _drop(self, sock):
+        with self.send_lock:
+            if self.sock is sock:
+                self.sock = None
+        sock.close()
+
+    def _publish(self, data):
+        self._publish_to(BROADCAST, data)
+
+    def _publish_to(self, worker: int, data):
+        payload = ROUTE_HEADER.pack(worker) + json.dumps(data, separators=(',', ':')).encode('utf-8')
+        for retries_left in (1, 0):
+            sock = self._ensure_connected()
+            try:
+                with self.send_lock:
+                    send_frame(sock, payload)
+                return
+            except OSError:
+                self._drop(sock)
+                if not retries_left:
+                    self._get_logger().error('Cannot publish to message bus... giving up')
+
+    def _listen(self):
+        # 발신과 같은 연결로 수신한다 (허브는 보낸 연결에는 되돌려 보내지 않음)
+        while True:
+            sock = self._ensure_connected()
+            try:
+                while True:
+                    payload = recv_frame(sock)
+                    if payload is None:
+                        break
+                    yield json.loads(payload)
+            except OSError:
+                pass
+            self._drop(sock)
+            time.sleep(RECONNECT_DELAY)
+
+
+class RoomCommandMixin:
+    """
+    pub/sub 버스에 경매방 명령(room_command)을 함께 실어 보내는 기능.
+    소유 워커가 아니면 받은 명령을 무시하고, Socket.IO 메시지는 그대로 상위 처리로 넘긴다.
+    """
+    worker_index = 0
+    command_handler = None     # callable(room_id, command, args)
+
+    def publish_command(self, worker: int, room_id: str, command: str, args):
+        self._publish_to(worker, {'method': 'room_command', 'worker': worker, 'room': room_id,
+                       'command': command, 'args': list(args), 'host_id': self.host_id})
+
+    def _listen(self):
+        for message in super()._listen():
+            data = message
+            if not isinstance(data, dict):
+                try:
+                    data = self.json.loads(message)
+                except ValueError:
+                    yield message
+                    continue
+
+            if isinstance(data, dict) and data.get('method') == 'room_command':
+                if data.get('worker') == self.worker_index and self.command_handler is not None:
+                    try:
+                        self.command_handler(data['room'], data['command'], data['args'])
+                    except Exception:
+                        self._get_logger().exception('room_command handler error')
+                continue
+            yield data
+
+
+class UnixBusManager(RoomCommandMixin, UnixSocketPubSub):
+    pass
+
+
+class RedisBusManager(RoomCommandMixin, socketio.RedisManager):
+    def _publish_to(self, worker: int, data):
+        # Redis 채널은 모든 워커가 받으므로 소유 워커가 아닌 쪽은 RoomCommandMixin._listen 에서 거른다
+        self._publish(data)
+
+
+BUS_BACKENDS = {
+    'unix': UnixBusManager,
+    'redis': RedisBusManager,
+    'rediss': RedisBusManager,
+}
+
+
+def make_client_manager(url: str, worker_index: int, channel: str = 'auction'):
+    scheme = url.split('://', 1)[0]
+    if scheme not in BUS_BACKENDS:
+        raise ValueError(f"지원하지 않는 메시지 버스입니다: {url} (가능: {', '.join(BUS_BACKENDS)})")
+    manager = BUS_BACKENDS[scheme](url, channel=channel)
+    manager.worker_index = worker_index
+    return manager
@@ -0,0 +1,22 @@
+# config.py
+"""
+경매 기본 데이터: 팀장 / 관리자 OTP, 선수 명단.
+서버(app.py)는 경매방마다 이 데이터를 복사해서 쓴다. 벤치마크처럼 서버 밖에서 OTP 만 필요한 도구는
+app 을 import 하지 않고(경매방 / 타이머 / 기록이 시작되므로) 여기서 읽는다.
+"""
+
+# 초기 팀장 데이터 (경매방마다 이 데이터를 복사해서 사용, 팀 구성은 경매방의 Roster 에 있다)
+MANAGERS = {
+    'Me2MgO2MgOyepQ==': {'id': 'T01', 'name': '건우', 'coin': 1000},
+    'Mu2MgO2MgOyepQ==': {'id': 'T02', 'name': '성무', 'coin': 1000},
+    'M+2MgO2MgOyepQ==': {'id': 'T03', 'name': '원교', 'coin': 1000},
+}
+ADMIN_OTP = 'YWRtaW4='
+
+# 경매 대상 선수 데이터
+PLAYERS_DATA = {
+    'A': ['경민', '대균', '호준'],
+    'B': ['민재', '현준', '범수'],
+    'C': ['성민', '태연', '선우'],
+    'D': ['진호', '준석', '백건'],
+}
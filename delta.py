@@ -0,0 +1,72 @@
+# delta.py
+"""
+상태 delta 와 이벤트 로그가 쓰는 JSON Patch(RFC 6902).
+
+서버는 직전에 보낸 상태와 지금 상태를 make_json_patch 로 비교해 바뀐 부분만 auction_delta 로 보내고,
+클라이언트(벤치마크 포함)와 경매 기록 복구는 apply_json_patch 로 그 연산을 차례로 적용한다.
+"""
+
+
+def _escape_pointer(key) -> str:
+    """JSON Pointer(RFC 6901) 경로 조각 이스케이프"""
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def make_json_patch(old, new, path: str = '') -> list:
+    """
+    old → new 로 바꾸는 JSON Patch(RFC 6902) 연산 목록 생성.
+    dict 는 키 단위, 길이가 같은 list 는 인덱스 단위로 내려가며 비교하고
+    그 외에는 값이 다를 때 통째로 replace 한다.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in new.items():
+            child = f"{path}/{_escape_pointer(key)}"
+            if key in old:
+                ops.extend(make_json_patch(old[key], value, child))
+            else:
+                ops.append({'op': 'add', 'path': child, 'value': value})
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'remove', 'path': f"{path}/{_escape_pointer(key)}"})
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        if old == new:
+            return []
+        ops = []
+        for i, (a, b) in enumerate(zip(old, new)):
+            ops.extend(make_json_patch(a, b, f"{path}/{i}"))
+        return ops
+
+    if type(old) is type(new) and old == new:
+        return []
+    return [{'op': 'replace', 'path': path, 'value': new}]
+
+
+def apply_json_patch(doc, ops: list):
+    """make_json_patch 가 만든 연산 목록을 doc 에 적용하고 결과를 돌려준다."""
+    for op in ops:
+        if op['path'] == '':
+            doc = op['value']
+            continue
+
+        keys = [k.replace('~1', '/').replace('~0', '~') for k in op['path'].split('/')[1:]]
+        target = doc
+        for key in keys[:-1]:
+            target = target[int(key)] if isinstance(target, list) else target[key]
+
+        last = keys[-1]
+        if isinstance(target, list):
+            index = len(target) if last == '-' else int(last)
+            if op['op'] == 'remove':
+                del target[index]
+            elif op['op'] == 'add':
+                target.insert(index, op['value'])
+            else:
+                target[index] = op['value']
+        elif op['op'] == 'remove':
+            del target[last]
+        else:
+            target[last] = op['value']
+    return doc
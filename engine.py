@@ -0,0 +1,578 @@
+# engine.py
+"""
+경매 규칙 엔진 (Socket.IO / Flask / 실제 시계와 무관).
+
+선수 명단, 팀장, 경매 상태를 들고 입찰 · 낙찰 · 유찰 · 자동 귀속 · 2차 경매 · 최종 배정 · 자동 입찰 규칙을 적용한다.
+바깥과 닿는 부분은 생성자에서 받는다.
+
+  - clock : 현재 시각(초)을 돌려주는 함수. 마감 시각(timer_end)은 이 시계 기준
+  - rng   : 경매 순서를 섞을 random.Random (같은 seed 면 같은 경매)
+  - sink  : 엔진이 바깥에 알리는 일 (EventSink). 경매방(app.py 의 AuctionRoom)은 Socket.IO 전송 / 이벤트 로그 /
+            타이머 스케줄러로, 시뮬레이터(simulate.py)는 집계로 받는다
+
+엔진은 타이머를 직접 돌리지 않는다. sink.schedule(마감 시각)을 받은 쪽이 그 시각이 되면 timer_expired() 를 부른다.
+"""
+import copy
+import random
+import time
+
+from assignment import assign_leftovers
+from roster import Roster, SOLD, UNSOLD, FORCED, UNSOLD_FINAL
+
+# 경매 상태 초기값 (엔진마다 이 데이터를 복사해서 사용)
+AUCTION_STATE = {
+    'status': 'READY',      # READY, BIDDING, PAUSED, ENDED
+    'current_tier': '',
+    'player_index': 0,
+    'current_player': '',
+    'current_price': 0,
+    'leading_manager_id': None,
+    'timer_end': 0,
+    'is_started': False,
+    'round': 1,             # 1차 / 2차
+    # 자동 입찰: proxy_for([round, 선수 번호]) 선수에 대한 팀장 otp -> [최대 금액, 등록 순서]. 클라이언트에는 보내지 않는다
+    'proxy_for': None,
+    'proxy_bids': {},
+    'proxy_seq': 0,
+    # 관리자가 가져온 선수 명단 [[tier, name], ...] (None 이면 기본 명단). 다음 완전 새 시작부터 쓰인다
+    'player_pool': None,
+}
+
+BID_STEP = 5                    # 최소 입찰 단위 (자동 입찰이 한 번에 올리는 금액)
+PREPARE_SEC = 5                 # 다음 선수 경매 전 준비 시간
+BID_EXTEND_SEC = 15             # 경매 시작 / 입찰 때마다 마감을 이만큼 뒤로
+
+
+class EventSink:
+    """엔진이 바깥에 알리는 일. 기본 구현은 모두 무시한다 (필요한 것만 재정의)"""
+
+    def record(self, event: dict):
+        """경매 이벤트 {'type': 'sale' / 'unsold' / 'bid' / 'autoclaim' / ..., ...}"""
+
+    def announce(self, name: str, message: str, kind: str):
+        """채팅으로 나갈 안내 (kind: 'system' 시스템 안내, 'bid' 입찰 알림)"""
+
+    def schedule(self, deadline):
+        """마감 시각 등록 / 교체 (None 이면 취소)"""
+
+    def reject(self, sid, reason: str, message: str):
+        """입찰 / 자동 입찰 요청 거절 (sid 는 요청한 쪽이 넘긴 값 그대로)"""
+
+    def notify(self, manager_otp, event: str, data: dict):
+        """팀장 한 명에게만 알릴 일 (자동 입찰 상태)"""
+
+    def log(self, message: str):
+        """운영 로그"""
+
+
+class AuctionEngine:
+    def __init__(self, managers: dict, players, sink: EventSink = None, clock=time.time, rng=random,
+                 finalize_policy: str = 'richest'):
+        """
+        managers : 팀장 otp -> {'id', 'name', 'coin'} (복사해서 사용)
+        players  : 가져온 명단(state['player_pool'])이 없을 때 쓰는 기본 명단 [(tier, name), ...]
+        """
+        self.managers = copy.deepcopy(managers)
+        self.state = copy.deepcopy(AUCTION_STATE)
+        self.default_players = [(tier, name) for tier, name in players]
+        self.sink = sink if sink is not None else EventSink()
+        self.clock = clock
+        self.rng = rng
+        self.finalize_policy = finalize_policy
+        # 선수 명단과 팀 구성 (열 단위 저장, 클라이언트에는 dict 형식으로 변환해서 보낸다)
+        self.roster = Roster(m['id'] for m in self.managers.values())
+        # 팀장 목록(코인, 팀)이 바뀌었는지. 경매방은 이걸 보고 manager_data_update 를 보낸다
+        self.managers_dirty = False
+
+        # 티어 보유 현황 인덱스: 입찰/자동귀속 검사 때마다 팀/명단을 훑지 않도록
+        # 낙찰·강제배정·유찰 시점에 갱신해 둔다.
+        self.tier_index = {
+            'remaining': {},   # tier -> player_index 부터 끝까지 남은 선수 수
+            'filled': {},      # otp -> 보유 티어 bitmask
+            'missing': {},     # tier -> 해당 티어 선수가 없는 팀장 otp 집합
+        }
+        # 티어 -> bit (filled bitmask 용). 엔진마다 따로 두므로 경매방/시뮬레이션끼리 공유하지 않는다
+        self.tier_bits = {}
+
+    # --- 바깥에 알리기 (sink) ---
+
+    def record_event(self, event_type: str, **data):
+        self.sink.record(dict(data, type=event_type))
+
+    def system_message(self, message: str):
+        self.sink.announce('시스템', message, 'system')
+
+    def queue_chat(self, name: str, message: str, kind: str):
+        self.sink.announce(name, message, kind)
+
+    def set_timer(self, seconds: float):
+        """timer_end 를 지금부터 seconds 뒤로 잡고 sink 에 마감 시각 등록 (기존 마감은 교체)"""
+        self.state['timer_end'] = self.clock() + seconds
+        self.sink.schedule(self.state['timer_end'])
+
+    def find_manager_otp(self, manager_id):
+        return next((otp for otp, m in self.managers.items() if m['id'] == manager_id), None)
+
+    # --- 1. 선수 명단 & 티어 인덱스 ---
+
+    def tier_bit(self, tier: str) -> int:
+        bit = self.tier_bits.get(tier)
+        if bit is None:
+            bit = self.tier_bits[tier] = 1 << len(self.tier_bits)
+        return bit
+
+    def rebuild_tier_index(self):
+        """현재 경매 순서 / player_index / 팀 구성을 기준으로 인덱스를 새로 만든다."""
+        roster = self.roster
+        tiers = {tier for tier, _ in self.default_players} | set(roster.tiers)
+
+        remaining = {tier: 0 for tier in tiers}
+        for p in roster.order[self.state['player_index']:]:
+            remaining[roster.tiers[p]] += 1
+
+        filled = {}
+        for otp, manager in self.managers.items():
+            mask = 0
+            for p in roster.teams.get(manager['id'], ()):
+                mask |= self.tier_bit(roster.tiers[p])
+            filled[otp] = mask
+
+        self.tier_index['remaining'] = remaining
+        self.tier_index['filled'] = filled
+        self.tier_index['missing'] = {
+            tier: {otp for otp, mask in filled.items() if not mask & self.tier_bit(tier)}
+            for tier in tiers
+        }
+
+    def index_assign_tier(self, otp: str, tier: str):
+        """팀장 otp 가 tier 선수를 얻었을 때 (낙찰/강제 배정)"""
+        self.tier_index['filled'][otp] = self.tier_index['filled'].get(otp, 0) | self.tier_bit(tier)
+        self.tier_index['missing'].setdefault(tier, set()).discard(otp)
+
+    def current_player_no(self) -> int:
+        """player_index 위치 선수의 명단 번호"""
+        return self.roster.order[self.state['player_index']]
+
+    def players_left(self) -> bool:
+        return self.state['player_index'] < len(self.roster.order)
+
+    def advance_player_index(self):
+        """현재 선수 처리(낙찰/유찰/자동귀속)가 끝나 다음 선수로 넘어갈 때"""
+        player = self.current_player_no()
+        self.tier_index['remaining'][self.roster.tiers[player]] -= 1
+        self.state['player_index'] += 1
+
+    def team_has_tier(self, otp: str, tier: str) -> bool:
+        return bool(self.tier_index['filled'].get(otp, 0) & self.tier_bit(tier))
+
+    def initialize_players(self):
+        """
+        티어 구분 없이 모든 선수를 가져와 완전히 무작위로 섞어 경매 순서를 설정.
+        각 선수는 상태/status 를 포함한다.
+        status: pending / sold / unsold / forced / unsold_final
+        """
+        pool = self.state.get('player_pool')
+        if pool:
+            all_players = [(tier, name) for tier, name in pool]
+        else:
+            all_players = list(self.default_players)
+
+        self.rng.shuffle(all_players)
+
+        # 이전 경매의 선수 / 팀은 버리고 새 명단으로 (revision 은 이어서 올려 ETag 가 이전 명단과 겹치지 않게)
+        revision = self.roster.revision
+        self.roster = Roster(m['id'] for m in self.managers.values())
+        self.roster.revision = revision + 1
+        self.roster.add_round(all_players)
+        self.state['round'] = 1
+        self.state['player_index'] = 0
+
+        if all_players:
+            self.state['current_tier'], self.state['current_player'] = all_players[0]
+
+        self.rebuild_tier_index()
+
+    # --- 2. 자동 귀속 (티어 1명 vs 팀장 1명) ---
+
+    def check_and_apply_autoclaim(self, tier: str) -> bool:
+        """
+        [자동 귀속 규칙]
+        - 해당 티어의 선수가 '1명만' 남았고
+        - 아직 그 티어 선수를 가져가지 못한 팀장도 '1명만' 남았을 때
+          → 그 팀장에게 남은 1명을 자동 낙찰.
+        """
+        if not self.players_left():
+            return False
+
+        # 현재 인덱스부터 끝까지, 이 티어에 남은 선수 수
+        remaining_in_tier = self.tier_index['remaining'].get(tier, 0)
+
+        # 이 티어 선수를 아직 한 명도 못 가진 팀장 목록
+        free_managers_otp = self.tier_index['missing'].get(tier, ())
+
+        if remaining_in_tier == 1 and len(free_managers_otp) == 1:
+            manager_otp = next(iter(free_managers_otp))
+            manager = self.managers[manager_otp]
+
+            player = self.current_player_no()
+            name = self.roster.names[player]
+
+            # 팀에 선수 추가 (무료 강제 배정)
+            self.roster.assign(player, manager['id'], 0, self.state['round'], forced=True)
+            self.index_assign_tier(manager_otp, tier)
+            self.record_event('autoclaim', player=name, manager_id=manager['id'])
+
+            self.system_message(
+                f"[자동 귀속] [{manager['name']}] 팀에 {name} ({tier} 티어) 선수가 강제 낙찰되었습니다!"
+            )
+
+            # 다음 선수로 이동
+            self.advance_player_index()
+
+            self.sink.log(f"[자동 귀속] 티어 {tier}, 선수 {name} → 팀장 {manager['name']}")
+            return True
+
+        return False
+
+    # --- 3. 2차 경매 & 최종 자동 배정 로직 ---
+
+    def start_second_round(self):
+        """1차 경매가 끝났을 때, 유찰된 선수만 모아 2차 경매 시작."""
+        unsold = self.roster.with_status(UNSOLD)
+
+        if not unsold:
+            # 유찰 선수 없다면 바로 최종 처리
+            self.finalize_unsold_players()
+            return
+
+        self.state['round'] = 2
+        self.roster.begin_round(unsold)
+        self.record_event('second_round', players=[self.roster.names[p] for p in unsold])
+        self.state['player_index'] = 0
+
+        self.rebuild_tier_index()
+
+        first = unsold[0]
+        self.state['current_player'] = self.roster.names[first]
+        self.state['current_tier'] = self.roster.tiers[first]
+        self.state['current_price'] = 0
+        self.state['leading_manager_id'] = None
+        self.state['status'] = 'PAUSED'
+        self.set_timer(PREPARE_SEC)
+
+        self.system_message('[2차 경매] 1차에서 유찰된 선수들만 남은 코인으로 다시 경매합니다.')
+        self.managers_dirty = True
+
+    def finalize_unsold_players(self):
+        """
+        2차 경매 후에도 남은 선수들을
+          - 해당 티어가 없는 팀 중 finalize_policy 순서(기본: 코인이 가장 많이 남은 팀)로 자동 귀속
+          - 그래도 갈 곳 없으면 최종 유찰로 확정
+        """
+        roster = self.roster
+        remaining = [p for p in roster.order if roster.status[p] not in (SOLD, FORCED)]
+
+        # 남은 선수 전체를 한 번에 배정한 뒤 선수 순서대로 반영
+        assignments = assign_leftovers(
+            [(player, roster.tiers[player]) for player in remaining],
+            [(otp, m['coin'], len(roster.teams.get(m['id'], ()))) for otp, m in self.managers.items()],
+            self.tier_index['missing'],
+            self.finalize_policy,
+        )
+
+        for player, otp in assignments:
+            tier = roster.tiers[player]
+            name = roster.names[player]
+
+            if otp is not None:
+                manager = self.managers[otp]
+
+                roster.assign(player, manager['id'], 0, self.state['round'], forced=True)
+                self.index_assign_tier(otp, tier)
+                self.record_event('forced', player=name, manager_id=manager['id'])
+
+                self.system_message(f"[자동 귀속] {manager['name']} 팀이 {name} 선수({tier} 티어)를 배정받았습니다.")
+            else:
+                # 진짜 아무 팀도 받을 데 없으면 최종 유찰
+                roster.mark(player, UNSOLD_FINAL)
+                self.record_event('unsold_final', player=name)
+
+                self.system_message(f"유찰 : {name} 선수({tier} 티어)")
+
+        self.state['status'] = 'ENDED'
+        self.sink.schedule(None)
+        self.state['current_player'] = '경매 종료'
+        self.state['current_tier'] = ''
+        self.system_message('모든 1·2차 경매와 자동 귀속 처리가 종료되었습니다.')
+        self.managers_dirty = True
+
+    # --- 4. 경매 진행 ---
+
+    def reset_auction_for_next_player(self):
+        """
+        현재 경매 종료 후 다음 선수 경매 준비.
+        player_index 는 이미 end_bid / 자동귀속에서 증가된 상태라고 가정.
+        """
+        # 아직 남은 선수가 있다면, 자동귀속 먼저 체크
+        if self.players_left():
+            current_tier = self.roster.tiers[self.current_player_no()]
+            self.check_and_apply_autoclaim(current_tier)
+
+        # 자동귀속 후 더 이상 남은 선수가 없는 경우
+        if not self.players_left():
+            if self.state['round'] == 1:
+                # 1차 종료 → 2차 시작 (유찰 선수만)
+                self.start_second_round()
+            else:
+                # 2차까지 종료 → 최종 자동 배정
+                self.finalize_unsold_players()
+            return
+
+        # 다음 선수 경매 준비
+        next_player = self.roster.player_dict(self.current_player_no())
+        self.state['current_player'] = next_player['name']
+        self.state['current_tier'] = next_player['tier']
+        self.state['status'] = 'PAUSED'
+        self.state['current_price'] = 0
+        self.state['leading_manager_id'] = None
+        self.set_timer(PREPARE_SEC)
+
+        round_text = '1차' if self.state['round'] == 1 else '2차'
+        self.system_message(
+            f"[{round_text}] 잠시 후 다음 선수: {next_player['name']} ({next_player['tier']} 티어) 경매를 시작합니다."
+        )
+
+        self.managers_dirty = True
+
+    def start_auction(self) -> bool:
+        """
+        READY / ENDED 상태에서 전체 리셋,
+        또는 PAUSED 상태에서 강제 BIDDING 전환. 입찰 중이라 아무것도 하지 않았으면 False
+        """
+        if self.state['status'] in ('READY', 'PAUSED', 'ENDED'):
+
+            if not self.state['is_started'] or self.state['status'] == 'ENDED':
+                # 완전 새로 시작
+                self.initialize_players()
+                self.record_event('start')
+                self.state['is_started'] = True
+                self.state['status'] = 'PAUSED'
+                self.state['current_price'] = 0
+                self.state['leading_manager_id'] = None
+                self.set_timer(PREPARE_SEC)
+
+                first = self.roster.player_dict(self.roster.order[0])
+                self.system_message(
+                    f"[1차 경매] 잠시 후 첫 선수: {first['name']} ({first['tier']} 티어) 경매를 시작합니다."
+                )
+                return True
+
+            if self.state['status'] == 'PAUSED':
+                self.state['status'] = 'BIDDING'
+                self.set_timer(BID_EXTEND_SEC)
+                self.system_message(f"관리자가 [{self.state['current_player']}] 선수 경매를 강제 재개했습니다!")
+                self.resolve_proxies()
+                return True
+        return False
+
+    def end_bid(self) -> bool:
+        """관리자가 현재 입찰을 강제 종료하거나, 타이머가 0이 되었을 때 호출. 입찰 중이 아니었으면 False"""
+        if self.state['status'] != 'BIDDING':
+            return False
+
+        leading_id = self.state['leading_manager_id']
+        final_price = self.state['current_price']
+
+        if not self.players_left():
+            return False
+
+        player = self.current_player_no()
+        player_name = self.roster.names[player]
+
+        if leading_id:
+            # 낙찰 처리
+            winning_manager_otp = self.find_manager_otp(leading_id)
+            winning_manager = self.managers[winning_manager_otp]
+
+            winning_manager['coin'] -= final_price
+            self.roster.assign(player, winning_manager['id'], final_price, self.state['round'])
+            self.index_assign_tier(winning_manager_otp, self.roster.tiers[player])
+            self.record_event('sale', player=player_name, manager_id=winning_manager['id'], price=final_price)
+
+            self.system_message(
+                f"🎉 {winning_manager['name']} 팀이 {player_name} 선수를 {final_price} 코인에 낙찰했습니다!"
+            )
+
+        else:
+            # 유찰 처리
+            self.roster.mark(player, UNSOLD)
+            self.record_event('unsold', player=player_name)
+
+            self.system_message(f"❌ {player_name} 선수가 유찰되었습니다.")
+
+        # 다음 선수로 이동 후 준비
+        self.advance_player_index()
+        self.state['current_price'] = 0
+        self.state['leading_manager_id'] = None
+        self.state['status'] = 'PAUSED'
+        self.reset_auction_for_next_player()
+        return True
+
+    def timer_expired(self) -> bool:
+        """
+        마감 시각이 되었을 때: 입찰 마감 / 준비 시간 종료 처리.
+        그 사이 마감이 뒤로 밀려 아직 시간이 남았으면 새 마감으로 다시 등록하고 False.
+        """
+        if self.clock() < self.state['timer_end']:
+            self.sink.schedule(self.state['timer_end'])
+            return False
+
+        if self.state['status'] == 'BIDDING':
+            self.end_bid()
+
+        elif self.state['status'] == 'PAUSED':
+            self.state['status'] = 'BIDDING'
+            self.set_timer(BID_EXTEND_SEC)
+            self.system_message(f"[{self.state['current_player']}] 선수 경매가 시작되었습니다! 입찰해 주세요.")
+            self.resolve_proxies()
+        return True
+
+    # --- 5. 입찰 ---
+
+    def bid_rejection(self, manager_otp, price: int, statuses=('BIDDING',)):
+        """
+        price 로 입찰할 수 있는지 검사 (경매 상태, 팀장, 티어 보유, 보유 코인).
+        통과하면 None, 아니면 (거절 사유, 안내 메시지)
+        """
+        if self.state['status'] not in statuses or not self.players_left():
+            return 'not_bidding', '현재 입찰 시간이 아닙니다.'
+
+        manager = self.managers.get(manager_otp)
+        if manager is None:
+            return 'invalid_manager', '유효하지 않은 팀장입니다.'
+
+        current_tier = self.state.get('current_tier')
+        if current_tier and self.team_has_tier(manager_otp, current_tier):
+            return 'tier_owned', f'이미 {current_tier} 티어 선수를 보유하고 있어 입찰할 수 없습니다.'
+
+        if manager['coin'] < price:
+            return 'insufficient_coin', f'보유 코인({manager["coin"]})보다 큰 금액으로 입찰할 수 없습니다.'
+        return None
+
+    def apply_bid(self, manager_otp, bid_increment: int, sid=None):
+        """입찰을 반영하고 None, 거절했으면 거절 사유 (sink.reject 로도 알린다)"""
+        new_price = self.state['current_price'] + bid_increment
+        rejection = self.bid_rejection(manager_otp, new_price)
+        if rejection is not None:
+            self.sink.reject(sid, *rejection)
+            return rejection[0]
+
+        self.raise_bid(manager_otp, new_price)
+        # 다른 팀장의 자동 입찰이 있으면 같은 명령 안에서 바로 응찰
+        self.resolve_proxies()
+
+    def raise_bid(self, manager_otp, new_price: int, proxy: bool = False):
+        """최고 입찰 정보 갱신 (검사는 호출한 쪽에서)"""
+        manager = self.managers[manager_otp]
+        self.state['current_price'] = new_price
+        self.state['leading_manager_id'] = manager['id']
+        self.record_event('bid', manager_id=manager['id'], price=new_price, **({'proxy': True} if proxy else {}))
+
+        # 누가 입찰하면 항상 15초로 연장
+        self.set_timer(BID_EXTEND_SEC)
+
+        self.queue_chat(manager['name'], f"{new_price} 코인!{' (자동 입찰)' if proxy else ''}", 'bid')
+
+    # --- 6. 자동 입찰 (최대 금액 위임) ---
+
+    def proxy_bids(self) -> dict:
+        """현재 선수에 등록된 자동 입찰 {otp: [최대 금액, 등록 순서]} (선수가 바뀌었으면 비운다)"""
+        key = [self.state['round'], self.current_player_no()]
+        if self.state.get('proxy_for') != key:
+            self.state['proxy_for'] = key
+            self.state['proxy_bids'] = {}
+        return self.state['proxy_bids']
+
+    def set_proxy_bid(self, manager_otp, max_bid: int, sid=None) -> bool:
+        """
+        현재 선수에 대한 자동 입찰 등록 (준비 시간에도 가능). max_bid 가 0 이하이면 취소.
+        이후 다른 팀장이 입찰할 때마다 max_bid 안에서 대신 응찰한다 (resolve_proxies).
+        max_bid 가 보유 코인보다 커도 받아 두고, 응찰할 때 그때의 보유 코인으로 자른다.
+        거절했거나 취소할 자동 입찰이 없었으면 False
+        """
+        manager = self.managers.get(manager_otp)
+        limit = min(max_bid, manager['coin']) if manager is not None else max_bid
+        rejection = self.bid_rejection(manager_otp, limit, statuses=('PAUSED', 'BIDDING'))
+        if max_bid <= 0:
+            # 취소는 티어 보유와 상관없이
+            if rejection is None or rejection[0] == 'tier_owned':
+                cancelled = self.proxy_bids().pop(manager_otp, None) is not None
+                self.notify_proxy(manager_otp, None)
+                return cancelled
+            return False
+
+        if (rejection is None and self.state['status'] == 'BIDDING'
+                and limit < self.state['current_price'] + BID_STEP
+                and self.state['leading_manager_id'] != manager['id']):
+            if limit < max_bid:
+                rejection = 'insufficient_coin', f'보유 코인({manager["coin"]})으로는 현재 가격({self.state["current_price"]})보다 높게 입찰할 수 없습니다.'
+            else:
+                rejection = 'too_low', f'최대 금액은 현재 가격({self.state["current_price"]})보다 {BID_STEP} 이상 커야 합니다.'
+        if rejection is not None:
+            self.sink.reject(sid, *rejection)
+            return False
+
+        self.state['proxy_seq'] = self.state.get('proxy_seq', 0) + 1
+        self.proxy_bids()[manager_otp] = [max_bid, self.state['proxy_seq']]
+        self.notify_proxy(manager_otp, max_bid)
+        self.resolve_proxies()
+        return True
+
+    def notify_proxy(self, manager_otp, max_bid, outbid: bool = False):
+        self.sink.notify(manager_otp, 'proxy_status', {
+            'player': self.state['current_player'], 'max': max_bid, 'outbid': outbid,
+        })
+
+    def resolve_proxies(self):
+        """
+        자동 입찰끼리(+ 현재 선두) 한 번에 결판: 한도(최대 금액과 보유 코인 중 작은 값)가 가장 큰 팀장이
+        2등 한도 + BID_STEP 에 (자기 한도를 넘지 않게) 선두가 된다. 동률이면 현재 선두, 그다음 먼저 등록한 팀장.
+        중간 가격을 하나씩 거치지 않으므로 입찰 이벤트 / 채팅 / 상태 변경은 최종 결과 한 번뿐이다.
+        """
+        if self.state['status'] != 'BIDDING' or not self.players_left():
+            return
+        proxies = self.proxy_bids()
+        if not proxies:
+            return
+
+        price = self.state['current_price']
+        leader = self.find_manager_otp(self.state['leading_manager_id']) if self.state['leading_manager_id'] else None
+        tier = self.state.get('current_tier')
+
+        contenders = []     # (한도, 우선순위, otp)
+        for otp, (max_bid, seq) in list(proxies.items()):
+            limit = min(max_bid, self.managers[otp]['coin'])
+            if otp == leader:
+                contenders.append((max(limit, price), -1, otp))
+            elif limit >= price + BID_STEP and not (tier and self.team_has_tier(otp, tier)):
+                contenders.append((limit, seq, otp))
+            else:
+                del proxies[otp]
+                self.notify_proxy(otp, None, outbid=True)
+        if leader is not None and leader not in proxies:
+            contenders.append((price, -1, leader))     # 직접 입찰한 현재 선두
+        if not any(otp != leader for _, _, otp in contenders):
+            return
+
+        contenders.sort(key=lambda c: (-c[0], c[1]))
+        top, _, winner = contenders[0]
+        new_price = min(top, contenders[1][0] + BID_STEP) if len(contenders) > 1 else price + BID_STEP
+
+        if winner != leader or new_price > price:
+            self.raise_bid(winner, new_price, proxy=True)
+
+        # 새 가격을 넘을 수 없는 나머지 자동 입찰은 끝
+        for _, _, otp in contenders[1:]:
+            if otp in proxies and min(proxies[otp][0], self.managers[otp]['coin']) < new_price + BID_STEP:
+                del proxies[otp]
+                self.notify_proxy(otp, None, outbid=True)
@@ -0,0 +1,342 @@
+# roster.py
+"""
+경매 선수 명단 저장소.
+
+선수 한 명을 dict 하나로 들고 있으면 선수 수만큼 키 문자열/dict 오버헤드가 붙고
+팀장 team 에 같은 정보를 또 복사하게 된다. Roster 는 선수 정보를 열(column) 단위로 저장한다.
+
+  - names / tiers        : 선수 이름, 티어 (티어 문자열은 sys.intern 으로 한 객체를 공유)
+  - status               : array('b'), STATUSES 의 번호
+  - price / owner / won_round : array. owner 는 owner_ids 의 번호 (NO_OWNER = 없음)
+  - order                : 현재 라운드 경매 순서 (선수 번호)
+  - teams                : 팀장 id -> 획득한 순서대로의 선수 번호 (명단을 가리키는 view)
+  - revision             : 선수 추가 / 경매 순서 / 낙찰·유찰이 바뀔 때마다 1씩 증가 (REST ETag 용)
+  - journal              : None 이 아니면 바뀐 부분을 to_doc 형식 기준 JSON Patch 연산으로 쌓는다 (이벤트 로그 용).
+                           낙찰·유찰은 칸 단위, 새 라운드(경매 순서)는 열 전체 교체
+
+경매를 새로 시작할 때마다 빈 Roster 를 만들어 add_round 로 채운다 (이전 경매의 선수 / 팀은 이어받지 않음).
+
+선수는 한 번 추가되면 번호가 바뀌지 않는다. 클라이언트/로그에 보내는 dict 형식은
+player_dict / team_dict / to_doc 에서, REST API 형식은 player_record 에서 만든다.
+CSV / JSONL 명단 가져오기(parse_roster)와 내보내기(export_lines)는 한 줄씩 읽고 쓴다.
+"""
+import array
+import csv
+import io
+import json
+import re
+import sys
+
+STATUSES = ('pending', 'sold', 'unsold', 'forced', 'unsold_final')
+PENDING, SOLD, UNSOLD, FORCED, UNSOLD_FINAL = range(len(STATUSES))
+STATUS_CODES = {name: code for code, name in enumerate(STATUSES)}
+NO_OWNER = -1
+
+# 가져오기 / 내보내기
+ROSTER_FORMATS = ('csv', 'jsonl')
+EXPORT_FIELDS = ('no', 'tier', 'name', 'status', 'price', 'owner_id', 'round')
+EXPORT_CHUNK = 500              # 내보내기 때 한 번에 보내는 줄 수
+TIER_PATTERN = re.compile(r'^[A-Za-z0-9]{1,8}$')
+NAME_MAX_LENGTH = 40
+MAX_IMPORT_ERRORS = 20          # 이만큼 오류가 모이면 나머지는 읽지 않는다
+
+
+def _pointer(key) -> str:
+    """JSON Pointer(RFC 6901) 경로 조각 이스케이프"""
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+class Roster:
+    __slots__ = ('names', 'tiers', 'status', 'price', 'owner', 'won_round',
+                 'owner_ids', 'owner_codes', 'order', 'teams', 'revision', 'journal')
+
+    def __init__(self, owner_ids=()):
+        self.names = []
+        self.tiers = []
+        self.status = array.array('b')
+        self.price = array.array('q')
+        self.owner = array.array('i')
+        self.won_round = array.array('b')
+        self.owner_ids = []
+        self.owner_codes = {}
+        self.order = array.array('i')
+        self.teams = {}
+        self.revision = 0
+        self.journal = None
+        for owner_id in owner_ids:
+            self.owner_code(owner_id)
+
+    def _log(self, op: str, path: str, value):
+        if self.journal is not None:
+            self.journal.append({'op': op, 'path': path, 'value': value})
+
+    def take_journal(self) -> list:
+        """쌓인 연산을 돌려주고 비운다 (이후 변경부터 다시 쌓음)"""
+        ops, self.journal = self.journal or [], []
+        return ops
+
+    def owner_code(self, owner_id) -> int:
+        code = self.owner_codes.get(owner_id)
+        if code is None:
+            code = self.owner_codes[owner_id] = len(self.owner_ids)
+            self.owner_ids.append(owner_id)
+            self.teams[owner_id] = array.array('i')
+            self._log('add', '/owners/-', owner_id)
+            self._log('add', f'/teams/{_pointer(owner_id)}', [])
+        return code
+
+    def add_player(self, name: str, tier: str) -> int:
+        self.names.append(name)
+        self.tiers.append(sys.intern(tier))
+        self.status.append(PENDING)
+        self.price.append(0)
+        self.owner.append(NO_OWNER)
+        self.won_round.append(0)
+        self.revision += 1
+        return len(self.names) - 1
+
+    def begin_round(self, players):
+        """경매 순서를 players (선수 번호) 로 바꾼다"""
+        self.order = array.array('i', players)
+        self.revision += 1
+        self._log('replace', '/order', self.order.tolist())
+
+    def add_round(self, entries):
+        """빈 명단에 (tier, name) 목록을 선수로 추가하고 그 순서대로 경매 순서를 잡는다 (경매 새 시작)"""
+        if self.names:
+            raise ValueError('add_round 는 빈 명단에만 쓸 수 있습니다')
+        self.begin_round([self.add_player(name, tier) for tier, name in entries])
+        if self.journal is not None:
+            # 선수마다 연산을 남기지 않고 채운 열을 통째로
+            doc = self.to_doc()
+            for column in ('names', 'tiers', 'status', 'price', 'owner', 'round'):
+                self._log('replace', f'/{column}', doc[column])
+
+    def with_status(self, *statuses) -> list:
+        """현재 경매 순서 중 statuses 상태인 선수 번호"""
+        codes = set(statuses)
+        return [p for p in self.order if self.status[p] in codes]
+
+    # --- 낙찰 / 유찰 ---
+
+    def assign(self, player: int, owner_id, price: int, round_no: int, forced: bool = False):
+        self.status[player] = FORCED if forced else SOLD
+        self.price[player] = price
+        self.owner[player] = self.owner_code(owner_id)
+        self.won_round[player] = round_no
+        self.teams[owner_id].append(player)
+        self.revision += 1
+        if self.journal is not None:
+            self._log_player(player)
+            self._log('add', f'/teams/{_pointer(owner_id)}/-', player)
+
+    def mark(self, player: int, status: int):
+        """유찰 / 최종 유찰"""
+        self.status[player] = status
+        self.price[player] = 0
+        self.owner[player] = NO_OWNER
+        self.revision += 1
+        if self.journal is not None:
+            self._log_player(player)
+
+    def _log_player(self, player: int):
+        self._log('replace', f'/status/{player}', self.status[player])
+        self._log('replace', f'/price/{player}', self.price[player])
+        self._log('replace', f'/owner/{player}', self.owner[player])
+        self._log('replace', f'/round/{player}', self.won_round[player])
+
+    # --- dict 형식 (클라이언트 / 이전 형식 호환) ---
+
+    def player_dict(self, player: int) -> dict:
+        owner = self.owner[player]
+        return {
+            'tier': self.tiers[player],
+            'name': self.names[player],
+            'status': STATUSES[self.status[player]],
+            'price': self.price[player],
+            'owner_id': self.owner_ids[owner] if owner != NO_OWNER else None,
+        }
+
+    def queue_window(self, start: int, count: int) -> list:
+        """경매 순서 start 번째부터 count 명 (이름과 티어만)"""
+        return [{'tier': self.tiers[p], 'name': self.names[p]} for p in self.order[start:start + count]]
+
+    def team_dict(self, owner_id) -> dict:
+        team = {}
+        for p in self.teams.get(owner_id, ()):
+            entry = {
+                'tier': self.tiers[p],
+                'name': self.names[p],
+                'price': self.price[p],
+                'round': self.won_round[p],
+            }
+            if self.status[p] == FORCED:
+                entry['forced'] = True
+            team[self.names[p]] = entry
+        return team
+
+    # --- REST API (조회 / 내보내기) ---
+
+    def query(self, tiers=None, statuses=None, owner_ids=None) -> list:
+        """이번 경매 선수 중 조건에 맞는 선수 번호 (번호 순). 각 조건은 허용 값 집합이고 None 이면 거르지 않는다"""
+        status_codes = {STATUS_CODES[s] for s in statuses} if statuses is not None else None
+        owner_codes = ({self.owner_codes[o] for o in owner_ids if o in self.owner_codes}
+                       if owner_ids is not None else None)
+        return [
+            p for p in range(len(self.names))
+            if (tiers is None or self.tiers[p] in tiers)
+            and (status_codes is None or self.status[p] in status_codes)
+            and (owner_codes is None or self.owner[p] in owner_codes)
+        ]
+
+    def player_record(self, player: int) -> dict:
+        """player_dict + 명단 번호, 낙찰 라운드"""
+        record = self.player_dict(player)
+        record['no'] = player
+        record['round'] = self.won_round[player]
+        return record
+
+    def copy(self) -> 'Roster':
+        """
+        읽기 전용 사본 (열 / 팀은 복사, journal 없음). 경매방 명령 큐 안에서 만들어 두면
+        큐 밖에서 응답을 만드는 동안 낙찰·유찰이 섞이지 않는다 (REST 조회 / 내보내기)
+        """
+        roster = Roster(self.owner_ids)
+        roster.names = list(self.names)
+        roster.tiers = list(self.tiers)
+        roster.status = self.status[:]
+        roster.price = self.price[:]
+        roster.owner = self.owner[:]
+        roster.won_round = self.won_round[:]
+        roster.order = self.order[:]
+        roster.teams = {owner_id: players[:] for owner_id, players in self.teams.items()}
+        roster.revision = self.revision
+        return roster
+
+    # --- 로그 / 스냅샷 ---
+
+    def to_doc(self) -> dict:
+        return {
+            'names': list(self.names),
+            'tiers': list(self.tiers),
+            'status': self.status.tolist(),
+            'price': self.price.tolist(),
+            'owner': self.owner.tolist(),
+            'round': self.won_round.tolist(),
+            'owners': list(self.owner_ids),
+            'order': self.order.tolist(),
+            'teams': {owner_id: players.tolist() for owner_id, players in self.teams.items()},
+        }
+
+    @classmethod
+    def from_doc(cls, doc: dict) -> 'Roster':
+        roster = cls(doc['owners'])
+        roster.names = list(doc['names'])
+        roster.tiers = [sys.intern(tier) for tier in doc['tiers']]
+        roster.status = array.array('b', doc['status'])
+        roster.price = array.array('q', doc['price'])
+        roster.owner = array.array('i', doc['owner'])
+        roster.won_round = array.array('b', doc['round'])
+        roster.order = array.array('i', doc['order'])
+        for owner_id, players in doc['teams'].items():
+            roster.owner_code(owner_id)
+            roster.teams[owner_id] = array.array('i', players)
+        return roster
+
+
+# --- 가져오기 / 내보내기 (CSV, JSONL) ---
+
+class RosterImportError(ValueError):
+    """명단 가져오기 검증 실패. errors = [{'line': 줄 번호, 'message': ...}]"""
+
+    def __init__(self, errors: list):
+        super().__init__(f"선수 명단 오류 {len(errors)}건")
+        self.errors = errors
+
+
+def _csv_rows(lines):
+    """헤더(tier, name 열 필수, 순서 무관, 다른 열은 무시) 다음 줄부터 (줄 번호, tier, name)"""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    columns = [column.strip().lower() for column in header or ()]
+    if 'tier' not in columns or 'name' not in columns:
+        raise RosterImportError([{'line': 1, 'message': "첫 줄에 tier, name 열 이름이 있어야 합니다"}])
+    tier_at, name_at = columns.index('tier'), columns.index('name')
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        if len(row) <= max(tier_at, name_at):
+            yield reader.line_num, None, None
+        else:
+            yield reader.line_num, row[tier_at], row[name_at]
+
+
+def _jsonl_rows(lines):
+    """한 줄에 {"tier": ..., "name": ...} 하나씩 (줄 번호, tier, name). 빈 줄은 건너뛴다"""
+    for line_no, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            entry = None
+        if not isinstance(entry, dict):
+            yield line_no, None, None
+        else:
+            yield line_no, entry.get('tier'), entry.get('name')
+
+
+def parse_roster(lines, fmt: str, max_players: int) -> list:
+    """
+    lines(문자열 iterable)를 한 줄씩 읽어 검증한 [(tier, name), ...].
+    잘못된 줄이 하나라도 있으면 줄 번호를 담은 RosterImportError (일부만 가져오지 않는다).
+    """
+    rows = _csv_rows(lines) if fmt == 'csv' else _jsonl_rows(lines)
+    entries = []
+    seen = set()
+    errors = []
+    for line_no, tier, name in rows:
+        if not isinstance(tier, str) or not isinstance(name, str):
+            errors.append({'line': line_no, 'message': "tier, name 값을 읽을 수 없습니다"})
+        else:
+            tier, name = tier.strip(), name.strip()
+            if not TIER_PATTERN.match(tier):
+                errors.append({'line': line_no, 'message': f"잘못된 티어입니다: {tier!r} (영문/숫자 8자 이내)"})
+            elif not name or len(name) > NAME_MAX_LENGTH or not name.isprintable():
+                errors.append({'line': line_no, 'message': f"잘못된 이름입니다 (1~{NAME_MAX_LENGTH}자)"})
+            elif name in seen:
+                errors.append({'line': line_no, 'message': f"중복된 이름입니다: {name}"})
+            elif len(entries) >= max_players:
+                errors.append({'line': line_no, 'message': f"선수는 최대 {max_players}명까지 가져올 수 있습니다"})
+                break
+            else:
+                seen.add(name)
+                entries.append((tier, name))
+        if len(errors) >= MAX_IMPORT_ERRORS:
+            break
+
+    if not entries and not errors:
+        errors.append({'line': 0, 'message': "선수가 없습니다"})
+    if errors:
+        raise RosterImportError(errors)
+    return entries
+
+
+def export_lines(roster: Roster, players, fmt: str):
+    """players(선수 번호)의 player_record 를 CSV / JSONL 문자열 조각으로 (EXPORT_CHUNK 줄씩)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n') if fmt == 'csv' else None
+    if writer:
+        writer.writerow(EXPORT_FIELDS)
+    for i, player in enumerate(players, 1):
+        record = roster.player_record(player)
+        if writer:
+            writer.writerow(['' if record[field] is None else record[field] for field in EXPORT_FIELDS])
+        else:
+            buffer.write(json.dumps(record, ensure_ascii=False) + '\n')
+        if i % EXPORT_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,342 @@
+# simulate.py
+"""
+경매 시뮬레이터. 서버 / Socket.IO 없이 engine.py 의 규칙 엔진을 그대로 써서
+seed 마다 경매 하나를 처음부터 끝까지(1차 → 2차 → 최종 배정) 가상 시계로 진행한다.
+여러 seed 를 프로세스 풀에 나눠 돌리고 결과를 JSON 으로 집계한다 (같은 seed 범위면 워커 수와 상관없이 같은 결과).
+
+  - price             : 낙찰가 분포 (전체 / 티어별, 0 코인 강제 배정 제외)
+  - forced_rate       : 자동 귀속 + 최종 배정으로 0 코인에 간 선수 비율
+  - unsold_final_rate : 최종 유찰 비율
+  - second_round_rate : 2차 경매까지 간 경매 비율
+  - coins_left        : 경매가 끝났을 때 팀장별 남은 코인, 한 경매 안 팀장 간 최대-최소 차이(spread)
+  - strategies        : 입찰 전략별 팀 인원 / 낙찰 수 / 평균 지출 / 평균 낙찰가
+
+입찰 전략(STRATEGIES)은 팀장 순서대로 --strategies 목록을 돌려 가며 배정한다.
+  passive : 입찰하지 않음
+  random  : 차례마다 30% 확률로 5 / 10 / 50 코인 올림
+  value   : 남은 코인 ÷ 아직 없는 티어 수 (±spread) 를 선수 가치로 보고 그 안에서 5 코인씩
+  jump    : value 와 같은 한도 안에서 남은 차이의 절반씩 크게 올림
+  proxy   : value 한도를 준비 시간에 자동 입찰(set_proxy_bid)로 맡김
+
+    python simulate.py --auctions 5000 --strategies value,random,proxy --workers 8
+    python simulate.py --roster players.csv --managers 5 --coin 1000 --policy balanced
+"""
+import argparse
+import collections
+import concurrent.futures
+import json
+import os
+import random
+import sys
+import time
+
+from assignment import ASSIGNMENT_POLICIES
+from engine import BID_STEP, AuctionEngine, EventSink
+from roster import ROSTER_FORMATS, SOLD, FORCED, UNSOLD_FINAL, parse_roster
+
+MAX_BID_PASSES = 10000      # 선수 한 명에 대해 모든 팀장에게 차례를 돌리는 최대 횟수 (전략 버그로 끝나지 않는 경우 대비)
+
+
+# --- 입찰 전략 ---
+
+class Bidder:
+    """입찰 전략 기본형 (= passive)"""
+
+    def __init__(self, otp, rng: random.Random, spread: float):
+        self.otp = otp
+        self.rng = rng
+        self.spread = spread
+        self.limit = 0
+
+    def prepare(self, engine: AuctionEngine):
+        """선수 경매 준비 시간(PAUSED)에 한 번"""
+
+    def bid(self, engine: AuctionEngine) -> int:
+        """입찰 중(BIDDING) 차례가 오면 올릴 금액 (0 이면 입찰하지 않음)"""
+        return 0
+
+    def valuation(self, engine: AuctionEngine) -> int:
+        """남은 코인을 아직 없는 티어 수로 나눈 몫에 ±spread 를 곱한 값"""
+        missing = sum(1 for tier, otps in engine.tier_index['missing'].items()
+                      if self.otp in otps and engine.tier_index['remaining'].get(tier))
+        share = engine.managers[self.otp]['coin'] / max(1, missing)
+        return int(share * self.rng.uniform(1 - self.spread, 1 + self.spread))
+
+
+class RandomBidder(Bidder):
+    def bid(self, engine):
+        return self.rng.choice((5, 10, 50)) if self.rng.random() < 0.3 else 0
+
+
+class ValueBidder(Bidder):
+    def prepare(self, engine):
+        self.limit = self.valuation(engine)
+
+    def bid(self, engine):
+        return BID_STEP if engine.state['current_price'] + BID_STEP <= self.limit else 0
+
+
+class JumpBidder(ValueBidder):
+    def bid(self, engine):
+        gap = self.limit - engine.state['current_price']
+        if gap < BID_STEP:
+            return 0
+        return max(BID_STEP, gap // 2 // BID_STEP * BID_STEP)
+
+
+class ProxyBidder(ValueBidder):
+    def prepare(self, engine):
+        super().prepare(engine)
+        if self.limit >= BID_STEP:
+            engine.set_proxy_bid(self.otp, self.limit)
+
+    def bid(self, engine):
+        return 0
+
+
+STRATEGIES = {
+    'passive': Bidder,
+    'random': RandomBidder,
+    'value': ValueBidder,
+    'jump': JumpBidder,
+    'proxy': ProxyBidder,
+}
+
+
+# --- 경매 한 번 ---
+
+class SimClock:
+    """가상 시계: 마감 시각으로 바로 건너뛴다"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SimSink(EventSink):
+    def __init__(self):
+        self.counts = collections.Counter()
+
+    def record(self, event: dict):
+        self.counts[event['type']] += 1
+
+
+def run_auction(seed: int, config: dict):
+    """seed 로 경매 하나를 끝까지 진행하고 (engine, 팀장 otp -> 전략 이름, sink)"""
+    rng = random.Random(seed)
+    clock = SimClock()
+    sink = SimSink()
+    engine = AuctionEngine(config['managers'], config['players'], sink=sink, clock=clock, rng=rng,
+                           finalize_policy=config['policy'])
+    names = config['strategies']
+    assigned = {otp: names[i % len(names)] for i, otp in enumerate(engine.managers)}
+    bidders = [STRATEGIES[name](otp, random.Random(rng.random()), config['spread'])
+               for otp, name in assigned.items()]
+
+    engine.start_auction()
+    while engine.state['status'] != 'ENDED':
+        if engine.state['status'] == 'PAUSED':
+            for bidder in bidders:
+                bidder.prepare(engine)
+        else:
+            bid_round(engine, bidders, rng)
+        clock.now = max(clock.now, engine.state['timer_end'])
+        engine.timer_expired()
+    return engine, assigned, sink
+
+
+def bid_round(engine: AuctionEngine, bidders: list, rng: random.Random):
+    """선두가 아닌 팀장에게 무작위 순서로 차례를 돌리고, 아무도 올리지 않으면 끝 (마감까지 조용)"""
+    for _ in range(MAX_BID_PASSES):
+        rng.shuffle(bidders)
+        raised = False
+        for bidder in bidders:
+            if engine.state['leading_manager_id'] == engine.managers[bidder.otp]['id']:
+                continue
+            amount = bidder.bid(engine)
+            if amount > 0 and engine.apply_bid(bidder.otp, amount) is None:
+                raised = True
+        if not raised:
+            return
+
+
+# --- 집계 ---
+
+def distribution(counts: collections.Counter) -> dict:
+    """값 -> 개수 Counter 의 개수 / 평균 / 분위수"""
+    total = sum(counts.values())
+    if not total:
+        return {'count': 0}
+    values = sorted(counts)
+    result = {'count': total, 'mean': round(sum(v * n for v, n in counts.items()) / total, 2),
+              'min': values[0], 'max': values[-1]}
+    targets = [('p10', 0.1), ('p50', 0.5), ('p90', 0.9), ('p99', 0.99)]
+    seen = 0
+    for value in values:
+        seen += counts[value]
+        while targets and seen >= targets[0][1] * total:
+            result[targets.pop(0)[0]] = value
+    return result
+
+
+class Summary:
+    """경매 여러 개의 집계 (워커마다 만들어서 merge)"""
+
+    def __init__(self):
+        self.auctions = 0
+        self.players = 0
+        self.forced = 0
+        self.unsold_final = 0
+        self.second_rounds = 0
+        self.prices = collections.Counter()
+        self.tier_prices = collections.defaultdict(collections.Counter)
+        self.coins_left = collections.Counter()
+        self.coin_spread = collections.Counter()
+        self.strategies = collections.defaultdict(collections.Counter)
+
+    def add(self, engine: AuctionEngine, assigned: dict, sink: SimSink):
+        roster = engine.roster
+        self.auctions += 1
+        self.second_rounds += bool(sink.counts['second_round'])
+        for player in range(len(roster.names)):
+            self.players += 1
+            status = roster.status[player]
+            if status == SOLD:
+                self.prices[roster.price[player]] += 1
+                self.tier_prices[roster.tiers[player]][roster.price[player]] += 1
+            elif status == FORCED:
+                self.forced += 1
+            elif status == UNSOLD_FINAL:
+                self.unsold_final += 1
+
+        coins = [m['coin'] for m in engine.managers.values()]
+        self.coins_left.update(coins)
+        self.coin_spread[max(coins) - min(coins)] += 1
+        for otp, name in assigned.items():
+            manager = engine.managers[otp]
+            team = roster.teams[manager['id']]
+            stats = self.strategies[name]
+            stats['managers'] += 1
+            stats['players'] += len(team)
+            stats['won'] += sum(1 for p in team if roster.status[p] == SOLD)
+            stats['spent'] += sum(roster.price[p] for p in team)
+
+    def merge(self, other: 'Summary'):
+        for field in ('auctions', 'players', 'forced', 'unsold_final', 'second_rounds'):
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        self.prices.update(other.prices)
+        for tier, counts in other.tier_prices.items():
+            self.tier_prices[tier].update(counts)
+        self.coins_left.update(other.coins_left)
+        self.coin_spread.update(other.coin_spread)
+        for name, stats in other.strategies.items():
+            self.strategies[name].update(stats)
+
+    def report(self) -> dict:
+        players = max(1, self.players)
+        return {
+            'auctions': self.auctions,
+            'players': self.players,
+            'price': dict(distribution(self.prices),
+                          by_tier={tier: distribution(c) for tier, c in sorted(self.tier_prices.items())}),
+            'forced_rate': round(self.forced / players, 4),
+            'unsold_final_rate': round(self.unsold_final / players, 4),
+            'second_round_rate': round(self.second_rounds / max(1, self.auctions), 4),
+            'coins_left': dict(distribution(self.coins_left), spread=distribution(self.coin_spread)),
+            'strategies': {
+                name: {
+                    'managers': stats['managers'],
+                    'players_per_team': round(stats['players'] / stats['managers'], 3),
+                    'won_per_team': round(stats['won'] / stats['managers'], 3),
+                    'spent_mean': round(stats['spent'] / stats['managers'], 2),
+                    'price_mean': round(stats['spent'] / stats['won'], 2) if stats['won'] else None,
+                }
+                for name, stats in sorted(self.strategies.items())
+            },
+        }
+
+
+def run_batch(seeds, config: dict) -> Summary:
+    summary = Summary()
+    for seed in seeds:
+        summary.add(*run_auction(seed, config))
+    return summary
+
+
+# --- 실행 ---
+
+def load_players(args) -> list:
+    if args.roster:
+        fmt = 'jsonl' if args.roster.endswith(('.jsonl', '.ndjson')) else 'csv'
+        with open(args.roster, encoding='utf-8-sig', newline='') as f:
+            return parse_roster(f, fmt, sys.maxsize)
+    tiers = [chr(ord('A') + i) for i in range(args.tiers)]
+    return [(tier, f"{tier}{i + 1}") for tier in tiers for i in range(args.per_tier)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--auctions', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=1, help='첫 경매의 seed (경매 i 는 seed + i)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='프로세스 수 (1 이면 이 프로세스에서)')
+    parser.add_argument('--batch', type=int, default=100, help='워커에 한 번에 넘기는 경매 수')
+    parser.add_argument('--managers', type=int, default=3)
+    parser.add_argument('--coin', type=int, default=1000, help='팀장별 시작 코인')
+    parser.add_argument('--tiers', type=int, default=4, help='--roster 가 없을 때 티어 수')
+    parser.add_argument('--per-tier', type=int, default=3, help='--roster 가 없을 때 티어별 선수 수')
+    parser.add_argument('--roster', help=f"선수 명단 파일 ({' / '.join(ROSTER_FORMATS)}, 서버 가져오기와 같은 형식)")
+    parser.add_argument('--strategies', default='value', help=f"팀장 순서대로 돌려 가며 배정 ({', '.join(STRATEGIES)})")
+    parser.add_argument('--spread', type=float, default=0.3, help='value / jump / proxy 가치 평가의 ± 비율')
+    parser.add_argument('--policy', default='richest', choices=sorted(ASSIGNMENT_POLICIES), help='최종 배정 정책')
+    parser.add_argument('--output', help='결과 JSON 파일 (없으면 stdout)')
+    args = parser.parse_args()
+
+    strategies = [name.strip() for name in args.strategies.split(',') if name.strip()]
+    unknown = [name for name in strategies if name not in STRATEGIES]
+    if not strategies or unknown:
+        parser.error(f"알 수 없는 전략: {', '.join(unknown)} (가능: {', '.join(STRATEGIES)})")
+
+    config = {
+        'managers': {f"M{i + 1:02d}": {'id': f"T{i + 1:02d}", 'name': f"팀장{i + 1}", 'coin': args.coin}
+                     for i in range(args.managers)},
+        'players': load_players(args),
+        'strategies': strategies,
+        'spread': args.spread,
+        'policy': args.policy,
+    }
+    seeds = range(args.seed, args.seed + args.auctions)
+    batches = [seeds[i:i + args.batch] for i in range(0, len(seeds), args.batch)]
+
+    started = time.perf_counter()
+    summary = Summary()
+    if args.workers <= 1:
+        for batch in batches:
+            summary.merge(run_batch(batch, config))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for result in pool.map(run_batch, batches, [config] * len(batches)):
+                summary.merge(result)
+    elapsed = time.perf_counter() - started
+
+    report = {
+        'config': {
+            'auctions': args.auctions, 'seed': args.seed, 'workers': args.workers, 'managers': args.managers,
+            'coin': args.coin, 'players': len(config['players']), 'strategies': strategies,
+            'spread': args.spread, 'policy': args.policy,
+        },
+        'elapsed_sec': round(elapsed, 3),
+        'auctions_per_sec': round(args.auctions / elapsed, 1) if elapsed else None,
+        **summary.report(),
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
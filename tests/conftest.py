@@ -0,0 +1,12 @@
+# tests/conftest.py
+"""테스트 공통: 저장소 루트를 import 경로에 넣고, app 을 import 해도 경매 기록을 남기지 않게 한다."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ['AUCTION_DATA_DIR'] = ''
+os.environ.pop('AUCTION_ASYNC_MODE', None)
+os.environ.pop('AUCTION_WORKERS', None)
+os.environ.pop('AUCTION_MESSAGE_QUEUE', None)
@@ -0,0 +1,56 @@
+# tests/support.py
+"""엔진 테스트 공통: 가짜 시계, 기록용 sink, 작은 엔진 만들기"""
+import random
+
+from engine import AuctionEngine, EventSink, PREPARE_SEC
+
+PLAYERS = [('A', '가'), ('A', '나'), ('A', '다'), ('B', '라'), ('B', '마'), ('B', '바')]
+
+
+class FakeClock:
+    """advance() 로만 움직이는 시계"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class RecordingSink(EventSink):
+    def __init__(self):
+        self.events = []
+        self.deadlines = []
+        self.rejections = []
+        self.notices = []
+
+    def record(self, event: dict):
+        self.events.append(event)
+
+    def schedule(self, deadline):
+        self.deadlines.append(deadline)
+
+    def reject(self, sid, reason: str, message: str):
+        self.rejections.append(reason)
+
+    def notify(self, manager_otp, event: str, data: dict):
+        self.notices.append((manager_otp, event, data))
+
+    def bids(self) -> list:
+        return [(e['manager_id'], e['price'], e.get('proxy', False)) for e in self.events if e['type'] == 'bid']
+
+
+def make_engine(coins=(1000, 1000, 1000), players=PLAYERS, **kwargs) -> AuctionEngine:
+    managers = {f'otp{i}': {'id': f'T0{i}', 'name': f'팀장{i}', 'coin': coin} for i, coin in enumerate(coins, 1)}
+    return AuctionEngine(managers, players, sink=RecordingSink(), clock=FakeClock(), rng=random.Random(0), **kwargs)
+
+
+def open_bidding(engine: AuctionEngine):
+    """READY → PAUSED → (준비 시간이 지나) BIDDING"""
+    engine.start_auction()
+    engine.clock.advance(PREPARE_SEC)
+    assert engine.timer_expired()
+    assert engine.state['status'] == 'BIDDING'
@@ -0,0 +1,75 @@
+# tests/test_assignment.py
+"""assign_leftovers 정책별 배정 순서"""
+import random
+
+import pytest
+
+from assignment import ASSIGNMENT_POLICIES, assign_leftovers
+
+# (팀장 key, 남은 코인, 현재 팀 인원)
+MANAGERS = [('m1', 100, 0), ('m2', 300, 1), ('m3', 200, 1)]
+PLAYERS = [('p1', 'A'), ('p2', 'A'), ('p3', 'B')]
+MISSING = {'A': {'m1', 'm2', 'm3'}, 'B': {'m1', 'm3'}}
+
+
+@pytest.mark.parametrize('policy, expected', [
+    # 코인 많은 순
+    ('richest', [('p1', 'm2'), ('p2', 'm3'), ('p3', 'm3')]),
+    # 인원 적은 순: m1 이 p1 을 받아 1명이 되면 p3 는 같은 1명 중 코인이 많은 m3
+    ('balanced', [('p1', 'm1'), ('p2', 'm2'), ('p3', 'm3')]),
+    # 코인 적은 순
+    ('min_cost', [('p1', 'm1'), ('p2', 'm3'), ('p3', 'm1')]),
+])
+def test_policy_order(policy, expected):
+    assert assign_leftovers(PLAYERS, MANAGERS, MISSING, policy) == expected
+
+
+@pytest.mark.parametrize('policy', sorted(ASSIGNMENT_POLICIES))
+def test_one_player_per_tier_and_none_when_no_team_can_take(policy):
+    players = [('p1', 'A'), ('p2', 'A'), ('p3', 'A'), ('p4', 'C')]
+    result = assign_leftovers(players, MANAGERS, {'A': {'m1', 'm3'}}, policy)
+    assert [player for player, _ in result] == ['p1', 'p2', 'p3', 'p4']
+    assert sorted(owner for _, owner in result[:2]) == ['m1', 'm3']
+    assert result[2:] == [('p3', None), ('p4', None)]
+
+
+@pytest.mark.parametrize('policy', sorted(ASSIGNMENT_POLICIES))
+def test_ties_go_to_earlier_manager(policy):
+    managers = [('m1', 100, 1), ('m2', 100, 1)]
+    assert assign_leftovers([('p1', 'A')], managers, {'A': {'m1', 'm2'}}, policy) == [('p1', 'm1')]
+
+
+def test_leftovers_do_not_change_the_input():
+    missing = {tier: set(keys) for tier, keys in MISSING.items()}
+    assign_leftovers(PLAYERS, MANAGERS, missing, 'balanced')
+    assert missing == MISSING
+
+
+def naive_assign(players, managers, missing, policy):
+    """선수마다 후보 팀장 전체를 정렬해서 고르는 단순한 구현 (heap 구현과 결과가 같아야 한다)"""
+    by_size, direction = ASSIGNMENT_POLICIES[policy]
+    sizes = {key: size for key, _, size in managers}
+    lacking = {tier: set(keys) for tier, keys in missing.items()}
+    result = []
+    for player, tier in players:
+        candidates = [(sizes[key] if by_size else 0, direction * coin, order, key)
+                      for order, (key, coin, _) in enumerate(managers) if key in lacking.get(tier, ())]
+        if not candidates:
+            result.append((player, None))
+            continue
+        key = min(candidates)[3]
+        lacking[tier].discard(key)
+        sizes[key] += 1
+        result.append((player, key))
+    return result
+
+
+@pytest.mark.parametrize('policy', sorted(ASSIGNMENT_POLICIES))
+def test_matches_naive_assignment(policy):
+    rng = random.Random(policy)
+    for _ in range(200):
+        tiers = 'ABCD'[:rng.randint(1, 4)]
+        managers = [(f'm{i}', rng.choice([0, 50, 100, 150]), rng.randint(0, 3)) for i in range(rng.randint(1, 6))]
+        players = [(f'p{i}', rng.choice(tiers)) for i in range(rng.randint(0, 12))]
+        missing = {tier: {key for key, _, _ in managers if rng.random() < 0.6} for tier in tiers}
+        assert assign_leftovers(players, managers, missing, policy) == naive_assign(players, managers, missing, policy)
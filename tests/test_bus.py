@@ -0,0 +1,58 @@
+# tests/test_bus.py
+"""unix 소켓 메시지 버스: 워커 번호로 보낸 경매방 명령 중계와 접속 전 명령 보관"""
+import threading
+
+import pytest
+
+import bus
+
+
+@pytest.fixture
+def hub_url(tmp_path):
+    path = str(tmp_path / 'bus.sock')
+    bus.BusHub(path).start()
+    return f'unix://{path}'
+
+
+def listen(manager):
+    """manager 가 받은 경매방 명령을 모으는 수신 스레드"""
+    received = []
+    arrived = threading.Event()
+
+    def handler(room_id, command, args):
+        received.append((room_id, command, args))
+        arrived.set()
+
+    manager.command_handler = handler
+    threading.Thread(target=lambda: next(manager._listen(), None), daemon=True).start()
+    return received, arrived
+
+
+def test_command_reaches_only_the_owner_worker(hub_url):
+    sender = bus.make_client_manager(hub_url, 0)
+    owner = bus.make_client_manager(hub_url, 1)
+    other = bus.make_client_manager(hub_url, 2)
+    owner_received, owner_arrived = listen(owner)
+    other_received, _ = listen(other)
+    owner._ensure_connected()
+    other._ensure_connected()
+
+    sender.publish_command(1, 'r1', 'attach', ['sid', None])
+    assert owner_arrived.wait(5)
+    assert owner_received == [('r1', 'attach', ['sid', None])]
+    assert other_received == []
+
+
+def test_commands_wait_in_the_hub_until_the_owner_connects(hub_url):
+    sender = bus.make_client_manager(hub_url, 0)
+    for i in range(3):
+        sender.publish_command(1, 'r1', 'place_bid', [i])
+    sender._ensure_connected()
+
+    owner = bus.make_client_manager(hub_url, 1)
+    received, arrived = listen(owner)
+    for _ in range(50):
+        if len(received) == 3:
+            break
+        arrived.wait(0.1)
+    assert [args for _, _, args in received] == [[0], [1], [2]]
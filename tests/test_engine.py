@@ -0,0 +1,92 @@
+# tests/test_engine.py
+"""AuctionEngine 을 가짜 시계와 기록용 sink 로 돌려 보는 테스트 (타이머, 입찰, 마감 처리)"""
+import pytest
+
+from engine import BID_EXTEND_SEC, PREPARE_SEC
+from roster import SOLD
+from support import make_engine, open_bidding
+
+
+def test_prepare_timer_opens_bidding_at_deadline():
+    engine = make_engine()
+    engine.start_auction()
+    assert engine.state['status'] == 'PAUSED'
+    assert engine.sink.deadlines[-1] == engine.clock() + PREPARE_SEC
+
+    # 마감 전에 깨어나면 그대로 두고 다시 등록만
+    engine.clock.advance(PREPARE_SEC - 1)
+    assert not engine.timer_expired()
+    assert engine.state['status'] == 'PAUSED'
+    assert engine.sink.deadlines[-1] == engine.state['timer_end']
+
+    engine.clock.advance(1)
+    assert engine.timer_expired()
+    assert engine.state['status'] == 'BIDDING'
+    assert engine.state['timer_end'] == engine.clock() + BID_EXTEND_SEC
+
+
+def test_bid_extends_deadline_and_sells_at_expiry():
+    engine = make_engine()
+    open_bidding(engine)
+    player = engine.current_player_no()
+
+    engine.clock.advance(10)
+    assert engine.apply_bid('otp1', 30) is None
+    assert engine.state['timer_end'] == engine.clock() + BID_EXTEND_SEC
+
+    engine.clock.advance(BID_EXTEND_SEC)
+    assert engine.timer_expired()
+    assert engine.managers['otp1']['coin'] == 970
+    assert engine.roster.status[player] == SOLD
+    assert list(engine.roster.teams['T01']) == [player]
+    assert engine.state['status'] == 'PAUSED'
+    assert engine.state['player_index'] == 1
+
+
+def test_bid_rejections():
+    engine = make_engine(coins=(1000, 20, 1000))
+    engine.start_auction()
+    assert engine.apply_bid('otp1', 5) == 'not_bidding'
+
+    engine.clock.advance(PREPARE_SEC)
+    engine.timer_expired()
+    assert engine.apply_bid('nobody', 5) == 'invalid_manager'
+    assert engine.apply_bid('otp2', 25) == 'insufficient_coin'
+    assert engine.sink.rejections == ['not_bidding', 'invalid_manager', 'insufficient_coin']
+    assert engine.sink.bids() == []
+
+
+def test_commands_report_when_nothing_changed():
+    """경매방은 False 를 돌려준 명령 뒤에는 상태 버전(mutation)을 올리지 않는다"""
+    engine = make_engine()
+    assert engine.end_bid() is False
+    assert engine.set_proxy_bid('otp1', 100) is False     # 시작 전
+    assert engine.start_auction() is True
+    assert engine.set_proxy_bid('otp1', 0) is False       # 취소할 자동 입찰 없음
+    assert engine.set_proxy_bid('otp1', 100) is True
+    assert engine.set_proxy_bid('otp1', 0) is True
+
+    engine.clock.advance(PREPARE_SEC)
+    assert engine.timer_expired() is True
+    assert engine.start_auction() is False                # 이미 입찰 중
+    assert engine.end_bid() is True
+
+
+@pytest.mark.parametrize('policy', ['richest', 'balanced', 'min_cost'])
+def test_auction_without_bids_ends_with_every_team_filled(policy):
+    """아무도 입찰하지 않으면 1차 / 2차 모두 유찰되고 최종 배정으로 팀마다 티어당 한 명씩"""
+    engine = make_engine(finalize_policy=policy)
+    engine.start_auction()
+    for _ in range(100):
+        if engine.state['status'] == 'ENDED':
+            break
+        engine.clock.now = engine.state['timer_end']
+        engine.timer_expired()
+    assert engine.state['status'] == 'ENDED'
+
+    types = [e['type'] for e in engine.sink.events]
+    assert types.count('second_round') == 1
+    for manager in engine.managers.values():
+        tiers = sorted(engine.roster.tiers[p] for p in engine.roster.teams[manager['id']])
+        assert tiers == ['A', 'B']
+        assert manager['coin'] == 1000
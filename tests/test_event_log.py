@@ -0,0 +1,88 @@
+# tests/test_event_log.py
+"""이벤트 로그: 명령 묶음마다 남기는 JSON Patch 를 차례로 적용하면 같은 경매 문서가 되고, 재시작하면 그대로 복구된다"""
+import json
+import random
+
+import app
+from app import AuctionRoom
+from delta import apply_json_patch, make_json_patch
+from engine import AuctionEngine
+from roster import Roster
+
+
+def test_round_trip_over_an_auction():
+    """경매를 진행하며 기록용 문서(상태 + 팀장 + 명단)를 차례로 패치해도 매번 같은 문서가 된다"""
+    managers = {f'otp{i}': {'id': f'T0{i}', 'name': f'팀장{i}', 'coin': 1000} for i in range(1, 4)}
+    players = [(tier, f'{tier}{n}') for tier in 'ABC' for n in range(3)]
+    now = [0.0]
+    rng = random.Random(7)
+    engine = AuctionEngine(managers, players, clock=lambda: now[0], rng=rng)
+
+    def document():
+        doc = json.loads(json.dumps({'state': engine.state, 'managers': engine.managers}))
+        doc['roster'] = engine.roster.to_doc()
+        return doc
+
+    replayed = document()
+    engine.start_auction()
+    for _ in range(200):
+        if engine.state['status'] == 'ENDED':
+            break
+        if engine.state['status'] == 'BIDDING' and rng.random() < 0.6:
+            otp = rng.choice(list(engine.managers))
+            engine.apply_bid(otp, rng.choice([5, 10, 50]))
+        else:
+            now[0] = engine.state['timer_end']
+            engine.timer_expired()
+
+        current = document()
+        replayed = apply_json_patch(replayed, make_json_patch(replayed, current))
+        assert replayed == current
+    assert engine.state['status'] == 'ENDED'
+
+    roster = Roster.from_doc(replayed['roster'])
+    assert [roster.player_dict(p) for p in roster.order] == \
+        [engine.roster.player_dict(p) for p in engine.roster.order]
+
+
+def test_roster_journal_replays_to_same_doc():
+    """Roster.journal 연산(이벤트 로그에 남는 명단 변경)을 이전 to_doc 에 적용하면 지금 to_doc 과 같다"""
+    roster = Roster(['T01', 'T02'])
+    roster.add_round([('A', 'a1'), ('A', 'a2'), ('B', 'b1')])
+    doc = roster.to_doc()
+
+    roster.take_journal()
+    roster.assign(0, 'T01', 30, 1)
+    roster.mark(1, 2)
+    roster.assign(2, 'T/03', 0, 1, forced=True)     # 처음 보는 팀장 (경로 이스케이프)
+    doc = apply_json_patch(doc, roster.take_journal())
+    assert doc == roster.to_doc()
+
+    roster.begin_round([1])         # 2차 경매 순서
+    doc = apply_json_patch(doc, roster.take_journal())
+    assert doc == roster.to_doc()
+    assert roster.take_journal() == []
+
+
+def test_roster_without_journal_records_nothing():
+    roster = Roster(['T01'])
+    roster.add_round([('A', 'a1')])
+    roster.assign(0, 'T01', 5, 1)
+    assert roster.journal is None
+
+
+def test_flush_in_the_same_batch_still_logs_the_change(tmp_path, monkeypatch):
+    """[변경, flush] 가 한 묶음으로 처리돼도 보내기 전에 로그에 남고, 재시작하면 그 변경으로 복구된다"""
+    monkeypatch.setattr(app, 'DATA_DIR', str(tmp_path))
+    room = AuctionRoom('test-log')
+    otp = next(iter(room.managers))
+
+    with room.commands_lock:
+        room.commands.extend([(room.update_manager, (otp, {'coin': 123})), (room.flush, ())])
+        room.draining = True
+    room.drain()
+    assert room.persisted_mutation == room.mutation
+    assert not room.dirty
+
+    room.event_log.sync()
+    assert AuctionRoom('test-log').managers[otp]['coin'] == 123
@@ -0,0 +1,61 @@
+# tests/test_json_patch.py
+"""make_json_patch → apply_json_patch 왕복 (상태 delta 와 이벤트 로그 재생이 이 둘에 기댄다)"""
+import copy
+import json
+
+import pytest
+
+from app import AuctionRoom
+from delta import apply_json_patch, make_json_patch
+
+CASES = [
+    ({'a': 1, 'b': {'c': [1, 2, 3]}}, {'a': 2, 'b': {'c': [1, 5, 3]}}),
+    ({'a': 1, 'gone': True}, {'a': 1, 'new': {'x': None}}),
+    ({'list': [1, 2, 3]}, {'list': [1, 2]}),
+    ({'list': []}, {'list': [{'k': 'v'}]}),
+    ({'a/b': 1, 'c~d': 2, '': 3}, {'a/b': 4, 'c~d': 5, '': 6, '~1': 7}),
+    ({'n': 1}, {'n': 1.0}),
+    ({'n': 1}, {'n': True}),
+    ({'v': 'text'}, {'v': None}),
+    ({'nested': [[1, 2], [3, 4]]}, {'nested': [[1, 2], [3, 4, 5]]}),
+    ({'a': 1}, [1, 2]),
+    ({}, {}),
+]
+
+
+@pytest.mark.parametrize('old, new', CASES)
+def test_round_trip(old, new):
+    ops = make_json_patch(old, new)
+    assert apply_json_patch(copy.deepcopy(old), ops) == new
+    # 적용 결과가 new 를 그대로 다시 만들어야 한다 (타입 포함)
+    assert json.dumps(apply_json_patch(copy.deepcopy(old), ops), sort_keys=True) == json.dumps(new, sort_keys=True)
+
+
+def test_equal_documents_make_no_ops():
+    doc = {'a': [1, {'b': 2}], 'c': 'd'}
+    assert make_json_patch(doc, copy.deepcopy(doc)) == []
+
+
+def test_only_changed_leaves_are_replaced():
+    ops = make_json_patch({'a': {'b': 1, 'c': 2}}, {'a': {'b': 1, 'c': 3}})
+    assert ops == [{'op': 'replace', 'path': '/a/c', 'value': 3}]
+
+
+def test_published_deltas_rebuild_the_latest_snapshot():
+    """auction_delta 를 버전 순서대로 적용한 클라이언트는 서버의 마지막 스냅샷과 같은 상태가 된다"""
+    room = AuctionRoom('test-delta')
+    version, _ = room.publish_auction_state()
+    client = copy.deepcopy(room.state_sync['snapshot'])
+
+    otp = next(iter(room.managers))
+    room.submit(room.start_auction)
+    room.submit(room.update_manager, otp, {'coin': 5})
+    room.submit(room.flush)         # 전송 빈도 제한으로 미뤄진 flush 를 바로
+    assert room.publish_auction_state() == (room.state_sync['version'], [])     # 바뀐 것이 없으면 버전 그대로
+
+    deltas = [d for d in room.state_sync['history'] if d['version'] > version]
+    assert [d['version'] for d in deltas] == list(range(version + 1, room.state_sync['version'] + 1))
+    for delta in deltas:
+        client = apply_json_patch(client, delta['ops'])
+    assert client == room.state_sync['snapshot']
+    assert client['managers'][otp]['coin'] == 5
@@ -0,0 +1,101 @@
+# tests/test_proxy_bids.py
+"""자동 입찰(최대 입찰가): 2등 한도 + 한 단계 가격, 동률 처리, 직접 입찰에 대한 응찰, 취소"""
+from engine import BID_STEP, PREPARE_SEC
+from support import make_engine, open_bidding
+
+
+def test_proxy_winner_pays_runner_up_limit_plus_step():
+    engine = make_engine()
+    open_bidding(engine)
+
+    engine.set_proxy_bid('otp1', 100)
+    assert engine.sink.bids() == [('T01', BID_STEP, True)]
+
+    engine.set_proxy_bid('otp2', 60)
+    assert engine.state['leading_manager_id'] == 'T01'
+    assert engine.state['current_price'] == 60 + BID_STEP
+    # 중간 가격을 거치지 않고 결과 한 번만 입찰 이벤트로 남는다
+    assert engine.sink.bids() == [('T01', BID_STEP, True), ('T01', 60 + BID_STEP, True)]
+    assert ('otp2', 'proxy_status', {'player': engine.state['current_player'], 'max': None, 'outbid': True}) \
+        in engine.sink.notices
+    assert set(engine.proxy_bids()) == {'otp1'}
+
+
+def test_proxy_never_exceeds_its_own_limit():
+    engine = make_engine()
+    open_bidding(engine)
+    engine.set_proxy_bid('otp1', 100)
+    engine.set_proxy_bid('otp2', 98)
+    assert engine.state['leading_manager_id'] == 'T01'
+    assert engine.state['current_price'] == 100
+
+
+def test_proxy_tie_goes_to_earliest_registration():
+    engine = make_engine()
+    engine.start_auction()
+    engine.set_proxy_bid('otp2', 100)
+    engine.set_proxy_bid('otp3', 100)
+    assert engine.sink.bids() == []     # 준비 시간에는 등록만
+
+    engine.clock.advance(PREPARE_SEC)
+    engine.timer_expired()
+    assert engine.state['leading_manager_id'] == 'T02'
+    assert engine.state['current_price'] == 100
+    assert engine.sink.bids() == [('T02', 100, True)]
+
+
+def test_proxy_tie_goes_to_current_leader():
+    engine = make_engine()
+    open_bidding(engine)
+    engine.set_proxy_bid('otp1', 50)
+    engine.set_proxy_bid('otp2', 50)
+    assert engine.state['leading_manager_id'] == 'T01'
+    assert engine.state['current_price'] == 50
+
+
+def test_manual_bid_is_answered_by_proxy_in_same_command():
+    engine = make_engine()
+    open_bidding(engine)
+    engine.set_proxy_bid('otp1', 100)
+    engine.apply_bid('otp3', 20 - engine.state['current_price'])
+    assert engine.sink.bids()[-2:] == [('T03', 20, False), ('T01', 20 + BID_STEP, True)]
+
+    # 한도를 넘는 직접 입찰에는 더 응찰하지 않고 자동 입찰이 끝난다
+    engine.apply_bid('otp3', 110 - engine.state['current_price'])
+    assert engine.state['leading_manager_id'] == 'T03'
+    assert engine.state['current_price'] == 110
+    assert engine.proxy_bids() == {}
+
+
+def test_proxy_max_above_coins_is_capped_at_resolve_time():
+    engine = make_engine(coins=(50, 1000, 1000))
+    open_bidding(engine)
+    engine.set_proxy_bid('otp1', 500)
+    assert engine.sink.rejections == []
+    assert engine.proxy_bids()['otp1'][0] == 500
+
+    engine.set_proxy_bid('otp2', 200)
+    assert engine.state['leading_manager_id'] == 'T02'
+    assert engine.state['current_price'] == 50 + BID_STEP
+    assert 'otp1' not in engine.proxy_bids()
+
+
+def test_proxy_rejected_when_it_cannot_beat_current_price():
+    engine = make_engine(coins=(1000, 1000, 42))
+    open_bidding(engine)
+    engine.apply_bid('otp1', 40)
+    engine.set_proxy_bid('otp2', 40)
+    engine.set_proxy_bid('otp3', 500)
+    assert engine.sink.rejections == ['too_low', 'insufficient_coin']
+    assert engine.proxy_bids() == {}
+
+
+def test_proxy_cancel():
+    engine = make_engine()
+    engine.start_auction()
+    engine.set_proxy_bid('otp1', 100)
+    engine.set_proxy_bid('otp1', 0)
+    assert engine.proxy_bids() == {}
+    engine.clock.advance(PREPARE_SEC)
+    engine.timer_expired()
+    assert engine.sink.bids() == []
@@ -0,0 +1,82 @@
+# tests/test_rest_api.py
+"""선수 명단 REST API: 조회 / 팀 / 내보내기의 ETag 와 응답 내용이 같은 명단 버전에서 나온다"""
+import threading
+import time
+
+import pytest
+
+import app
+from roster import UNSOLD
+
+
+@pytest.fixture
+def room():
+    return app.get_room('test-api', create=True)
+
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+
+def test_players_etag_and_not_modified(room, client):
+    response = client.get('/api/rooms/test-api/players?limit=5')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['revision'] == room.roster.revision
+    assert body['total'] == len(room.roster.names)
+    assert len(body['players']) == 5
+
+    again = client.get('/api/rooms/test-api/players?limit=5', headers={'If-None-Match': response.headers['ETag']})
+    assert again.status_code == 304
+    assert again.headers['ETag'] == response.headers['ETag']
+
+
+def test_export_streams_every_matching_player(room, client):
+    response = client.get('/api/rooms/test-api/export?format=csv')
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0] == 'no,tier,name,status,price,owner_id,round'
+    assert len(lines) == len(room.roster.names) + 1
+
+
+def test_unknown_room_is_404(client):
+    assert client.get('/api/rooms/no-such-room/players').status_code == 404
+    assert client.get('/api/rooms/no-such-room/teams').status_code == 404
+
+
+def test_read_waits_for_the_command_in_progress(room, client):
+    """명령 처리 중에 들어온 조회는 그 명령이 끝난 뒤의 명단과 ETag 를 함께 돌려준다"""
+    started, release = threading.Event(), threading.Event()
+
+    player = room.roster.order[0]
+
+    def slow_mark():
+        started.set()
+        release.wait(2)
+        room.roster.mark(player, UNSOLD)
+
+    writer = threading.Thread(target=room.submit, args=(slow_mark,))
+    writer.start()
+    assert started.wait(2)
+    responses = []
+    reader = threading.Thread(target=lambda: responses.append(client.get('/api/rooms/test-api/players')))
+    reader.start()
+    time.sleep(0.05)
+    assert responses == []          # 명령이 끝날 때까지 기다린다
+
+    release.set()
+    reader.join(2)
+    writer.join(2)
+    body = responses[0].get_json()
+    assert body['revision'] == room.roster.revision
+    assert responses[0].headers['ETag'] == f'"{room.state_sync["epoch"]}-r{room.roster.revision}"'
+    assert {p['no']: p['status'] for p in body['players']}[player] == 'unsold'
+
+
+def test_roster_copy_does_not_follow_later_changes(room):
+    copy = room.roster.copy()
+    player = room.roster.order[1]
+    room.roster.assign(player, 'T01', 10, 1)
+    assert copy.status[player] != room.roster.status[player]
+    assert list(copy.teams['T01']) != list(room.roster.teams['T01'])
+    assert copy.revision == room.roster.revision - 1
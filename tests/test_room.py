@@ -0,0 +1,44 @@
+# tests/test_room.py
+"""AuctionRoom 명령 큐: 명령 묶음 처리와 상태 버전(mutation)"""
+from app import AuctionRoom
+
+
+def test_command_that_raises_is_not_a_mutation():
+    room = AuctionRoom('test-room')
+    mutation = room.mutation
+
+    def broken():
+        raise RuntimeError('boom')
+
+    room.submit(broken)
+    assert room.mutation == mutation
+    assert not room.dirty
+    assert not room.draining
+
+
+def test_rejected_command_is_not_a_mutation():
+    room = AuctionRoom('test-room')
+    mutation = room.mutation
+    room.submit(room.end_bid)       # 입찰 중이 아니면 False
+    assert room.mutation == mutation
+
+    room.submit(room.start_auction)
+    assert room.mutation == mutation + 1
+
+
+def test_commands_submitted_while_draining_run_after_in_order():
+    """처리 중에 들어온 명령은 바로 실행되지 않고 지금 writer 가 도착 순서대로 이어서 처리한다"""
+    room = AuctionRoom('test-room')
+    ran = []
+
+    def inner(tag):
+        ran.append(tag)
+
+    def outer():
+        room.submit(inner, 'first')
+        room.submit(inner, 'second')
+        ran.append('outer')
+
+    room.submit(outer)
+    assert ran == ['outer', 'first', 'second']
+    assert not room.draining and not room.commands
@@ -0,0 +1,84 @@
+# tests/test_rooms.py
+"""경매방 만들기 / 내리기: 인증하지 않은 접속은 경매방을 만들 수 없고, 유휴 경매방은 메모리에서 내린다"""
+import time
+
+import pytest
+
+import app
+from app import ADMIN_OTP, MANAGERS, ROOMS, get_room, run_room_command
+
+
+def connect(room_id: str, otp=None):
+    client = app.socketio.test_client(app.app, query_string=f'room={room_id}')
+    client.emit('authenticate', {'otp': otp})
+    return client
+
+
+def test_viewer_cannot_create_a_room():
+    client = connect('test-ghost')
+    assert not client.is_connected()
+    assert 'test-ghost' not in ROOMS
+    assert get_room('test-ghost') is None
+
+
+def test_unknown_room_rejected_by_http_auth():
+    http = app.app.test_client()
+    response = http.post('/auth', data={'otp': next(iter(MANAGERS)), 'room': 'test-ghost-http'})
+    assert response.status_code == 404
+    assert response.get_json()['success'] is False
+    assert http.post('/auth', data={'otp': ADMIN_OTP, 'room': 'test-ghost-http'}).get_json()['success']
+
+
+def test_admin_opens_a_room_for_everyone():
+    admin = connect('test-opened', ADMIN_OTP)
+    assert 'test-opened' in ROOMS
+    viewer = connect('test-opened')
+    assert viewer.is_connected()
+    assert 'auction_update' in [event['name'] for event in viewer.get_received()]
+    admin.disconnect()
+    viewer.disconnect()
+
+
+def test_allowlisted_room_exists():
+    assert app.DEFAULT_ROOM in app.ROOM_ALLOWLIST
+    assert connect(app.DEFAULT_ROOM).is_connected()
+
+
+@pytest.fixture
+def idle_room(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, 'DATA_DIR', str(tmp_path))
+    room = get_room('test-idle', create=True)
+    room.last_active = time.time() - app.ROOM_IDLE_SEC
+    yield room
+    ROOMS.pop('test-idle', None)
+
+
+def test_idle_room_is_evicted_and_recovered_from_snapshot(idle_room):
+    otp = next(iter(idle_room.managers))
+    idle_room.submit(idle_room.update_manager, otp, {'coin': 77})
+    idle_room.last_active -= app.ROOM_IDLE_SEC
+
+    idle_room.submit(idle_room.evict_if_idle)
+    assert idle_room.closed
+    assert 'test-idle' not in ROOMS
+    assert idle_room.submit(idle_room.end_bid) is False        # 내린 경매방은 명령을 받지 않는다
+
+    # 다시 부르면 스냅샷에서 복구, 내린 경매방으로 가던 명령도 새 경매방으로
+    run_room_command('test-idle', 'update_manager', (otp, {'coin': 78}))
+    room = ROOMS['test-idle']
+    assert room is not idle_room
+    assert room.managers[otp]['coin'] == 78
+
+
+def test_room_with_clients_or_running_auction_is_kept(idle_room):
+    idle_room.presence.attach('sid-idle', None, 'viewer')
+    idle_room.submit(idle_room.evict_if_idle)
+    assert not idle_room.closed
+
+    idle_room.presence.detach('sid-idle')
+    idle_room.submit(idle_room.start_auction)
+    idle_room.last_active -= app.ROOM_IDLE_SEC
+    idle_room.submit(idle_room.evict_if_idle)
+    assert not idle_room.closed
+    assert ROOMS['test-idle'] is idle_room
+    app.TIMERS.cancel('test-idle')
@@ -0,0 +1,74 @@
+# tests/test_roster.py
+"""Roster 열(column) 저장소: 낙찰 / 유찰, 조회, 스냅샷 왕복, 경매 새 시작"""
+import random
+
+import pytest
+
+from engine import AuctionEngine
+from roster import FORCED, NO_OWNER, SOLD, UNSOLD, Roster
+
+PLAYERS = [('A', 'a1'), ('A', 'a2'), ('B', 'b1'), ('C', 'c1')]
+
+
+def make_roster() -> Roster:
+    roster = Roster(['T01', 'T02'])
+    roster.add_round(PLAYERS)
+    return roster
+
+
+def test_assign_and_mark_update_columns_and_teams():
+    roster = make_roster()
+    revision = roster.revision
+    roster.assign(0, 'T01', 30, 1)
+    roster.assign(2, 'T03', 0, 2, forced=True)      # 처음 보는 팀장도 받는다
+    roster.mark(1, UNSOLD)
+
+    assert [roster.status[p] for p in range(4)] == [SOLD, UNSOLD, FORCED, 0]
+    assert roster.owner[1] == NO_OWNER
+    assert list(roster.teams['T01']) == [0]
+    assert list(roster.teams['T03']) == [2]
+    assert roster.revision == revision + 3
+    assert roster.team_dict('T01') == {'a1': {'name': 'a1', 'tier': 'A', 'price': 30, 'round': 1}}
+
+
+def test_query_filters():
+    roster = make_roster()
+    roster.assign(0, 'T01', 30, 1)
+    roster.assign(3, 'T02', 10, 1)
+    assert roster.query() == [0, 1, 2, 3]
+    assert roster.query(tiers={'A'}) == [0, 1]
+    assert roster.query(statuses={'sold'}) == [0, 3]
+    assert roster.query(owner_ids={'T02', 'nobody'}) == [3]
+    assert roster.query(tiers={'A'}, statuses={'pending'}) == [1]
+
+
+def test_doc_round_trip():
+    roster = make_roster()
+    roster.assign(1, 'T02', 45, 1)
+    roster.begin_round([0, 2, 3])
+    copy = Roster.from_doc(roster.to_doc())
+    assert copy.to_doc() == roster.to_doc()
+    assert [copy.player_record(p) for p in range(4)] == [roster.player_record(p) for p in range(4)]
+
+
+def test_add_round_needs_an_empty_roster():
+    roster = make_roster()
+    with pytest.raises(ValueError):
+        roster.add_round([('D', 'd1')])
+
+
+def test_new_auction_starts_a_fresh_roster():
+    """경매를 처음부터 다시 시작하면 선수를 덧붙이지 않고 새 명단으로 바꾼다 (revision 은 계속 증가)"""
+    managers = {f'otp{i}': {'id': f'T0{i}', 'name': f'팀장{i}', 'coin': 1000} for i in (1, 2)}
+    engine = AuctionEngine(managers, PLAYERS, rng=random.Random(0))
+    engine.initialize_players()
+    first = engine.roster
+    assert len(first.names) == len(PLAYERS)
+
+    engine.roster.assign(engine.roster.order[0], 'T01', 10, 1)
+    engine.initialize_players()
+    assert engine.roster is not first
+    assert len(engine.roster.names) == len(PLAYERS)
+    assert sorted(engine.roster.names) == sorted(name for _, name in PLAYERS)
+    assert all(len(team) == 0 for team in engine.roster.teams.values())
+    assert engine.roster.revision > first.revision
@@ -0,0 +1,82 @@
+# tests/test_roster_import.py
+"""parse_roster 검증: 잘못된 줄은 줄 번호와 함께 모두 알리고 아무것도 가져오지 않는다"""
+import io
+
+import pytest
+
+from roster import MAX_IMPORT_ERRORS, NAME_MAX_LENGTH, RosterImportError, parse_roster
+
+
+def parse(text: str, fmt: str = 'csv', max_players: int = 100):
+    return parse_roster(io.StringIO(text, newline=''), fmt, max_players)
+
+
+def error_lines(text: str, fmt: str = 'csv', max_players: int = 100) -> list:
+    with pytest.raises(RosterImportError) as info:
+        parse(text, fmt, max_players)
+    return [error['line'] for error in info.value.errors]
+
+
+def test_csv_reads_columns_by_header_name():
+    text = 'name,note,tier\n홍길동,x,A\n\n 김철수 ,, B \n'
+    assert parse(text) == [('A', '홍길동'), ('B', '김철수')]
+
+
+def test_csv_without_tier_and_name_header():
+    assert error_lines('tier,player\nA,x\n') == [1]
+    assert error_lines('') == [1]
+
+
+def test_csv_reports_every_bad_line():
+    text = '\n'.join([
+        'tier,name',
+        'A,ok1',             # 2
+        'A',                 # 3 열 부족
+        'toolongtier,x',     # 4 잘못된 티어
+        'B,',                # 5 빈 이름
+        f"C,{'n' * (NAME_MAX_LENGTH + 1)}",   # 6 너무 긴 이름
+        'A,ok1',             # 7 중복
+        '',                  # 빈 줄은 건너뛰되 줄 번호는 센다
+        'A-1,x',             # 9 잘못된 티어
+        'D,ok2',             # 10
+    ]) + '\n'
+    assert error_lines(text) == [3, 4, 5, 6, 7, 9]
+
+
+def test_jsonl_errors():
+    text = '\n'.join([
+        '{"tier": "A", "name": "ok"}',   # 1
+        'not json',                      # 2
+        '["A", "list"]',                 # 3 객체가 아님
+        '{"tier": "A"}',                 # 4 name 없음
+        '{"tier": 1, "name": "x"}',      # 5 문자열이 아님
+        '',
+        '{"tier": "A", "name": "ok"}',   # 7 중복
+    ])
+    assert error_lines(text, 'jsonl') == [2, 3, 4, 5, 7]
+
+
+def test_jsonl_ok():
+    text = '{"tier": "A", "name": "가"}\n\n{"name": "나", "tier": "B", "extra": 1}\n'
+    assert parse(text, 'jsonl') == [('A', '가'), ('B', '나')]
+
+
+def test_empty_roster():
+    with pytest.raises(RosterImportError) as info:
+        parse('tier,name\n\n')
+    assert info.value.errors[0]['line'] == 0
+
+
+def test_max_players_stops_at_first_extra_line():
+    text = 'tier,name\nA,a\nA,b\nA,c\nA,d\n'
+    assert error_lines(text, max_players=2) == [4]
+
+
+def test_error_count_is_capped():
+    text = 'tier,name\n' + ''.join(f'!,{i}\n' for i in range(MAX_IMPORT_ERRORS * 2))
+    assert len(error_lines(text)) == MAX_IMPORT_ERRORS
+
+
+def test_nothing_is_returned_when_any_line_is_bad():
+    with pytest.raises(RosterImportError):
+        parse('tier,name\nA,a\nB,b\n!,c\n')
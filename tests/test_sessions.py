@@ -0,0 +1,42 @@
+# tests/test_sessions.py
+"""재접속 세션 토큰: 연결 / 팀장마다 하나, 연결이 끊기면 SESSION_RESUME_SEC 뒤, 발급 후 SESSION_TTL_SEC 뒤 만료"""
+import app
+from app import SESSIONS, detach_session, expire_session, open_session, resume_session
+
+
+def test_reauthenticating_on_the_same_connection_replaces_the_token():
+    first = open_session('test-sessions', None, 'viewer', 'sid-1')
+    second = open_session('test-sessions', None, 'viewer', 'sid-1')
+    assert first not in SESSIONS
+    assert resume_session(first, 'test-sessions', 'sid-2') is None
+    assert SESSIONS[second]['sid'] == 'sid-1'
+
+
+def test_new_manager_login_revokes_the_previous_token():
+    first = open_session('test-sessions', 'otp-a', 'manager', 'sid-3')
+    second = open_session('test-sessions', 'otp-a', 'manager', 'sid-4')
+    assert first not in SESSIONS
+    assert app.SID_SESSIONS.get('sid-3') is None
+    assert app.OTP_SESSIONS[('test-sessions', 'otp-a')] == second
+    # 다른 경매방의 같은 팀장 토큰은 건드리지 않는다
+    other = open_session('test-sessions-2', 'otp-a', 'manager', 'sid-5')
+    assert second in SESSIONS and other in SESSIONS
+
+
+def test_disconnected_session_expires_unless_resumed():
+    token = open_session('test-sessions', None, 'viewer', 'sid-6')
+    detach_session('sid-6')
+    assert SESSIONS[token]['sid'] is None
+    assert resume_session(token, 'test-sessions', 'sid-7') is not None
+    detach_session('sid-7')
+    expire_session(token)       # SESSION_RESUME_SEC 가 지나 타이머가 호출
+    assert token not in SESSIONS
+    assert resume_session(token, 'test-sessions', 'sid-8') is None
+
+
+def test_token_past_its_ttl_cannot_resume(monkeypatch):
+    monkeypatch.setattr(app, 'SESSION_TTL_SEC', -1)
+    token = open_session('test-sessions', None, 'viewer', 'sid-9')
+    detach_session('sid-9')
+    assert resume_session(token, 'test-sessions', 'sid-10') is None
+    assert token not in SESSIONS
@@ -0,0 +1,49 @@
+# tests/test_timers.py
+"""TimerScheduler: 마감 순서, 취소, 고정된 작업(work)에서의 콜백 처리"""
+import threading
+import time
+
+from app import TimerScheduler
+
+
+def start(timers: TimerScheduler, workers: int = 2):
+    for target in [timers.run] + [timers.work] * workers:
+        threading.Thread(target=target, daemon=True).start()
+
+
+def test_due_callbacks_run_on_the_fixed_workers():
+    timers = TimerScheduler()
+    start(timers)
+    threads = threading.active_count()
+    fired = []
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def callback():
+        with lock:
+            fired.append(threading.current_thread().name)
+            if len(fired) == 50:
+                done.set()
+
+    now = time.time()
+    for i in range(50):
+        timers.schedule(i, now + 0.01, callback)
+    assert done.wait(2)
+    assert threading.active_count() == threads     # 마감마다 스레드를 만들지 않는다
+    assert len(set(fired)) <= 2
+
+
+def test_cancel_and_reschedule():
+    timers = TimerScheduler()
+    start(timers, workers=1)
+    fired = []
+    done = threading.Event()
+
+    now = time.time()
+    timers.schedule('a', now + 0.05, lambda: fired.append('a'))
+    timers.schedule('b', now + 0.02, lambda: fired.append('b'))
+    timers.schedule('b', now + 0.08, lambda: (fired.append('b2'), done.set()))      # 교체
+    timers.schedule('c', now + 0.01, lambda: fired.append('c'))
+    timers.cancel('c')
+    assert done.wait(2)
+    assert fired == ['a', 'b2']
@@ -0,0 +1,115 @@
+# tracing.py
+"""
+샘플링 추적. 구간(span)을 Chrome trace event 형식으로 모아 파일로 남긴다.
+결과 파일은 chrome://tracing, https://ui.perfetto.dev, https://www.speedscope.app 에서 열 수 있다.
+
+  - 가장 바깥 span(Socket.IO 핸들러, 타이머 콜백)을 시작할 때 sample_rate 확률로 기록 여부를 정하고,
+    그 안쪽 span 은 같은 결정을 따른다. 그래서 기록된 요청은 처음부터 끝까지 빠짐없이 남는다.
+  - 꺼져 있을 때(sample_rate 0)는 span 마다 속성 두 개를 읽는 것이 전부다.
+  - 이벤트는 최대 max_events 개까지만 메모리에 두고(오래된 것부터 버림) stop() 때 파일로 쓴다.
+"""
+import collections
+import functools
+import json
+import os
+import random
+import threading
+import time
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start', 'record')
+
+    def __init__(self, tracer: 'Tracer', name: str, cat: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.record = False
+
+    def __enter__(self):
+        local = self.tracer.local
+        depth = getattr(local, 'depth', 0)
+        if depth == 0:
+            local.sampled = random.random() < self.tracer.sample_rate
+        local.depth = depth + 1
+        self.record = local.sampled
+        if self.record:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.local.depth -= 1
+        if self.record:
+            end = time.perf_counter()
+            event = {
+                'name': self.name, 'cat': self.cat, 'ph': 'X',
+                'ts': round(self.start * 1e6, 1), 'dur': round((end - self.start) * 1e6, 1),
+                'pid': self.tracer.pid, 'tid': threading.get_ident(),
+            }
+            if self.args:
+                event['args'] = self.args
+            self.tracer.events.append(event)
+        return False
+
+
+class Tracer:
+    def __init__(self, max_events: int):
+        self.sample_rate = 0.0
+        self.events = collections.deque(maxlen=max_events)
+        self.local = threading.local()      # 스레드(greenlet)별 span 깊이와 샘플링 결정
+        self.pid = os.getpid()
+        self.started = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def start(self, sample_rate: float):
+        """sample_rate(0~1] 확률로 요청을 기록하기 시작 (이미 켜져 있으면 비율만 바꾼다)"""
+        if not self.enabled:
+            self.events.clear()
+            self.started = time.time()
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+
+    def stop(self, path: str) -> int:
+        """기록을 멈추고 모은 이벤트를 path 에 쓴 뒤 이벤트 수를 돌려준다"""
+        self.sample_rate = 0.0
+        events = list(self.events)
+        self.events.clear()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms',
+                       'otherData': {'started': self.started, 'stopped': time.time()}},
+                      f, ensure_ascii=False, separators=(',', ':'))
+        return len(events)
+
+    def span(self, name: str, cat: str = 'auction', **args):
+        if self.sample_rate <= 0 and not getattr(self.local, 'depth', 0):
+            return NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def traced(self, name: str = None, cat: str = 'auction'):
+        """함수 호출 전체를 span 하나로 감싸는 decorator (name 기본값: 함수 __qualname__)"""
+        def decorate(func):
+            label = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(label, cat):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
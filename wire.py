@@ -0,0 +1,62 @@
+# wire.py
+"""
+상태 메시지(auction_update / auction_delta / auction_replay / manager_data_update) 전송 형식.
+
+클라이언트는 authenticate 때 받을 수 있는 형식을 선호 순서대로 보내고(encodings),
+서버는 그중 지원하는 첫 번째 형식을 고른다. encodings 를 보내지 않는 이전 클라이언트는 JSON.
+
+  json          : 기본 (Socket.IO 텍스트 패킷)
+  msgpack       : MessagePack 바이너리 (msgpack 패키지가 있을 때만)
+  msgpack+zlib  : msgpack + 개별 전송(스냅샷, replay)이 compress_min 바이트 이상이면 zlib 압축.
+                  브로드캐스트 delta 는 작아서 압축하지 않는다.
+
+바이너리 프레임 = 1바이트 flag (FLAG_PLAIN / FLAG_ZLIB) + msgpack 본문
+"""
+import zlib
+
+try:
+    import msgpack
+except ImportError:     # 선택 의존성: 없으면 JSON 만 협상된다
+    msgpack = None
+
+JSON = 'json'
+MSGPACK = 'msgpack'
+MSGPACK_ZLIB = 'msgpack+zlib'
+FLAG_PLAIN = 0
+FLAG_ZLIB = 1
+ZLIB_LEVEL = 6
+
+
+def available_formats(compress: bool = True) -> tuple:
+    if msgpack is None:
+        return (JSON,)
+    return (MSGPACK_ZLIB, MSGPACK, JSON) if compress else (MSGPACK, JSON)
+
+
+def negotiate(requested, compress: bool = True) -> str:
+    """클라이언트가 보낸 형식 목록 중 지원하는 첫 번째 (없으면 JSON)"""
+    available = available_formats(compress)
+    if isinstance(requested, (list, tuple)):
+        for fmt in requested:
+            if fmt in available:
+                return fmt
+    return JSON
+
+
+def is_binary(fmt: str) -> bool:
+    return fmt in (MSGPACK, MSGPACK_ZLIB)
+
+
+def encode(data, compress_min: int = None) -> bytes:
+    """data 를 바이너리 프레임으로. compress_min 이상이면 zlib 압축 (None 이면 압축 안 함)"""
+    body = msgpack.packb(data, use_bin_type=True)
+    if compress_min is not None and len(body) >= compress_min:
+        return bytes((FLAG_ZLIB,)) + zlib.compress(body, ZLIB_LEVEL)
+    return bytes((FLAG_PLAIN,)) + body
+
+
+def decode(frame: bytes):
+    body = frame[1:]
+    if frame[0] == FLAG_ZLIB:
+        body = zlib.decompress(body)
+    return msgpack.unpackb(body, raw=False)